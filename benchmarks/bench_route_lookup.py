@@ -0,0 +1,61 @@
+"""Microbenchmark: proxy route lookup cost as the number of mappings grows.
+
+Compares the segment trie used by get_proxy_config with the previous approach of
+sorting every prefix by length on each lookup.
+
+Run from the repository root:
+    python -m benchmarks.bench_route_lookup
+"""
+
+import timeit
+from typing import Optional
+
+from src.app.core.proxy_route import ProxyRoute
+from src.app.core.route_trie import RouteTrie
+
+MAPPING_COUNTS = (10, 100, 1_000, 10_000)
+LOOKUP_PATH = "/service-7/v2/resources/12345/details"
+
+
+def build_routes(count: int) -> list[ProxyRoute]:
+    routes = [
+        ProxyRoute(f"/service-{i % 50}/v{i % 3}/resource-{i}", f"https://upstream-{i}.example.com")
+        for i in range(count - 2)
+    ]
+    routes.append(ProxyRoute("/service-7", "https://service-7.example.com"))
+    routes.append(ProxyRoute("/service-7/v2/resources", "https://resources.example.com"))
+    return routes
+
+
+def sorted_scan_lookup(configurations: dict[str, ProxyRoute], path: str) -> Optional[ProxyRoute]:
+    for prefix in sorted(configurations.keys(), key=len, reverse=True):
+        if path.startswith(prefix):
+            return configurations[prefix]
+    return None
+
+
+def time_per_call(statement, number: int) -> float:
+    return min(timeit.repeat(statement, number=number, repeat=5)) / number
+
+
+def main() -> None:
+    print(f"{'mappings':>10} {'trie (us)':>12} {'sorted scan (us)':>18}")
+    for count in MAPPING_COUNTS:
+        routes = build_routes(count)
+        trie = RouteTrie.build(routes)
+        configurations = {route.prefix: route for route in routes}
+
+        assert trie.longest_match(LOOKUP_PATH) == routes[-1]
+        assert sorted_scan_lookup(configurations, LOOKUP_PATH) == routes[-1]
+
+        trie_us = time_per_call(lambda: trie.longest_match(LOOKUP_PATH), 20_000) * 1e6
+        scan_number = max(10, 20_000 // count)
+        scan_us = (
+            time_per_call(lambda: sorted_scan_lookup(configurations, LOOKUP_PATH), scan_number)
+            * 1e6
+        )
+        print(f"{count:>10} {trie_us:>12.2f} {scan_us:>18.2f}")
+
+
+if __name__ == "__main__":
+    main()
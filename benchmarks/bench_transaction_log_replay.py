@@ -0,0 +1,87 @@
+"""Benchmark: startup replay time of a transaction log holding 1,000,000 transactions.
+
+Writes the log once into a temporary directory, then times start_transaction_log()
+loading it into an empty history with the default 10,000 transaction limit and with
+a limit large enough to keep every logged transaction.
+
+Run from the repository root:
+    python -m benchmarks.bench_transaction_log_replay
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from src.app.core.body_capture import BodyCapture
+from src.app.core.pending_transaction import PendingTransaction
+from src.app.core.proxy_route import ProxyRoute
+from src.app.core.segmented_log import SegmentedLog
+from src.app.core.settings import settings
+from src.app.core.storage_data import transaction_history
+from src.app.core.transaction_codec import encode_transaction
+from src.app.core.transaction_log import (
+    TRANSACTION_RECORD,
+    start_transaction_log,
+    stop_transaction_log,
+)
+
+LOGGED_COUNT = 1_000_000
+HISTORY_LIMITS = [10_000, LOGGED_COUNT]
+
+
+def write_log(directory: str) -> None:
+    route = ProxyRoute("/v1", "https://api.example.com")
+    log = SegmentedLog(directory, settings.transaction_log_segment_bytes, 60.0)
+    for i in range(LOGGED_COUNT):
+        transaction = PendingTransaction(
+            timestamp=datetime.now(timezone.utc),
+            route=route,
+            normalized_path=f"/v1/users/{i % 50}",
+            method="GET",
+            url=f"https://api.example.com/v1/users/{i % 50}",
+            request_headers={"accept": "application/json", "host": "localhost:8000"},
+            query_params={},
+            request_capture=BodyCapture(),
+            status_code=200,
+            response_headers={"content-type": "application/json"},
+            response_capture=BodyCapture.of(b'{"id": %d}' % i),
+            aborted=False,
+        ).build()
+        if log.append(bytes([TRANSACTION_RECORD]) + encode_transaction(transaction)):
+            log.rotate()
+    log.close()
+
+
+def replay_seconds(directory: str, limit: int) -> float:
+    # Replay deletes the segments the limit makes unneeded, so each run gets a copy
+    copy = os.path.join(directory, f"limit-{limit}")
+    shutil.copytree(os.path.join(directory, "log"), copy)
+    transaction_history.clear()
+    with (
+        patch.object(settings, "transaction_log_dir", copy),
+        patch.object(transaction_history, "max_count", limit),
+    ):
+        start = time.perf_counter()
+        replayed = start_transaction_log()
+        elapsed = time.perf_counter() - start
+        stop_transaction_log()
+    shutil.rmtree(copy)
+    assert replayed == limit
+    return elapsed
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        write_log(os.path.join(directory, "log"))
+        print(f"{LOGGED_COUNT} transactions logged in {time.perf_counter() - start:.1f} s")
+        for limit in HISTORY_LIMITS:
+            print(f"{'replay, limit ' + str(limit):>24} {replay_seconds(directory, limit):>8.2f} s")
+    transaction_history.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Benchmark: memory held per stored transaction with 10,000 transactions.
+
+Compares the previous representation, nested dicts with a dict per header set, with
+the slotted Transaction whose headers are tuples of shared (name, value) pairs.
+Headers are decoded from raw bytes for every record, as they are when they arrive
+from the network, so equal strings are separate objects unless they are shared.
+
+Run from the repository root:
+    python -m benchmarks.bench_transaction_memory
+"""
+
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable
+from uuid import uuid4
+
+import httpx
+from starlette.datastructures import Headers
+
+from src.app.core.body_capture import BodyCapture
+from src.app.core.pending_transaction import PendingTransaction
+from src.app.core.proxy_route import ProxyRoute
+from src.app.core.store_captured_body import store_captured_body
+
+TRANSACTION_COUNT = 10_000
+
+REQUEST_HEADERS = [
+    (b"host", b"localhost:8000"),
+    (b"accept", b"application/json"),
+    (b"accept-encoding", b"gzip, deflate, br"),
+    (b"accept-language", b"en-US,en;q=0.9"),
+    (b"connection", b"keep-alive"),
+    (b"user-agent", b"Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 Chrome/126.0"),
+    (b"authorization", b"Bearer test-token"),
+    (b"content-type", b"application/json"),
+    (b"content-length", b"2"),
+]
+RESPONSE_HEADERS = [
+    (b"content-type", b"application/json; charset=utf-8"),
+    (b"cache-control", b"no-cache, no-store, must-revalidate"),
+    (b"server", b"nginx"),
+    (b"vary", b"Accept-Encoding"),
+    (b"strict-transport-security", b"max-age=31536000; includeSubDomains"),
+    (b"x-content-type-options", b"nosniff"),
+    (b"set-cookie", b"theme=dark; Path=/"),
+    (b"set-cookie", b"lang=en; Path=/"),
+]
+
+
+def make_pending(route: ProxyRoute, i: int) -> PendingTransaction:
+    response_headers = RESPONSE_HEADERS + [
+        (b"date", b"Mon, 01 Jan 2024 00:00:%02d GMT" % (i % 60)),
+        (b"x-request-id", b"req-%08d" % i),
+    ]
+    return PendingTransaction(
+        timestamp=datetime.now(timezone.utc),
+        route=route,
+        normalized_path=f"/v1/users/{i % 50}",
+        method="POST",
+        url=f"https://api.example.com/v1/users/{i % 50}",
+        request_headers=Headers(raw=REQUEST_HEADERS),
+        query_params={},
+        request_capture=BodyCapture.of(b"{}"),
+        status_code=200,
+        response_headers=httpx.Headers(response_headers),
+        response_capture=BodyCapture.of(b'{"ok": true}'),
+        aborted=False,
+    )
+
+
+def previous_build(pending: PendingTransaction) -> dict[str, Any]:
+    """The transaction dict stored before the slotted representation."""
+    return {
+        "id": str(uuid4()),
+        "timestamp": pending.timestamp.isoformat(),
+        "request": {
+            "method": pending.method,
+            "url": pending.url,
+            "headers": dict(pending.request_headers),
+            "query_params": dict(pending.query_params),
+            "body": store_captured_body(
+                pending.route, pending.request_capture, "", "request", None, None
+            ),
+        },
+        "response": {
+            "status_code": pending.status_code,
+            "headers": dict(pending.response_headers),
+            "body": store_captured_body(
+                pending.route, pending.response_capture, "", "response", None, None
+            ),
+        },
+        "proxy_mapping_used": f"{pending.normalized_path} -> {pending.route.target_url}",
+        "aborted": pending.aborted,
+        "replayed": pending.replayed,
+        "stubbed": pending.stubbed,
+        "coalesced": pending.coalesced,
+        "stream": pending.stream,
+    }
+
+
+def current_build(pending: PendingTransaction) -> Any:
+    return pending.build()
+
+
+def bytes_per_record(build: Callable[[PendingTransaction], Any]) -> float:
+    route = ProxyRoute("/v1", "https://api.example.com")
+    pending = [make_pending(route, i) for i in range(TRANSACTION_COUNT)]
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    records = [build(p) for p in pending]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(records) == TRANSACTION_COUNT
+    return (after - before) / TRANSACTION_COUNT
+
+
+def main() -> None:
+    previous = bytes_per_record(previous_build)
+    current = bytes_per_record(current_build)
+
+    print(f"{TRANSACTION_COUNT} transactions")
+    print(f"{'nested dicts':>20} {previous:>10.0f} bytes/record")
+    print(f"{'slotted, shared':>20} {current:>10.0f} bytes/record")
+    print(f"{'reduction':>20} {(1 - current / previous) * 100:>10.1f} %")
+
+
+if __name__ == "__main__":
+    main()
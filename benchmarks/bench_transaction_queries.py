@@ -0,0 +1,94 @@
+"""Benchmark: GET /api/transactions serialization cost with 10,000 stored transactions.
+
+Compares the previous path, which validated every stored dict into a TransactionRecord
+and then had FastAPI validate the whole TransactionsResponse again as its
+response_model, with the cached path that validates and serializes each record once
+and assembles later responses from the cached bytes.
+
+Run from the repository root:
+    python -m benchmarks.bench_transaction_queries
+"""
+
+import time
+from datetime import datetime, timezone
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from src.app.api.models.transaction_record import TransactionRecord
+from src.app.api.models.transactions_response import TransactionsResponse
+from src.app.api.transaction_json import transactions_response
+from src.app.core.body_capture import BodyCapture
+from src.app.core.pending_transaction import PendingTransaction
+from src.app.core.proxy_route import ProxyRoute
+from src.app.core.render_transaction import render_transaction
+from src.app.core.transaction import Transaction
+
+TRANSACTION_COUNT = 10_000
+ROUNDS = 5
+
+
+def build_transactions(count: int) -> list[Transaction]:
+    route = ProxyRoute("/v1", "https://api.example.com")
+    transactions = []
+    for i in range(count):
+        pending = PendingTransaction(
+            timestamp=datetime.now(timezone.utc),
+            route=route,
+            normalized_path=f"/v1/users/{i}",
+            method="GET",
+            url=f"https://api.example.com/v1/users/{i}",
+            request_headers={"accept": "application/json", "user-agent": "bench"},
+            query_params={"page": "1"},
+            request_capture=BodyCapture(),
+            status_code=200,
+            response_headers={"content-type": "application/json", "x-request-id": str(i)},
+            response_capture=BodyCapture.of(b'{"id": %d, "name": "user %d"}' % (i, i)),
+            aborted=False,
+        )
+        transaction = pending.build()
+        transaction.seq = i + 1
+        transactions.append(transaction)
+    return transactions
+
+
+def previous_path(transactions: list[Transaction]) -> bytes:
+    records = [TransactionRecord(**render_transaction(t)) for t in transactions]
+    document = TransactionsResponse(transactions=records, count=len(records))
+    # What FastAPI does with a returned model and a response_model
+    validated = TransactionsResponse.model_validate(document.model_dump())
+    return bytes(JSONResponse(jsonable_encoder(validated)).body)
+
+
+def cached_path(transactions: list[Transaction]) -> bytes:
+    return bytes(transactions_response(transactions, len(transactions)).body)
+
+
+def best_time(call, transactions: list[Transaction]) -> float:
+    timings = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        call(transactions)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    transactions = build_transactions(TRANSACTION_COUNT)
+
+    previous = best_time(previous_path, transactions)
+    started = time.perf_counter()
+    cached_path(transactions)
+    first_query = time.perf_counter() - started
+    assert all(t.serialized is not None for t in transactions)
+    cached = best_time(cached_path, transactions)
+
+    print(f"{TRANSACTION_COUNT} transactions")
+    print(f"{'previous path':>24} {previous * 1000:>10.1f} ms")
+    print(f"{'cached, first query':>24} {first_query * 1000:>10.1f} ms")
+    print(f"{'cached, later queries':>24} {cached * 1000:>10.1f} ms")
+    print(f"{'speedup (later queries)':>24} {previous / cached:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
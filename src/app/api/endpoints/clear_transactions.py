@@ -4,6 +4,7 @@ from fastapi import APIRouter, HTTPException
 from pyla_logger import logger
 
 from ...core.clear_transactions import clear_transactions
+from ...core.transaction_writer import flush_transaction_writer
 
 router = APIRouter()
 
@@ -19,6 +20,8 @@ async def clear_transactions_endpoint() -> dict[str, int]:
         HTTPException: 500 for storage errors.
     """
     try:
+        # Records captured before the clear must not reappear afterwards
+        await flush_transaction_writer()
         cleared_count = clear_transactions()
         logger.info(f"Successfully cleared {cleared_count} transactions via API")
         return {"cleared_count": cleared_count}
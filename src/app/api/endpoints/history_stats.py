@@ -0,0 +1,31 @@
+"""Transaction history statistics endpoint for reverse proxy API."""
+
+from dataclasses import asdict
+
+from fastapi import APIRouter
+
+from ...core.get_history_stats import get_history_stats
+from ...core.sessions import current_session
+from ...core.transaction_writer import flush_transaction_writer
+from ..models.history_stats_response import HistoryStatsResponse
+
+router = APIRouter()
+
+
+@router.get("/history/stats", response_model=HistoryStatsResponse)
+async def get_history_stats_endpoint() -> HistoryStatsResponse:
+    """Get transaction history size and eviction counters.
+
+    A non-zero evicted count tells a test harness that older transactions were
+    dropped to stay within the configured limits.
+
+    Returns:
+        HistoryStatsResponse with stored and evicted counts and the configured limits.
+    """
+    await flush_transaction_writer()
+    history = current_session().transaction_history
+    return HistoryStatsResponse(
+        **asdict(get_history_stats()),
+        max_transactions=history.max_count,
+        max_bytes=history.max_bytes,
+    )
@@ -1,17 +1,144 @@
+import asyncio
+from collections.abc import Iterable, Mapping
 from datetime import datetime, timezone
-from typing import Any
-from uuid import uuid4
+from typing import Optional, Union
 
 import httpx
-from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, HTTPException, Request, Response
 from pyla_logger import logger
 
-from ...core.add_transaction import add_transaction
+from ...core.body_capture import BodyCapture
+from ...core.buffered_response import BufferedResponse
 from ...core.get_proxy_config import get_proxy_config
+from ...core.pending_transaction import PendingTransaction
+from ...core.replay_store import find_replay_entry
+from ...core.sessions import SESSION_HEADER
+from ...core.settings import settings
+from ...core.single_flight import SingleFlight
+from ...core.sse_capture import SseCapture
+from ...core.stream_capture import StreamCapture
+from ...core.transaction_writer import submit_transaction
+from ...core.upstream_client import get_upstream_client
+from ..tee_streaming_response import TeeStreamingResponse
 
 router = APIRouter()
 
+HOP_BY_HOP_HEADERS = ("connection", "keep-alive", "transfer-encoding")
+
+# Idempotent methods whose identical concurrent requests may share one upstream fetch
+COALESCED_METHODS = ("GET", "HEAD")
+# Request headers that can change the upstream response, so they must match to share it
+COALESCE_KEY_HEADERS = (
+    "accept",
+    "accept-encoding",
+    "accept-language",
+    "authorization",
+    "cookie",
+    "range",
+)
+
+_upstream_flights: SingleFlight[Optional[BufferedResponse]] = SingleFlight()
+
+
+def _forwarded_headers(upstream_headers: Iterable[tuple[str, str]]) -> dict[str, str]:
+    """Get the upstream response headers that are passed on to the client."""
+    headers = dict(upstream_headers)
+
+    # Remove/replace conflicting headers that FastAPI will add
+    headers.pop("server", None)  # Let FastAPI set this
+    headers.pop("date", None)  # Let FastAPI set this
+    # Framing is renegotiated with the client, so hop-by-hop headers are not forwarded
+    for hop_header in HOP_BY_HOP_HEADERS:
+        headers.pop(hop_header, None)
+    return headers
+
+
+def _is_event_stream(response: httpx.Response) -> bool:
+    """Whether the response is a server-sent event stream that can be split into events."""
+    return _is_event_stream_type(response) and "content-encoding" not in response.headers
+
+
+def _is_event_stream_type(response: httpx.Response) -> bool:
+    return response.headers.get("content-type", "").startswith("text/event-stream")
+
+
+def _set_read_timeout(request: httpx.Request, timeout: Optional[float]) -> None:
+    """Change the read timeout for the rest of a response whose body is not read yet.
+
+    Event streams may stay quiet for longer than upstream_timeout between events. The
+    transport looks the timeout up in the request extensions when it starts reading
+    the body, so it can still be changed once send(stream=True) has returned.
+    """
+    request.extensions["timeout"] = {**request.extensions.get("timeout", {}), "read": timeout}
+
+
+def _accepts_event_stream(request: Request) -> bool:
+    return "text/event-stream" in request.headers.get("accept", "")
+
+
+async def _fetch_coalesced(
+    client: httpx.AsyncClient, upstream_request: httpx.Request
+) -> tuple[Union[BufferedResponse, httpx.Response], bool]:
+    """Share one upstream fetch between identical concurrent requests.
+
+    Event streams and bodies over coalesce_max_body_bytes are not buffered: the
+    request that started the fetch streams the response, and the requests that
+    joined it make upstream requests of their own.
+
+    Args:
+        client: Shared upstream client
+        upstream_request: Request to send to the target server
+
+    Returns:
+        Tuple of (the buffered response, or a response to stream, whether it was shared
+        from a fetch started by another request)
+    """
+    unbuffered: list[httpx.Response] = []
+    abandoned = False
+
+    async def fetch() -> Optional[BufferedResponse]:
+        response = await client.send(upstream_request, stream=True)
+        if not _is_event_stream_type(response):
+            read = await BufferedResponse.read(response, settings.coalesce_max_body_bytes)
+            if isinstance(read, BufferedResponse):
+                return read
+            response = read
+        if abandoned:
+            await response.aclose()
+        else:
+            unbuffered.append(response)
+        return None
+
+    flight_key = (
+        upstream_request.method,
+        str(upstream_request.url),
+        tuple(upstream_request.headers.get(name) for name in COALESCE_KEY_HEADERS),
+    )
+    try:
+        buffered, shared = await _upstream_flights.do(flight_key, fetch)
+    except asyncio.CancelledError:
+        # The fetch carries on for the requests that joined it, but nobody else can
+        # stream a response it did not buffer
+        abandoned = True
+        for response in unbuffered:
+            await response.aclose()
+        raise
+    if buffered is not None:
+        return buffered, shared
+    if unbuffered:
+        return unbuffered[0], False
+    return await client.send(upstream_request, stream=True), False
+
+
+async def _respond_in_process(pending: PendingTransaction, body: bytes) -> Response:
+    """Record a transaction answered without contacting the upstream and respond."""
+    await submit_transaction(pending)
+    return Response(
+        content=body,
+        status_code=pending.status_code,
+        headers=_forwarded_headers(pending.response_headers.items()),
+    )
+
 
 @router.get("/proxy/{path:path}", operation_id="proxy_request_get")
 @router.post("/proxy/{path:path}", operation_id="proxy_request_post")
@@ -20,113 +147,243 @@ router = APIRouter()
 @router.patch("/proxy/{path:path}", operation_id="proxy_request_patch")
 @router.head("/proxy/{path:path}", operation_id="proxy_request_head")
 @router.options("/proxy/{path:path}", operation_id="proxy_request_options")
-async def proxy_request(request: Request, path: str) -> StreamingResponse:
+async def proxy_request(request: Request, path: str) -> Response:
     """Forward HTTP requests to configured target URLs based on path prefix matching.
 
-    Captures complete request/response data for later querying by test fixtures.
+    Captures complete request/response data for later querying by test fixtures. The
+    transaction is handed to the background writer once the response stream finishes,
+    and is marked aborted if the client disconnects before the full body was delivered.
+
+    Requests matching one of the mapping's stubs are answered in-process. On mappings
+    with coalescing enabled, identical concurrent GET/HEAD requests share one upstream
+    fetch, read in full before it is returned to each of them (event streams and
+    bodies over coalesce_max_body_bytes are streamed instead). Server-sent event
+    streams are recorded as soon as they open, with each event appended to the
+    transaction as it is forwarded. In replay
+    mode, recorded requests are answered from the replay file without contacting the
+    upstream; unrecorded ones follow the configured miss policy.
 
     Args:
         request: The incoming FastAPI request object
         path: The path portion after /proxy/ (captured by {path:path})
 
     Returns:
-        Response object with exact data from target server
+        Response streaming the target server's body to the client as it arrives
 
     Raises:
-        HTTPException: 404 if no proxy config matches path
+        HTTPException: 404 if no proxy config matches path, if no stub of a stub-only
+            mapping matches, or (in replay mode with the "fail" miss policy) if the
+            request was not recorded
         HTTPException: 502 if upstream server unreachable
         HTTPException: 500 for unexpected errors
     """
     # Find target URL using longest-prefix matching
     # Add leading slash to path since configurations are stored with leading slash
     normalized_path = f"/{path}" if not path.startswith("/") else path
-    target_url = get_proxy_config(normalized_path)
-    if target_url is None:
+    route = get_proxy_config(normalized_path)
+    if route is None:
         logger.warning(f"No proxy configuration found for path: {path}")
         raise HTTPException(
             status_code=404, detail=f"No proxy configuration found for path: {path}"
         )
 
-    # Construct full target URL
-    full_target_url = f"{target_url.rstrip('/')}/{normalized_path.lstrip('/')}"
+    # Construct full target URL (stub-only mappings have no upstream)
+    target_url = route.target_url
+    full_target_url = (
+        f"{target_url.rstrip('/')}/{normalized_path.lstrip('/')}"
+        if target_url is not None
+        else normalized_path
+    )
 
     # Prepare request data for forwarding
     request_headers = dict(request.headers)
     # Remove host header to avoid conflicts with target server
     request_headers.pop("host", None)
+    # The session header is meant for Trixie, not the target server
+    request_headers.pop(SESSION_HEADER, None)
 
-    request_body = await request.body()
     query_params = dict(request.query_params)
 
-    # Generate transaction ID for tracking
-    transaction_id = str(uuid4())
-    transaction_timestamp = datetime.now(timezone.utc).isoformat()
+    # Stream the upload upstream as it arrives, teeing it into a spooled capture
+    request_capture = BodyCapture()
+    has_request_body = "content-length" in request.headers or (
+        "transfer-encoding" in request.headers
+    )
+    transaction_timestamp = datetime.now(timezone.utc)
+
+    def pending_transaction(
+        status_code: int,
+        response_headers: Mapping[str, str],
+        response_capture: BodyCapture,
+        aborted: bool = False,
+        replayed: bool = False,
+        stubbed: bool = False,
+        coalesced: bool = False,
+        record_replay: bool = False,
+        stream: Optional[StreamCapture] = None,
+    ) -> PendingTransaction:
+        return PendingTransaction(
+            timestamp=transaction_timestamp,
+            route=route,
+            normalized_path=normalized_path,
+            method=request.method,
+            url=full_target_url,
+            request_headers=request.headers,
+            query_params=query_params,
+            request_capture=request_capture,
+            status_code=status_code,
+            response_headers=response_headers,
+            response_capture=response_capture,
+            aborted=aborted,
+            replayed=replayed,
+            stubbed=stubbed,
+            coalesced=coalesced,
+            record_replay=record_replay,
+            stream=stream,
+        )
+
+    stub = route.find_stub(request.method, query_params)
+    if stub is not None:
+        if has_request_body:
+            await request_capture.consume(request.stream())
+        return await _respond_in_process(
+            pending_transaction(
+                stub.status_code, dict(stub.headers), BodyCapture.of(stub.body), stubbed=True
+            ),
+            stub.body,
+        )
+    if target_url is None:
+        logger.warning(f"No stub matches {request.method} {normalized_path}")
+        raise HTTPException(
+            status_code=404, detail=f"No stub matches {request.method} {normalized_path}"
+        )
+
+    record_replay = settings.replay_mode == "record"
+    # When the body takes part in replay matching, it is read before deciding where to go
+    body_read_first = settings.replay_mode == "replay" and settings.replay_match_body
+    if body_read_first and has_request_body:
+        await request_capture.consume(request.stream())
+    if settings.replay_mode == "replay":
+        entry = find_replay_entry(request.method, normalized_path, query_params, request_capture)
+        if entry is not None:
+            if has_request_body and not body_read_first:
+                await request_capture.consume(request.stream())
+            return await _respond_in_process(
+                pending_transaction(
+                    entry.status_code,
+                    dict(entry.headers),
+                    BodyCapture.of(entry.body),
+                    replayed=True,
+                ),
+                entry.body,
+            )
+
+        if settings.replay_miss_policy == "fail":
+            logger.warning(f"No recorded response for {request.method} {normalized_path}")
+            request_capture.close()
+            raise HTTPException(
+                status_code=404,
+                detail=f"No recorded response for {request.method} {normalized_path}",
+            )
+        record_replay = settings.replay_miss_policy == "record"
+    if not has_request_body:
+        request_content = None
+    elif body_read_first:
+        request_content = request_capture.iter_chunks()
+    else:
+        request_content = request_capture.tee(request.stream())
 
     try:
-        # Forward request to target server
-        async with httpx.AsyncClient() as client:
-            response = await client.request(
-                method=request.method,
-                url=full_target_url,
-                headers=request_headers,
-                params=query_params,
-                content=request_body,
+        # Forward request to target server over the shared connection pool
+        client = get_upstream_client()
+        upstream_request = client.build_request(
+            method=request.method,
+            url=full_target_url,
+            headers=request_headers,
+            params=query_params,
+            content=request_content,
+        )
+
+        if (
+            route.coalesce
+            and request.method in COALESCED_METHODS
+            and not has_request_body
+            and not _accepts_event_stream(request)
+        ):
+            fetched, shared = await _fetch_coalesced(client, upstream_request)
+            if isinstance(fetched, BufferedResponse):
+                return await _respond_in_process(
+                    pending_transaction(
+                        fetched.status_code,
+                        fetched.headers,
+                        BodyCapture.of(fetched.body),
+                        coalesced=shared,
+                        record_replay=record_replay and not shared,
+                    ),
+                    fetched.body,
+                )
+            response = fetched
+        else:
+            response = await client.send(upstream_request, stream=True)
+        headers = _forwarded_headers(response.headers.items())
+        if _is_event_stream_type(response):
+            _set_read_timeout(upstream_request, settings.upstream_stream_read_timeout)
+
+        if _is_event_stream(response):
+            # Record the transaction right away and append events to it as they pass
+            sse_capture = SseCapture(StreamCapture("sse"))
+            await submit_transaction(
+                pending_transaction(
+                    response.status_code,
+                    response.headers,
+                    BodyCapture(),
+                    stream=sse_capture.stream,
+                )
+            )
+
+            async def finalize_stream(completed: bool) -> None:
+                sse_capture.close(aborted=not completed)
+                await response.aclose()
+
+            return TeeStreamingResponse(response, sse_capture, finalize_stream, headers=headers)
+
+        response_capture = BodyCapture()
+
+        async def finalize_transaction(completed: bool) -> None:
+            # Runs once the body has been streamed (or the client went away)
+            if not completed:
+                logger.warning(
+                    f"Response stream for {full_target_url} aborted after "
+                    f"{response_capture.size} bytes"
+                )
+            await response.aclose()
+            await submit_transaction(
+                pending_transaction(
+                    response.status_code,
+                    response.headers,
+                    response_capture,
+                    aborted=not completed,
+                    record_replay=record_replay,
+                )
             )
 
-        # Read the response content once
-        response_body = await response.aread()
-        response_chunks = [response_body] if response_body else []
-
-        # Prepare transaction data for storage
-        transaction_data: dict[str, Any] = {
-            "id": transaction_id,
-            "timestamp": transaction_timestamp,
-            "request": {
-                "method": request.method,
-                "url": full_target_url,
-                "headers": dict(request.headers),
-                "query_params": query_params,
-                "body": request_body.decode("utf-8", errors="replace") if request_body else "",
-            },
-            "response": {
-                "status_code": response.status_code,
-                "headers": dict(response.headers),
-                "body": response_body.decode("utf-8", errors="replace"),
-            },
-            "proxy_mapping_used": f"{normalized_path} -> {target_url}",
-        }
-
-        # Store transaction data
-        add_transaction(transaction_data)
-
-        # Create async generator to stream the captured chunks
-        async def generate_response():
-            for chunk in response_chunks:
-                yield chunk
-
-        # In proxy_handler.py
-        headers = dict(response.headers)
-
-        # Remove/replace conflicting headers that FastAPI will add
-        headers.pop("server", None)  # Let FastAPI set this
-        headers.pop("date", None)  # Let FastAPI set this
-
-        return StreamingResponse(
-            generate_response(),
-            status_code=response.status_code,
-            headers=headers,  # Now clean headers
+        return TeeStreamingResponse(
+            response, response_capture, finalize_transaction, headers=headers
         )
 
     except httpx.ConnectError as e:
         logger.error(f"Failed to connect to target server {full_target_url}: {e}")
+        request_capture.close()
         raise HTTPException(
             status_code=502, detail=f"Failed to connect to target server: {target_url}"
         )
     except httpx.TimeoutException as e:
         logger.error(f"Timeout connecting to target server {full_target_url}: {e}")
+        request_capture.close()
         raise HTTPException(
             status_code=504, detail=f"Timeout connecting to target server: {target_url}"
         )
     except Exception as e:
         logger.error(f"Unexpected error proxying request to {full_target_url}: {e}")
+        request_capture.close()
         raise HTTPException(status_code=500, detail="Internal proxy error")
@@ -1,31 +1,41 @@
+import asyncio
+from collections.abc import Iterable
+from typing import Union
+
 from fastapi import APIRouter, HTTPException
 from pyla_logger import logger
 
-from ...core.add_proxy_config import add_proxy_config
-from ...core.clear_proxy_configs import clear_proxy_configs
+from ...core.get_proxy_configs import get_proxy_configs
+from ...core.proxy_route import ProxyRoute
+from ...core.remove_proxy_config import remove_proxy_config
+from ...core.replace_proxy_configs import replace_proxy_configs
+from ...core.update_proxy_configs import update_proxy_configs
+from ..models.mapping_config import MappingConfig
 from ..models.setup_request import SetupRequest
 from ..models.setup_response import SetupResponse
 
 router = APIRouter()
 
 
+def _current_mappings(routes: Iterable[ProxyRoute]) -> dict[str, Union[str, MappingConfig]]:
+    return {route.prefix: MappingConfig.from_route(route) for route in routes}
+
+
 @router.post("/setup", response_model=SetupResponse)
 async def configure_proxy_mappings(request: SetupRequest) -> SetupResponse:
     """Configure proxy path prefix to target URL mappings.
 
-    Clears existing configurations and stores new mappings for use by the proxy handler.
+    Replaces existing configurations with the new mappings for use by the proxy handler.
+    The new route table is built first and swapped in atomically, so requests being
+    proxied meanwhile never see an empty or partially configured table.
     """
     try:
-        # Clear existing proxy configurations (fresh setup each call)
-        clear_proxy_configs()
-        logger.info("Cleared existing proxy configurations")
-
-        # Store new mappings
-        configured_count = 0
-        for prefix, target_url in request.mappings.items():
-            add_proxy_config(prefix, target_url)
-            configured_count += 1
-            logger.debug(f"Added proxy mapping: {prefix} -> {target_url}")
+        routes = request.routes()
+        # Changes wait on the transaction log and, with several workers, on the shared
+        # database's write lock, so they are made in a thread
+        configured_count = await asyncio.to_thread(replace_proxy_configs, routes)
+        for route in routes:
+            logger.debug(f"Configured proxy mapping: {route.prefix} -> {route.target_url}")
 
         logger.info(f"Configured {configured_count} proxy mappings")
 
@@ -40,3 +50,81 @@ async def configure_proxy_mappings(request: SetupRequest) -> SetupResponse:
         raise HTTPException(
             status_code=500, detail="Internal server error while configuring proxy mappings"
         )
+
+
+@router.get("/setup", response_model=SetupResponse)
+async def get_proxy_mappings() -> SetupResponse:
+    """Get the proxy mappings currently in effect."""
+    try:
+        table = get_proxy_configs()
+        return SetupResponse(
+            success=True,
+            configured_mappings=_current_mappings(table),
+            message=f"{len(table)} proxy mappings configured",
+        )
+
+    except Exception as e:
+        logger.error(f"Failed to retrieve proxy mappings: {e}")
+        raise HTTPException(
+            status_code=500, detail="Internal server error while retrieving proxy mappings"
+        )
+
+
+@router.patch("/setup", response_model=SetupResponse)
+async def update_proxy_mappings(request: SetupRequest) -> SetupResponse:
+    """Add or replace individual proxy mappings, keeping all others.
+
+    The changes are applied to a copy of the route table that is swapped in atomically.
+    """
+    try:
+        routes = request.routes()
+        configured_count = await asyncio.to_thread(update_proxy_configs, routes)
+        for route in routes:
+            logger.debug(f"Updated proxy mapping: {route.prefix} -> {route.target_url}")
+
+        logger.info(f"Updated {len(routes)} proxy mappings, {configured_count} configured")
+
+        return SetupResponse(
+            success=True,
+            configured_mappings=_current_mappings(get_proxy_configs()),
+            message=f"Updated {len(routes)} proxy mappings",
+        )
+
+    except Exception as e:
+        logger.error(f"Failed to update proxy mappings: {e}")
+        raise HTTPException(
+            status_code=500, detail="Internal server error while updating proxy mappings"
+        )
+
+
+@router.delete("/setup/{prefix:path}", response_model=SetupResponse)
+async def remove_proxy_mapping(prefix: str) -> SetupResponse:
+    """Remove the proxy mapping for one path prefix, keeping all others.
+
+    Args:
+        prefix: Path prefix of the mapping, without the leading "/" (e.g., "v1/users")
+
+    Raises:
+        HTTPException: 404 if no mapping is configured for the prefix, 500 for storage errors.
+    """
+    normalized_prefix = "/" + prefix.lstrip("/")
+    try:
+        removed = await asyncio.to_thread(remove_proxy_config, normalized_prefix)
+    except Exception as e:
+        logger.error(f"Failed to remove proxy mapping {normalized_prefix}: {e}")
+        raise HTTPException(
+            status_code=500, detail="Internal server error while removing proxy mapping"
+        )
+
+    if not removed:
+        logger.warning(f"No proxy mapping configured for prefix: {normalized_prefix}")
+        raise HTTPException(
+            status_code=404, detail=f"No proxy mapping configured for prefix: {normalized_prefix}"
+        )
+
+    logger.info(f"Removed proxy mapping: {normalized_prefix}")
+    return SetupResponse(
+        success=True,
+        configured_mappings=_current_mappings(get_proxy_configs()),
+        message=f"Removed proxy mapping {normalized_prefix}",
+    )
@@ -0,0 +1,85 @@
+"""Session endpoints for reverse proxy API."""
+
+import asyncio
+from typing import Optional
+from uuid import uuid4
+
+from fastapi import APIRouter, HTTPException
+from pyla_logger import logger
+
+from ...core.release_session import release_session
+from ...core.sessions import create_session, delete_session, list_sessions
+from ...core.settings import settings
+from ...core.transaction_writer import flush_transaction_writer
+from ..models.session_request import SessionRequest
+from ..models.session_response import SessionResponse
+from ..models.sessions_response import SessionsResponse
+
+router = APIRouter()
+
+
+@router.post("/sessions", response_model=SessionResponse, status_code=201)
+async def create_session_endpoint(request: Optional[SessionRequest] = None) -> SessionResponse:
+    """Create a session with its own route table and transaction history.
+
+    Requests made with the X-Trixie-Session header set to the session name, or under
+    its /sessions/{name} path prefix, only see and change the session's mappings and
+    transactions. Creating a session takes constant time.
+
+    Raises:
+        HTTPException: 409 if the name is taken, the session limit is reached, or
+            more than one worker is running.
+    """
+    request = request or SessionRequest()
+    if settings.workers > 1:
+        raise HTTPException(
+            status_code=409, detail="Sessions are not available with more than one worker"
+        )
+    try:
+        session = create_session(
+            request.name or uuid4().hex,
+            max_count=(
+                request.max_transactions
+                if request.max_transactions is not None
+                else settings.history_max_transactions
+            ),
+            max_bytes=(
+                request.max_bytes if request.max_bytes is not None else settings.history_max_bytes
+            ),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    logger.info(f"Created session {session.name}")
+    return SessionResponse.from_session(session)
+
+
+@router.get("/sessions", response_model=SessionsResponse)
+async def get_sessions() -> SessionsResponse:
+    """List the named sessions (the default session is not listed)."""
+    return SessionsResponse(
+        sessions=[SessionResponse.from_session(session) for session in list_sessions()]
+    )
+
+
+@router.delete("/sessions/{name}")
+async def delete_session_endpoint(name: str) -> dict[str, int]:
+    """Delete a session with its mappings and transactions.
+
+    The session is removed at once; the blob files of its transactions are deleted in
+    the background, so teardown does not wait on the size of its history.
+
+    Returns:
+        dict: Response containing the number of transactions that were dropped.
+
+    Raises:
+        HTTPException: 404 if there is no such session.
+    """
+    # Records captured in the session must not be written after it is gone
+    await flush_transaction_writer()
+    session = delete_session(name)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Unknown session: {name}")
+    cleared_count = len(session.transaction_history)
+    asyncio.get_running_loop().run_in_executor(None, release_session, session)
+    logger.info(f"Deleted session {name} with {cleared_count} transactions")
+    return {"cleared_count": cleared_count}
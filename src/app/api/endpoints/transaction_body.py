@@ -0,0 +1,58 @@
+"""Transaction body endpoint for reverse proxy API."""
+
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import Response, StreamingResponse
+from pyla_logger import logger
+
+from ...core.blob_store import iter_blob
+from ...core.captured_body import CapturedBody
+from ...core.get_transaction import get_transaction
+from ...core.transaction_writer import flush_transaction_writer
+
+router = APIRouter()
+
+
+@router.get("/transactions/{transaction_id}/{part}/body", response_model=None)
+async def get_transaction_body_endpoint(
+    transaction_id: str, part: Literal["request", "response"]
+) -> Response:
+    """Get the raw captured body of a transaction's request or response.
+
+    Bodies that overflowed to a blob file are streamed from a memory map of the file.
+    Content-encoded bodies are served still encoded, with their content-encoding
+    header, unless they were truncated; truncated ones are decoded as far as possible.
+
+    Args:
+        transaction_id: Unique transaction identifier
+        part: Which body to return ("request" or "response")
+
+    Returns:
+        The captured bytes, served with the content type of the captured message.
+
+    Raises:
+        HTTPException: 404 if the transaction or its body does not exist.
+    """
+    await flush_transaction_writer()
+    transaction = get_transaction(transaction_id)
+    message = transaction.get(part) if transaction is not None else None
+    body = message.get("body") if isinstance(message, dict) else None
+    if message is None or not isinstance(body, CapturedBody):
+        logger.warning(f"No {part} body captured for transaction {transaction_id}")
+        raise HTTPException(
+            status_code=404, detail=f"No {part} body found for transaction: {transaction_id}"
+        )
+
+    media_type = message.get("headers", {}).get("content-type", "application/octet-stream")
+    headers = {"x-trixie-body-size": str(body.size)}
+    if body.truncated:
+        headers["x-trixie-body-truncated"] = "true"
+        if body.content_encoding:
+            return Response(content=body.read_decoded(), media_type=media_type, headers=headers)
+    elif body.content_encoding:
+        headers["content-encoding"] = body.content_encoding
+
+    if body.blob_path is not None:
+        return StreamingResponse(iter_blob(body.blob_path), media_type=media_type, headers=headers)
+    return Response(content=body.data, media_type=media_type, headers=headers)
@@ -0,0 +1,75 @@
+"""Transaction export endpoint (newline-delimited JSON) for reverse proxy API."""
+
+import zlib
+from collections.abc import AsyncGenerator
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from ...core.iter_transaction_batches import iter_transaction_batches
+from ...core.transaction_filter import TransactionFilter
+from ...core.transaction_writer import flush_transaction_writer
+from ..transaction_filter_query import transaction_filter_query
+from ..transaction_json import transaction_json
+
+router = APIRouter()
+
+# Transactions rendered per chunk of the response
+EXPORT_BATCH_SIZE = 100
+
+
+async def _export_lines(
+    transaction_filter: TransactionFilter,
+    include_bodies: bool,
+    after: Optional[int],
+    compress: bool,
+) -> AsyncGenerator[bytes, None]:
+    await flush_transaction_writer()
+    # wbits=31 produces a gzip stream; every chunk is sync-flushed so it can be sent
+    # (and decompressed by the client) right away
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    for batch in iter_transaction_batches(transaction_filter, after, EXPORT_BATCH_SIZE):
+        chunk = b"".join(
+            transaction_json(transaction, include_bodies) + b"\n" for transaction in batch
+        )
+        if compressor is None:
+            yield chunk
+        else:
+            yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    if compressor is not None:
+        yield compressor.flush()
+
+
+@router.get("/transactions/export", response_class=StreamingResponse)
+async def export_transactions_endpoint(
+    transaction_filter: Annotated[TransactionFilter, Depends(transaction_filter_query)],
+    include_bodies: Annotated[
+        bool, Query(description="Include bodies and stream frames, or only metadata")
+    ] = True,
+    after: Annotated[
+        Optional[int], Query(ge=0, description="Only transactions after this sequence number")
+    ] = None,
+    gzip: Annotated[bool, Query(description="Compress the export with gzip")] = False,
+) -> StreamingResponse:
+    """Export the transaction history as newline-delimited JSON, oldest first.
+
+    Records are rendered and sent in small batches while the history is walked, so
+    memory use stays flat however many transactions are exported and the first
+    lines arrive immediately. The export covers transactions recorded up to the
+    moment it starts.
+
+    Args:
+        transaction_filter: Criteria built from the filter query parameters
+        include_bodies: Whether records include bodies and stream frames
+        after: Only export transactions with a greater sequence number
+        gzip: Whether to gzip the stream (sent with content-encoding: gzip)
+
+    Returns:
+        StreamingResponse of application/x-ndjson, one transaction per line.
+    """
+    return StreamingResponse(
+        _export_lines(transaction_filter, include_bodies, after, gzip),
+        media_type="application/x-ndjson",
+        headers={"content-encoding": "gzip"} if gzip else None,
+    )
@@ -0,0 +1,102 @@
+"""Live transaction stream endpoint (server-sent events) for reverse proxy API."""
+
+import json
+from collections.abc import AsyncIterator
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Depends, Header, Query
+from fastapi.responses import StreamingResponse
+
+from ...core.get_transactions import get_transactions
+from ...core.settings import settings
+from ...core.transaction import Transaction
+from ...core.transaction_filter import TransactionFilter
+from ...core.transaction_subscription import TransactionSubscription
+from ...core.transaction_writer import flush_transaction_writer
+from ..transaction_filter_query import transaction_filter_query
+from ..transaction_json import transaction_json
+
+router = APIRouter()
+
+# Seconds between keep-alive comments while no transaction is recorded
+KEEPALIVE_INTERVAL = 15.0
+
+
+def _transaction_event(transaction: Transaction, include_bodies: bool) -> bytes:
+    seq = transaction.seq
+    event_id = f"id: {seq}\n".encode() if seq is not None else b""
+    data = transaction_json(transaction, include_bodies)
+    return event_id + b"event: transaction\ndata: " + data + b"\n\n"
+
+
+async def _transaction_events(
+    transaction_filter: TransactionFilter, include_bodies: bool, after: Optional[int]
+) -> AsyncIterator[bytes]:
+    subscription = TransactionSubscription(transaction_filter, settings.live_stream_queue_size)
+    # Subscribe before reading the backlog so nothing recorded in between is missed;
+    # transactions arriving through both are skipped by sequence number
+    subscription.start()
+    try:
+        last_seq = 0
+        if after is not None:
+            await flush_transaction_writer()
+            last_seq = after
+            for transaction in get_transactions(after=after, transaction_filter=transaction_filter):
+                yield _transaction_event(transaction, include_bodies)
+                last_seq = transaction.seq or last_seq
+
+        dropped = 0
+        while True:
+            transaction = await subscription.next(KEEPALIVE_INTERVAL)
+            if subscription.dropped != dropped:
+                data = json.dumps({"dropped": subscription.dropped})
+                yield f"event: dropped\ndata: {data}\n\n".encode()
+                dropped = subscription.dropped
+            if transaction is None:
+                yield b": keep-alive\n\n"
+                continue
+            seq = transaction.seq
+            if seq is not None and seq <= last_seq:
+                continue
+            last_seq = seq if seq is not None else last_seq
+            yield _transaction_event(transaction, include_bodies)
+    finally:
+        subscription.stop()
+
+
+@router.get("/transactions/stream", response_class=StreamingResponse)
+async def stream_transactions_endpoint(
+    transaction_filter: Annotated[TransactionFilter, Depends(transaction_filter_query)],
+    include_bodies: Annotated[
+        bool, Query(description="Include bodies and stream frames, or only metadata")
+    ] = True,
+    after: Annotated[
+        Optional[int],
+        Query(ge=0, description="First replay stored transactions after this sequence number"),
+    ] = None,
+    last_event_id: Annotated[Optional[int], Header(alias="Last-Event-ID")] = None,
+) -> StreamingResponse:
+    """Stream transactions as server-sent events while they are recorded.
+
+    Each matching transaction is pushed as a "transaction" event whose id is its
+    sequence number, so a reconnecting EventSource (sending Last-Event-ID) resumes
+    where it left off. Every subscriber has its own bounded queue: a subscriber that
+    falls behind misses transactions instead of slowing down the proxy, and is told
+    so by a "dropped" event carrying its total dropped count.
+
+    Args:
+        transaction_filter: Criteria built from the filter query parameters
+        include_bodies: Whether events include bodies and stream frames
+        after: Replay stored transactions after this sequence number before going live
+        last_event_id: Sequence number of the last event an EventSource received
+
+    Returns:
+        StreamingResponse of text/event-stream events that ends when the client leaves.
+    """
+    return StreamingResponse(
+        _transaction_events(
+            transaction_filter, include_bodies, after if after is not None else last_event_id
+        ),
+        media_type="text/event-stream",
+        headers={"cache-control": "no-cache", "x-accel-buffering": "no"},
+    )
@@ -1,44 +1,84 @@
 """Transactions endpoint for reverse proxy API."""
 
-from typing import Optional
+from typing import Annotated, Optional
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pyla_logger import logger
 
+from ...core.get_latest_sequence import get_latest_sequence
 from ...core.get_transactions import get_transactions
-from ..models.transaction_record import TransactionRecord
+from ...core.transaction_filter import TransactionFilter
+from ...core.transaction_writer import flush_transaction_writer
 from ..models.transactions_response import TransactionsResponse
+from ..transaction_filter_query import transaction_filter_query
+from ..transaction_json import transactions_response
 
 router = APIRouter()
 
 
 @router.get("/transactions", response_model=TransactionsResponse)
 async def get_transactions_endpoint(
-    count: Optional[int] = Query(None, ge=1, description="Limit number of transactions returned")
-) -> TransactionsResponse:
-    """Get transaction history in reverse chronological order (newest first).
+    count: Annotated[
+        Optional[int], Query(ge=1, description="Limit number of transactions returned")
+    ] = None,
+    limit: Annotated[Optional[int], Query(ge=1, description="Same as count")] = None,
+    after: Annotated[
+        Optional[int],
+        Query(ge=0, description="Only transactions after this sequence number, oldest first"),
+    ] = None,
+    before: Annotated[
+        Optional[int], Query(ge=1, description="Only transactions before this sequence number")
+    ] = None,
+    transaction_filter: Annotated[
+        Optional[TransactionFilter], Depends(transaction_filter_query)
+    ] = None,
+) -> Response:
+    """Get transaction history, newest first unless polling with an after cursor.
+
+    Every transaction carries a sequence number ("seq"). Pollers pass the highest
+    seq they have seen as after and receive only newer transactions, oldest first;
+    before pages backwards through older transactions, newest first. latest_seq in
+    the response is a cursor to start polling from.
+
+    Transactions can be filtered by method, status (code, class or range), mapping,
+    path prefix and time window; filters are served from secondary indexes, and
+    count and the cursors apply to the filtered transactions.
+
+    Each record is validated and serialized once and its JSON cached, so the
+    response document is assembled from bytes instead of re-validating every record.
 
     Args:
         count: Optional limit on number of transactions to return.
                Must be positive integer (≥ 1) if specified.
+        limit: Alternative name for count
+        after: Only return transactions with a greater sequence number
+        before: Only return transactions with a smaller sequence number
+        transaction_filter: Criteria built from the filter query parameters
 
     Returns:
-        TransactionsResponse containing list of transactions and count.
+        JSON shaped like TransactionsResponse: transactions, count and latest_seq.
 
     Raises:
-        HTTPException: 400 for invalid count parameter, 500 for storage errors.
+        HTTPException: 400 for invalid count or status parameters, 500 for storage errors.
     """
     try:
+        # Make sure records still queued for the background writer are visible
+        await flush_transaction_writer()
+
         # Get transactions from storage
-        transaction_dicts = get_transactions(count)
+        limit = limit if limit is not None else count
+        latest_seq = get_latest_sequence()
+        transaction_dicts = get_transactions(
+            limit, after=after, before=before, transaction_filter=transaction_filter
+        )
         logger.debug(f"Retrieved {len(transaction_dicts)} transactions from storage")
 
-        # Transform dict data to TransactionRecord models
-        transactions = [TransactionRecord(**transaction) for transaction in transaction_dicts]
+        # Serialize records (cached after first use), reading back captured bodies
+        response = transactions_response(transaction_dicts, latest_seq)
 
-        logger.info(f"Returning {len(transactions)} transactions (count limit: {count})")
+        logger.info(f"Returning {len(transaction_dicts)} transactions (count limit: {limit})")
 
-        return TransactionsResponse(transactions=transactions, count=len(transactions))
+        return response
 
     except Exception as e:
         logger.error(f"Failed to retrieve transactions: {e}")
@@ -0,0 +1,26 @@
+"""Upstream connection pool statistics endpoint for reverse proxy API."""
+
+from dataclasses import asdict
+
+from fastapi import APIRouter
+
+from ...core.settings import settings
+from ...core.upstream_client import get_upstream_pool_stats
+from ..models.upstream_stats_response import UpstreamStatsResponse
+
+router = APIRouter()
+
+
+@router.get("/upstream/stats", response_model=UpstreamStatsResponse)
+async def get_upstream_stats_endpoint() -> UpstreamStatsResponse:
+    """Get shared upstream client pool usage counters and configured limits.
+
+    Returns:
+        UpstreamStatsResponse with live counters for sizing the connection pool.
+    """
+    return UpstreamStatsResponse(
+        **asdict(get_upstream_pool_stats()),
+        max_connections=settings.upstream_max_connections,
+        max_keepalive_connections=settings.upstream_max_keepalive_connections,
+        max_connections_per_host=settings.upstream_max_connections_per_host,
+    )
@@ -0,0 +1,69 @@
+"""Long-poll endpoint waiting for transactions to be recorded."""
+
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from pyla_logger import logger
+
+from ...core.get_latest_sequence import get_latest_sequence
+from ...core.transaction_filter import TransactionFilter
+from ...core.wait_for_transactions import wait_for_transactions
+from ..models.wait_transactions_response import WaitTransactionsResponse
+from ..transaction_filter_query import transaction_filter_query
+from ..transaction_json import transactions_response
+
+router = APIRouter()
+
+# Longest a single long-poll request may block
+MAX_WAIT_TIMEOUT = 300.0
+
+
+@router.get("/transactions/wait", response_model=WaitTransactionsResponse)
+async def wait_for_transactions_endpoint(
+    transaction_filter: Annotated[TransactionFilter, Depends(transaction_filter_query)],
+    count: Annotated[
+        int, Query(ge=1, description="Number of matching transactions to wait for")
+    ] = 1,
+    timeout: Annotated[
+        float, Query(gt=0, le=MAX_WAIT_TIMEOUT, description="Seconds to wait before giving up")
+    ] = 30.0,
+    after: Annotated[
+        Optional[int],
+        Query(ge=0, description="Only count transactions after this sequence number"),
+    ] = None,
+) -> Response:
+    """Block until enough transactions matching the filters have been recorded.
+
+    Replaces sleep-and-poll loops in tests: the request is woken as soon as a
+    transaction is recorded instead of re-checking on an interval. By default the
+    whole history counts, so transactions recorded before the call satisfy it too;
+    pass after (e.g. the latest_seq of an earlier query) to wait for new ones only.
+
+    Args:
+        transaction_filter: Criteria built from the filter query parameters
+        count: Number of matching transactions to wait for
+        timeout: Seconds to wait before giving up
+        after: Only count transactions with a greater sequence number
+
+    Returns:
+        JSON shaped like WaitTransactionsResponse with the first count matching
+        transactions, oldest first. If the timeout expired first, it holds the
+        matches found so far and timed_out is true.
+
+    Raises:
+        HTTPException: 500 for storage errors.
+    """
+    try:
+        transactions = await wait_for_transactions(transaction_filter, count, timeout, after)
+        timed_out = len(transactions) < count
+        if timed_out:
+            logger.debug(
+                f"Timed out after {timeout}s waiting for {count} matching transactions "
+                f"(found {len(transactions)})"
+            )
+        return transactions_response(transactions, get_latest_sequence(), timed_out=timed_out)
+    except Exception as e:
+        logger.error(f"Failed to wait for transactions: {e}")
+        raise HTTPException(
+            status_code=500, detail="Internal server error while waiting for transactions"
+        )
@@ -0,0 +1,159 @@
+"""WebSocket proxy endpoint for reverse proxy API."""
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Union
+
+from fastapi import APIRouter, WebSocket
+from pyla_logger import logger
+from websockets.asyncio.client import ClientConnection, connect
+from websockets.exceptions import ConnectionClosed, InvalidHandshake, InvalidURI
+
+from ...core.body_capture import BodyCapture
+from ...core.get_proxy_config import get_proxy_config
+from ...core.pending_transaction import PendingTransaction
+from ...core.sessions import SESSION_HEADER
+from ...core.settings import settings
+from ...core.stream_capture import StreamCapture
+from ...core.transaction_writer import submit_transaction
+
+router = APIRouter()
+
+# Headers of the client handshake that the upstream handshake sets on its own
+WEBSOCKET_HANDSHAKE_HEADERS = (
+    "host",
+    "connection",
+    "upgrade",
+    "sec-websocket-key",
+    "sec-websocket-version",
+    "sec-websocket-extensions",
+    "sec-websocket-protocol",
+)
+
+# Close codes that describe a missing close frame and cannot be sent in one
+RESERVED_CLOSE_CODES = (1005, 1006, 1015)
+
+
+def _websocket_url(target_url: str, normalized_path: str, query: str) -> str:
+    """Build the upstream ws:// or wss:// URL for a mapping's http(s) target."""
+    url = f"{target_url.rstrip('/')}/{normalized_path.lstrip('/')}"
+    if url.startswith("https://"):
+        url = "wss://" + url.removeprefix("https://")
+    elif url.startswith("http://"):
+        url = "ws://" + url.removeprefix("http://")
+    return f"{url}?{query}" if query else url
+
+
+async def _client_to_upstream(
+    websocket: WebSocket, upstream: ClientConnection, stream: StreamCapture
+) -> None:
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+        data: Union[str, bytes] = (
+            message["text"] if message.get("text") is not None else message["bytes"]
+        )
+        stream.append("client", data)
+        await upstream.send(data)
+
+
+async def _upstream_to_client(
+    websocket: WebSocket, upstream: ClientConnection, stream: StreamCapture
+) -> None:
+    async for data in upstream:
+        stream.append("server", data)
+        if isinstance(data, str):
+            await websocket.send_text(data)
+        else:
+            await websocket.send_bytes(data)
+
+
+@router.websocket("/proxy/{path:path}")
+async def proxy_websocket(websocket: WebSocket, path: str) -> None:
+    """Proxy a WebSocket connection to the configured target, capturing its frames.
+
+    The upstream connection is opened before the client handshake is accepted, so the
+    client sees the upstream's choice of subprotocol. The transaction is recorded as
+    soon as both sides are connected, and every frame is appended to it as it passes
+    in either direction, up to the per-stream frame and byte limits.
+
+    Args:
+        websocket: The incoming WebSocket connection
+        path: The path portion after /proxy/ (captured by {path:path})
+    """
+    normalized_path = f"/{path}" if not path.startswith("/") else path
+    route = get_proxy_config(normalized_path)
+    if route is None or route.target_url is None:
+        logger.warning(f"No proxy configuration found for WebSocket path: {path}")
+        await websocket.close(code=1008)
+        return
+
+    upstream_url = _websocket_url(route.target_url, normalized_path, websocket.url.query)
+    headers = [
+        (name, value)
+        for name, value in websocket.headers.items()
+        if name not in WEBSOCKET_HANDSHAKE_HEADERS and name != SESSION_HEADER
+    ]
+    transaction_timestamp = datetime.now(timezone.utc)
+
+    try:
+        upstream = await connect(
+            upstream_url,
+            additional_headers=headers,
+            subprotocols=websocket.scope.get("subprotocols") or None,
+            open_timeout=settings.upstream_timeout,
+            max_size=None,
+        )
+    except (OSError, TimeoutError, InvalidHandshake, InvalidURI) as e:
+        logger.error(f"Failed to open WebSocket to target server {upstream_url}: {e}")
+        await websocket.close(code=1011)
+        return
+
+    await websocket.accept(subprotocol=upstream.subprotocol)
+    stream = StreamCapture("websocket")
+    await submit_transaction(
+        PendingTransaction(
+            timestamp=transaction_timestamp,
+            route=route,
+            normalized_path=normalized_path,
+            method="GET",
+            url=upstream_url,
+            request_headers=websocket.headers,
+            query_params=dict(websocket.query_params),
+            request_capture=BodyCapture(),
+            status_code=101,
+            response_headers=dict(upstream.response.headers) if upstream.response else {},
+            response_capture=BodyCapture(),
+            aborted=False,
+            stream=stream,
+        )
+    )
+
+    # Pump both directions until either side goes away, then close the other one
+    pumps = {
+        asyncio.create_task(_client_to_upstream(websocket, upstream, stream)),
+        asyncio.create_task(_upstream_to_client(websocket, upstream, stream)),
+    }
+    aborted = True
+    try:
+        done, _ = await asyncio.wait(pumps, return_when=asyncio.FIRST_COMPLETED)
+        errors = [pump.exception() for pump in done if pump.exception() is not None]
+        for error in errors:
+            if not isinstance(error, ConnectionClosed):
+                logger.error(f"WebSocket proxy to {upstream_url} failed: {error}")
+        aborted = bool(errors)
+    finally:
+        for pump in pumps:
+            pump.cancel()
+        stream.close(aborted=aborted)
+        await upstream.close()
+
+    close_code = upstream.close_code
+    if close_code is None or close_code in RESERVED_CLOSE_CODES:
+        close_code = 1011 if aborted else 1000
+    try:
+        await websocket.close(code=close_code)
+    except RuntimeError:
+        # The client already closed its side
+        pass
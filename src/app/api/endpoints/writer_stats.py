@@ -0,0 +1,25 @@
+"""Transaction writer statistics endpoint for reverse proxy API."""
+
+from dataclasses import asdict
+
+from fastapi import APIRouter
+
+from ...core.settings import settings
+from ...core.transaction_writer import get_transaction_writer_stats
+from ..models.writer_stats_response import WriterStatsResponse
+
+router = APIRouter()
+
+
+@router.get("/writer/stats", response_model=WriterStatsResponse)
+async def get_writer_stats_endpoint() -> WriterStatsResponse:
+    """Get background transaction writer counters.
+
+    Returns:
+        WriterStatsResponse with submitted, written, dropped and pending record counts.
+    """
+    return WriterStatsResponse(
+        **asdict(get_transaction_writer_stats()),
+        queue_size=settings.writer_queue_size,
+        full_policy=settings.writer_full_policy,
+    )
@@ -0,0 +1,20 @@
+"""Transaction history statistics response model for reverse proxy API."""
+
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class HistoryStatsResponse(BaseModel):
+    """Response model for GET /api/history/stats endpoint."""
+
+    stored: int = Field(..., description="Transactions currently in the history")
+    stored_bytes: int = Field(..., description="Captured body bytes of the stored transactions")
+    evicted: int = Field(..., description="Transactions evicted to stay within the limits")
+    evicted_bytes: int = Field(..., description="Captured body bytes of evicted transactions")
+    max_transactions: Optional[int] = Field(
+        ..., description="Configured record limit (null when unlimited)"
+    )
+    max_bytes: Optional[int] = Field(
+        ..., description="Configured body byte limit (null when unlimited)"
+    )
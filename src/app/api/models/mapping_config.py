@@ -0,0 +1,70 @@
+"""Mapping configuration model for reverse proxy API."""
+
+from typing import Optional, Union
+
+from pydantic import BaseModel, Field, model_validator
+
+from ...core.proxy_route import CaptureOverflow, ProxyRoute
+from .stub_config import StubConfig
+
+
+class MappingConfig(BaseModel):
+    """Detailed form of a proxy mapping, with per-mapping capture options and stubs."""
+
+    target_url: Optional[str] = Field(
+        default=None,
+        description="Target URL requests are forwarded to (may be omitted if stubs are given)",
+    )
+    capture_max_inline_bytes: Optional[int] = Field(
+        default=None, ge=0, description="Largest body stored inline (instance default if omitted)"
+    )
+    capture_overflow: Optional[CaptureOverflow] = Field(
+        default=None, description="Truncate larger bodies or write them to a blob file"
+    )
+    coalesce: bool = Field(
+        default=False,
+        description="Share one upstream fetch between identical concurrent GET/HEAD requests",
+    )
+    stubs: list[StubConfig] = Field(
+        default_factory=list,
+        description="Static responses answered in-process, the first matching stub wins",
+    )
+
+    @model_validator(mode="after")
+    def validate_target(self) -> "MappingConfig":
+        """Require somewhere to send requests: a target URL, stubs, or both."""
+        if self.target_url is None and not self.stubs:
+            raise ValueError("A mapping needs a target_url, stubs, or both")
+        return self
+
+    def to_route(self, prefix: str) -> ProxyRoute:
+        """Convert to the stored route for the given path prefix."""
+        return ProxyRoute(
+            prefix=prefix,
+            target_url=self.target_url,
+            capture_max_inline_bytes=self.capture_max_inline_bytes,
+            capture_overflow=self.capture_overflow,
+            coalesce=self.coalesce,
+            stubs=tuple(stub.to_stub() for stub in self.stubs),
+        )
+
+    @classmethod
+    def from_route(cls, route: ProxyRoute) -> Union[str, "MappingConfig"]:
+        """Convert a stored route back to its mapping, using the URL shorthand if possible."""
+        if (
+            route.target_url is not None
+            and route.capture_max_inline_bytes is None
+            and route.capture_overflow is None
+            and not route.coalesce
+            and not route.stubs
+        ):
+            return route.target_url
+        return cls.model_validate(
+            {
+                "target_url": route.target_url,
+                "capture_max_inline_bytes": route.capture_max_inline_bytes,
+                "capture_overflow": route.capture_overflow,
+                "coalesce": route.coalesce,
+                "stubs": [StubConfig.from_stub(stub) for stub in route.stubs],
+            }
+        )
@@ -0,0 +1,26 @@
+"""Session request model for reverse proxy API."""
+
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class SessionRequest(BaseModel):
+    """Request model for the POST /api/sessions endpoint."""
+
+    name: Optional[str] = Field(
+        default=None,
+        pattern=r"^[A-Za-z0-9_.-]{1,64}$",
+        description="Session name (a random one is picked if omitted)",
+        examples=["worker-gw0"],
+    )
+    max_transactions: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Transactions kept before the oldest are evicted (history default if omitted)",
+    )
+    max_bytes: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description="Captured body bytes kept before evicting (history default if omitted)",
+    )
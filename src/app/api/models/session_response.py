@@ -0,0 +1,33 @@
+"""Session response model for reverse proxy API."""
+
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from ...core.session import Session
+
+
+class SessionResponse(BaseModel):
+    """Response model describing one session."""
+
+    name: str = Field(..., description="Session name, for the X-Trixie-Session header")
+    path_prefix: str = Field(..., description="Path prefix selecting the session")
+    stored: int = Field(..., description="Transactions currently in the session's history")
+    max_transactions: Optional[int] = Field(
+        ..., description="Record limit of the session (null when unlimited)"
+    )
+    max_bytes: Optional[int] = Field(
+        ..., description="Body byte limit of the session (null when unlimited)"
+    )
+
+    @classmethod
+    def from_session(cls, session: Session) -> "SessionResponse":
+        """Describe a session."""
+        history = session.transaction_history
+        return cls(
+            name=session.name,
+            path_prefix=f"/sessions/{session.name}",
+            stored=len(history),
+            max_transactions=history.max_count,
+            max_bytes=history.max_bytes,
+        )
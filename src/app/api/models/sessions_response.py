@@ -0,0 +1,11 @@
+"""Sessions response model for reverse proxy API."""
+
+from pydantic import BaseModel, Field
+
+from .session_response import SessionResponse
+
+
+class SessionsResponse(BaseModel):
+    """Response model for the GET /api/sessions endpoint."""
+
+    sessions: list[SessionResponse] = Field(..., description="Named sessions, oldest first")
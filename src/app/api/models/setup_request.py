@@ -1,28 +1,58 @@
 """Setup request model for reverse proxy API."""
 
+from collections.abc import Mapping
+from typing import Union
+
 from pydantic import BaseModel, Field, field_validator
 
+from ...core.proxy_route import ProxyRoute
+from .mapping_config import MappingConfig
+
 
 class SetupRequest(BaseModel):
-    """Request model for POST /api/setup endpoint."""
+    """Request model for the POST and PATCH /api/setup endpoints."""
 
-    mappings: dict[str, str] = Field(
+    mappings: Mapping[str, Union[str, MappingConfig]] = Field(
         ...,
-        description="Path prefix to target URL mappings",
-        examples=[{"/v1/users": "https://api.example.com", "/v2/orders": "https://orders.api.com"}],
+        description="Path prefix to target URL (or detailed mapping configuration) mappings",
+        examples=[
+            {
+                "/v1/users": "https://api.example.com",
+                "/v2/files": {
+                    "target_url": "https://files.api.com",
+                    "capture_max_inline_bytes": 65536,
+                    "capture_overflow": "truncate",
+                },
+                "/v1/health": {
+                    "stubs": [{"method": "GET", "status_code": 200, "body": {"status": "ok"}}]
+                },
+            }
+        ],
     )
 
     @field_validator("mappings")
     @classmethod
-    def validate_mappings(cls, v: dict[str, str]) -> dict[str, str]:
+    def validate_mappings(
+        cls, v: Mapping[str, Union[str, MappingConfig]]
+    ) -> Mapping[str, Union[str, MappingConfig]]:
         """Validate path prefixes and target URLs."""
-        for prefix, target_url in v.items():
+        for prefix, mapping in v.items():
             # Validate path prefix starts with "/"
             if not prefix.startswith("/"):
                 raise ValueError(f"Path prefix '{prefix}' must start with '/'")
 
-            # Validate target URL is HTTP/HTTPS
-            if not target_url.startswith(("http://", "https://")):
+            # Validate target URL is HTTP/HTTPS (stub-only mappings have none)
+            target_url = mapping if isinstance(mapping, str) else mapping.target_url
+            if target_url is not None and not target_url.startswith(("http://", "https://")):
                 raise ValueError(f"Target URL '{target_url}' must be a valid HTTP/HTTPS URL")
 
         return v
+
+    def routes(self) -> list[ProxyRoute]:
+        """Get the routes described by the mappings."""
+        return [
+            (MappingConfig(target_url=mapping) if isinstance(mapping, str) else mapping).to_route(
+                prefix
+            )
+            for prefix, mapping in self.mappings.items()
+        ]
@@ -1,13 +1,18 @@
 """Setup response model for reverse proxy API."""
 
+from collections.abc import Mapping
+from typing import Union
+
 from pydantic import BaseModel, Field
 
+from .mapping_config import MappingConfig
+
 
 class SetupResponse(BaseModel):
-    """Response model for POST /api/setup endpoint."""
+    """Response model for the /api/setup endpoints."""
 
     success: bool = Field(..., description="Whether the setup was successful")
-    configured_mappings: dict[str, str] = Field(
-        ..., description="The mappings that were configured"
+    configured_mappings: Mapping[str, Union[str, MappingConfig]] = Field(
+        ..., description="The proxy mappings now in effect"
     )
     message: str = Field(..., description="Human-readable status message")
@@ -0,0 +1,70 @@
+"""Stub configuration model for reverse proxy API."""
+
+import json
+from typing import Any, Optional, Union
+
+from pydantic import BaseModel, Field
+
+from ...core.stub_response import StubResponse
+
+
+class StubConfig(BaseModel):
+    """A static response served for a mapping without contacting any upstream."""
+
+    method: Optional[str] = Field(
+        default=None, description="Only answer requests with this HTTP method (any if omitted)"
+    )
+    query: dict[str, str] = Field(
+        default_factory=dict, description="Query parameters the request must include"
+    )
+    status_code: int = Field(default=200, ge=100, le=599, description="Response status code")
+    headers: dict[str, str] = Field(default_factory=dict, description="Response headers")
+    body: Union[str, dict[str, Any], list[Any], None] = Field(
+        default=None, description="Response body, objects and lists are sent as JSON"
+    )
+
+    def to_stub(self) -> StubResponse:
+        """Convert to the stored stub, encoding the body once up front."""
+        headers = dict(self.headers)
+        has_content_type = any(name.lower() == "content-type" for name in headers)
+        if self.body is None:
+            body = b""
+        elif isinstance(self.body, str):
+            body = self.body.encode("utf-8")
+            if not has_content_type:
+                headers["content-type"] = "text/plain; charset=utf-8"
+        else:
+            body = json.dumps(self.body).encode("utf-8")
+            if not has_content_type:
+                headers["content-type"] = "application/json"
+        json_body = self.body is not None and not isinstance(self.body, str)
+
+        return StubResponse(
+            status_code=self.status_code,
+            headers=tuple(headers.items()),
+            body=body,
+            method=self.method.upper() if self.method else None,
+            query=tuple(sorted(self.query.items())),
+            json_body=json_body,
+            implied_content_type=self.body is not None and not has_content_type,
+        )
+
+    @classmethod
+    def from_stub(cls, stub: StubResponse) -> "StubConfig":
+        """Convert a stored stub back to the configuration it was created from."""
+        headers = dict(stub.headers)
+        if stub.implied_content_type:
+            headers.pop("content-type", None)
+        if stub.json_body:
+            body: Union[str, dict[str, Any], list[Any], None] = json.loads(stub.body)
+        else:
+            body = stub.body.decode("utf-8", errors="replace") if stub.body else None
+        return cls.model_validate(
+            {
+                "method": stub.method,
+                "query": dict(stub.query),
+                "status_code": stub.status_code,
+                "headers": headers,
+                "body": body,
+            }
+        )
@@ -1,6 +1,7 @@
 """Transaction record model for reverse proxy API."""
 
 from datetime import datetime
+from typing import Optional
 
 from pydantic import BaseModel, Field
 
@@ -9,11 +10,32 @@ class TransactionRecord(BaseModel):
     """Model for a single transaction record."""
 
     id: str = Field(..., description="Unique transaction identifier")
+    seq: Optional[int] = Field(
+        default=None, description="Sequence number, increasing by one per recorded transaction"
+    )
     timestamp: datetime = Field(..., description="When the transaction occurred")
     request: dict = Field(
-        ..., description="Complete request data (method, url, headers, body, etc.)"
+        default=..., description="Complete request data (method, url, headers, body, etc.)"
     )
     response: dict = Field(..., description="Complete response data (status, headers, body)")
     proxy_mapping_used: str = Field(
-        ..., description="Which path prefix mapping was used for this transaction"
+        default=..., description="Which path prefix mapping was used for this transaction"
+    )
+    aborted: bool = Field(
+        default=False,
+        description="Whether the client disconnected before the full response was sent",
+    )
+    replayed: bool = Field(
+        default=False, description="Whether the response was served from the replay file"
+    )
+    stubbed: bool = Field(
+        default=False, description="Whether the response was a stub defined in the mapping"
+    )
+    coalesced: bool = Field(
+        default=False,
+        description="Whether the response was shared from an identical concurrent request",
+    )
+    stream: Optional[dict] = Field(
+        default=None,
+        description="Frames captured so far for WebSocket and server-sent event streams",
     )
@@ -12,3 +12,6 @@ class TransactionsResponse(BaseModel):
 
     transactions: List[TransactionRecord] = Field(..., description="List of transaction records")
     count: int = Field(..., description="Number of transactions returned")
+    latest_seq: int = Field(
+        default=0, description="Sequence number of the newest transaction recorded so far"
+    )
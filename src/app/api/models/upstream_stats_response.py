@@ -0,0 +1,26 @@
+"""Upstream pool statistics response model for reverse proxy API."""
+
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class UpstreamStatsResponse(BaseModel):
+    """Response model for GET /api/upstream/stats endpoint."""
+
+    requests_total: int = Field(..., description="Requests sent upstream since startup")
+    in_flight: int = Field(..., description="Upstream requests whose response is still open")
+    peak_in_flight: int = Field(..., description="Highest number of concurrent upstream requests")
+    waiting_for_host_slot: int = Field(
+        ..., description="Requests currently queued behind the per-host connection cap"
+    )
+    in_flight_per_host: dict[str, int] = Field(
+        ..., description="Open upstream requests grouped by host"
+    )
+    connections_open: int = Field(..., description="Connections currently held by the pool")
+    connections_idle: int = Field(..., description="Pooled connections available for reuse")
+    max_connections: int = Field(..., description="Configured pool size")
+    max_keepalive_connections: int = Field(..., description="Configured keep-alive pool size")
+    max_connections_per_host: Optional[int] = Field(
+        ..., description="Configured per-host cap (null when unlimited)"
+    )
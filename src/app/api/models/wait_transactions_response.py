@@ -0,0 +1,14 @@
+"""Wait transactions response model for reverse proxy API."""
+
+from pydantic import Field
+
+from .transactions_response import TransactionsResponse
+
+
+class WaitTransactionsResponse(TransactionsResponse):
+    """Response model for GET /api/transactions/wait endpoint."""
+
+    timed_out: bool = Field(
+        default=False,
+        description="Whether the timeout expired before count matching transactions were recorded",
+    )
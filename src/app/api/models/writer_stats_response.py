@@ -0,0 +1,16 @@
+"""Transaction writer statistics response model for reverse proxy API."""
+
+from pydantic import BaseModel, Field
+
+
+class WriterStatsResponse(BaseModel):
+    """Response model for GET /api/writer/stats endpoint."""
+
+    submitted: int = Field(..., description="Transactions handed to the writer since startup")
+    written: int = Field(..., description="Transactions recorded in the history")
+    dropped: int = Field(..., description="Transactions discarded because the queue was full")
+    failed: int = Field(..., description="Transactions that could not be recorded")
+    pending: int = Field(..., description="Transactions waiting in the queue")
+    running: bool = Field(..., description="Whether the background writer task is running")
+    queue_size: int = Field(..., description="Configured queue capacity")
+    full_policy: str = Field(..., description="What happens when the queue is full")
@@ -1,10 +1,31 @@
 from fastapi import APIRouter
 
-from .endpoints import clear_transactions, health_check, proxy_setup, transactions
+from .endpoints import (
+    clear_transactions,
+    health_check,
+    history_stats,
+    proxy_setup,
+    sessions,
+    transaction_body,
+    transaction_export,
+    transaction_stream,
+    transactions,
+    upstream_stats,
+    wait_transactions,
+    writer_stats,
+)
 
 api_router = APIRouter()
 
 api_router.include_router(health_check.router)
 api_router.include_router(proxy_setup.router)
 api_router.include_router(transactions.router)
+api_router.include_router(wait_transactions.router)
+api_router.include_router(transaction_stream.router)
+api_router.include_router(transaction_export.router)
+api_router.include_router(transaction_body.router)
 api_router.include_router(clear_transactions.router)
+api_router.include_router(upstream_stats.router)
+api_router.include_router(writer_stats.router)
+api_router.include_router(history_stats.router)
+api_router.include_router(sessions.router)
@@ -0,0 +1,67 @@
+"""Middleware selecting the session each request works on."""
+
+from typing import Optional
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from starlette.websockets import WebSocketClose
+
+from ..core.sessions import SESSION_HEADER, get_session, using_session
+
+SESSION_PATH_PREFIX = "/sessions/"
+
+
+def _session_from_path(path: str) -> tuple[Optional[str], str]:
+    """Split a /sessions/{name}/... path into the session name and the rest."""
+    if not path.startswith(SESSION_PATH_PREFIX):
+        return None, path
+    name, _, rest = path[len(SESSION_PATH_PREFIX) :].partition("/")
+    return name, "/" + rest
+
+
+class SessionMiddleware:
+    """Run each request in the session it names.
+
+    A session is named by a /sessions/{name} path prefix, which is removed before
+    routing (so /sessions/a/proxy/v1/users is /proxy/v1/users in session "a"), or
+    by the X-Trixie-Session header. Requests naming no session work on the default
+    session; naming an unknown one gets a 404 (or closes the WebSocket).
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        name, path = _session_from_path(scope["path"])
+        if name is not None:
+            prefix = (SESSION_PATH_PREFIX + name).encode()
+            raw_path: bytes = scope.get("raw_path") or b""
+            scope = {**scope, "path": path}
+            if raw_path.startswith(prefix):
+                scope["raw_path"] = raw_path[len(prefix) :] or b"/"
+            else:
+                scope.pop("raw_path", None)
+        else:
+            name = Headers(scope=scope).get(SESSION_HEADER)
+        if name is None:
+            await self.app(scope, receive, send)
+            return
+
+        session = get_session(name)
+        if session is None:
+            if scope["type"] == "websocket":
+                await WebSocketClose(code=1008, reason=f"Unknown session: {name}")(
+                    scope, receive, send
+                )
+            else:
+                await JSONResponse({"detail": f"Unknown session: {name}"}, status_code=404)(
+                    scope, receive, send
+                )
+            return
+        with using_session(session):
+            await self.app(scope, receive, send)
@@ -0,0 +1,52 @@
+"""Streaming response that tees the proxied body into a capture buffer."""
+
+from collections.abc import AsyncIterator, Awaitable, Callable, Mapping
+from typing import Union
+
+import httpx
+from fastapi.responses import StreamingResponse
+from pyla_logger import logger
+from starlette.types import Receive, Scope, Send
+
+from ..core.body_capture import BodyCapture
+from ..core.sse_capture import SseCapture
+
+
+class TeeStreamingResponse(StreamingResponse):
+    """Stream an upstream response to the client chunk by chunk while capturing it.
+
+    The body is forwarded exactly as the upstream sent it: content-encoded (gzip, br,
+    deflate) bodies are passed through and captured without being decompressed.
+
+    The finalizer always runs once the response is over, whether the body was fully
+    delivered or the client disconnected part way, and is told which one happened.
+    """
+
+    def __init__(
+        self,
+        upstream: httpx.Response,
+        capture: Union[BodyCapture, SseCapture],
+        finalize: Callable[[bool], Awaitable[None]],
+        headers: Mapping[str, str],
+    ) -> None:
+        self._upstream = upstream
+        self._capture = capture
+        self._finalize = finalize
+        self._completed = False
+        super().__init__(self._tee(), status_code=upstream.status_code, headers=headers)
+
+    async def _tee(self) -> AsyncIterator[bytes]:
+        try:
+            async for chunk in self._upstream.aiter_raw():
+                self._capture.append(chunk)
+                yield chunk
+        except httpx.HTTPError as e:
+            logger.error(f"Upstream stream from {self._upstream.url} failed mid-body: {e}")
+            raise
+        self._completed = True
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self._finalize(self._completed)
@@ -0,0 +1,49 @@
+"""Query parameters that filter transactions."""
+
+from datetime import datetime
+from typing import Annotated, Optional
+
+from fastapi import HTTPException, Query
+
+from ..core.transaction_filter import TransactionFilter
+
+
+def transaction_filter_query(
+    method: Annotated[Optional[str], Query(description="Only this request method")] = None,
+    status: Annotated[
+        Optional[str],
+        Query(description='Only this response status: a code ("404"), class ("4xx") or range'),
+    ] = None,
+    proxy_mapping_used: Annotated[
+        Optional[str], Query(description="Only transactions that used this mapping")
+    ] = None,
+    path_prefix: Annotated[
+        Optional[str], Query(description="Only proxied paths under this prefix (whole segments)")
+    ] = None,
+    since: Annotated[
+        Optional[datetime], Query(description="Only transactions at or after this time")
+    ] = None,
+    until: Annotated[
+        Optional[datetime], Query(description="Only transactions at or before this time")
+    ] = None,
+) -> TransactionFilter:
+    """Build a transaction filter from query parameters (FastAPI dependency).
+
+    Raises:
+        HTTPException: 400 if the status filter is malformed
+    """
+    status_min = status_max = None
+    if status is not None:
+        try:
+            status_min, status_max = TransactionFilter.parse_status(status)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    return TransactionFilter(
+        method=method,
+        status_min=status_min,
+        status_max=status_max,
+        proxy_mapping_used=proxy_mapping_used,
+        path_prefix=path_prefix,
+        since=since,
+        until=until,
+    )
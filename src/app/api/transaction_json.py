@@ -0,0 +1,115 @@
+"""JSON serialization of stored transactions for the API, cached per record."""
+
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import Optional
+
+from fastapi import Response
+
+from ..core.render_transaction import render_transaction
+from ..core.settings import settings
+from ..core.transaction import Transaction
+from .models.transaction_record import TransactionRecord
+
+# Transactions holding a cached record, by object id, oldest cached first, with the
+# size of their record. Entries go away with their transaction, and the oldest ones
+# are dropped once the total exceeds json_cache_max_bytes.
+_cached: OrderedDict[int, tuple[weakref.ref[Transaction], int]] = OrderedDict()
+_cached_bytes = 0
+_cache_lock = threading.RLock()
+
+
+def _cacheable(transaction: Transaction) -> bool:
+    """Whether the serialized record can no longer change and is small enough to keep."""
+    if transaction.stream is not None and transaction.stream.open:
+        return False
+    body_bytes = 0
+    for body in (transaction.request_body, transaction.response_body):
+        if body is not None:
+            # Blob bodies are never kept resident
+            if body.blob_path is not None:
+                return False
+            body_bytes += body.size
+    return body_bytes <= settings.json_cache_max_body_bytes
+
+
+def _forget(key: int) -> None:
+    global _cached_bytes
+
+    with _cache_lock:
+        entry = _cached.pop(key, None)
+        if entry is not None:
+            _cached_bytes -= entry[1]
+
+
+def _cache(transaction: Transaction, data: bytes) -> None:
+    """Cache a serialized record on its transaction, within the total byte limit."""
+    global _cached_bytes
+
+    key = id(transaction)
+    with _cache_lock:
+        _forget(key)
+        transaction.serialized = data
+        _cached[key] = (weakref.ref(transaction, lambda _: _forget(key)), len(data))
+        _cached_bytes += len(data)
+        while _cached_bytes > settings.json_cache_max_bytes:
+            _, (oldest, size) = _cached.popitem(last=False)
+            _cached_bytes -= size
+            cached = oldest()
+            if cached is not None:
+                cached.serialized = None
+
+
+def transaction_json(transaction: Transaction, include_bodies: bool = True) -> bytes:
+    """Serialize a stored transaction as its API record.
+
+    The record is validated once, when it is first serialized. With bodies included
+    the bytes are then cached on the stored transaction, so later queries reuse them
+    without validating or encoding again; transactions whose stream is still open,
+    whose bodies overflowed to blobs or whose bodies exceed the cache limit are
+    serialized on every call. The cached records take at most json_cache_max_bytes
+    in total; beyond that the records cached longest ago are dropped.
+
+    Args:
+        transaction: Transaction data as stored in the history
+        include_bodies: Whether to include bodies and stream frames
+
+    Returns:
+        The record as UTF-8 JSON
+    """
+    if include_bodies and transaction.serialized is not None:
+        return transaction.serialized
+    rendered = render_transaction(transaction, include_bodies=include_bodies)
+    data = TransactionRecord(**rendered).model_dump_json().encode()
+    if include_bodies and _cacheable(transaction):
+        _cache(transaction, data)
+    return data
+
+
+def transactions_response(
+    transactions: Sequence[Transaction], latest_seq: int, timed_out: Optional[bool] = None
+) -> Response:
+    """Build a TransactionsResponse document from serialized records.
+
+    The document is assembled from the (cached) record bytes and returned as a plain
+    response, bypassing FastAPI's response_model validation of every record.
+
+    Args:
+        transactions: Stored transactions in response order
+        latest_seq: Sequence number of the newest transaction recorded so far
+        timed_out: Added as the timed_out field of a WaitTransactionsResponse if given
+
+    Returns:
+        application/json response shaped like TransactionsResponse
+    """
+    records = b",".join(transaction_json(transaction) for transaction in transactions)
+    body = b'{"transactions":[%b],"count":%d,"latest_seq":%d}' % (
+        records,
+        len(transactions),
+        latest_seq,
+    )
+    if timed_out is not None:
+        body = body[:-1] + b',"timed_out":%b}' % (b"true" if timed_out else b"false")
+    return Response(content=body, media_type="application/json")
@@ -1,13 +1,16 @@
 """Add proxy configuration function."""
 
-from .storage_data import proxy_configurations
+from .proxy_route import ProxyRoute
+from .route_table_update import route_table_update
+from .sessions import current_session
 
 
-def add_proxy_config(prefix: str, target_url: str) -> None:
-    """Add a proxy configuration mapping.
+def add_proxy_config(route: ProxyRoute) -> None:
+    """Add a proxy configuration mapping, replacing any with the same prefix.
 
     Args:
-        prefix: Path prefix to match (e.g., "/v1/users")
-        target_url: Target URL to forward to (e.g., "https://api.example.com")
+        route: Path prefix mapping to store (e.g., "/v1/users" -> "https://api.example.com")
     """
-    proxy_configurations[prefix] = target_url
+    session = current_session()
+    with route_table_update(session):
+        session.proxy_configurations = session.proxy_configurations.with_routes([route])
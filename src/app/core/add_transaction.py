@@ -1,12 +1,46 @@
 """Add transaction function."""
 
-from .storage_data import transaction_history
+from typing import Optional
 
+from pyla_logger import logger
 
-def add_transaction(transaction_data: dict) -> None:
-    """Add a transaction to the history.
+from .delete_transaction_blobs import delete_transaction_blobs
+from .release_session import release_session
+from .session import Session
+from .sessions import current_session
+from .transaction import Transaction
+from .transaction_listeners import notify_transaction_listeners
+from .transaction_log import log_transaction
+from .worker_sync import worker_sync_running
+
+
+def add_transaction(transaction_data: Transaction, session: Optional[Session] = None) -> None:
+    """Add a transaction to the history, evicting the oldest ones beyond the limits.
+
+    Listeners (long-polling waiters) are notified once the transaction is stored.
+    Transactions of a deleted session are dropped, with their overflow blob files.
+    With several workers they are notified by worker_sync instead, which also sees
+    the transactions recorded by the other workers.
 
     Args:
         transaction_data: Complete transaction data including request/response info
+        session: Session the transaction belongs to (the current one by default)
     """
-    transaction_history.append(transaction_data)
+    session = session or current_session()
+    if session.closed:
+        delete_transaction_blobs(transaction_data)
+        return
+    evicted = session.transaction_history.append(transaction_data)
+    if session.closed:
+        # Deleted while appending, possibly after release_session cleared the history
+        release_session(session)
+        return
+    if session.is_default:
+        log_transaction(transaction_data)
+    for transaction in evicted:
+        delete_transaction_blobs(transaction)
+    if evicted:
+        logger.debug(f"Evicted {len(evicted)} transactions from the history")
+    if not (session.is_default and worker_sync_running()):
+        # Otherwise worker_sync notifies listeners of the transactions of every worker
+        notify_transaction_listeners(transaction_data, session)
@@ -0,0 +1,68 @@
+"""On-disk storage for captured bodies that exceed the inline capture limit."""
+
+import mmap
+import os
+from collections.abc import Iterator
+
+from .settings import settings
+
+BLOB_READ_CHUNK_SIZE = 64 * 1024
+
+
+def blob_path(transaction_id: str, part: str) -> str:
+    """Get the blob file path for one body of a transaction.
+
+    Args:
+        transaction_id: Transaction the body belongs to
+        part: Which body it is ("request" or "response")
+
+    Returns:
+        Path of the blob file inside the configured blob directory
+    """
+    os.makedirs(settings.capture_blob_dir, exist_ok=True)
+    return os.path.join(settings.capture_blob_dir, f"{transaction_id}-{part}.bin")
+
+
+def read_blob(path: str) -> bytes:
+    """Read a whole blob through a read-only memory map.
+
+    Args:
+        path: Blob file path
+
+    Returns:
+        The blob contents
+    """
+    with open(path, "rb") as blob_file:
+        if os.fstat(blob_file.fileno()).st_size == 0:
+            return b""
+        with mmap.mmap(blob_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return mapped[:]
+
+
+def iter_blob(path: str) -> Iterator[bytes]:
+    """Stream a blob in slices of its memory map without loading it whole.
+
+    Args:
+        path: Blob file path
+
+    Yields:
+        Consecutive chunks of the blob
+    """
+    with open(path, "rb") as blob_file:
+        if os.fstat(blob_file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(blob_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for offset in range(0, len(mapped), BLOB_READ_CHUNK_SIZE):
+                yield mapped[offset : offset + BLOB_READ_CHUNK_SIZE]
+
+
+def delete_blob(path: str) -> None:
+    """Remove a blob file, ignoring blobs that are already gone.
+
+    Args:
+        path: Blob file path
+    """
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
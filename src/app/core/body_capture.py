@@ -0,0 +1,135 @@
+"""Body capture buffer used to tee streamed payloads into transactions."""
+
+import hashlib
+import shutil
+from collections.abc import AsyncIterable, AsyncIterator
+from tempfile import SpooledTemporaryFile
+
+from .settings import settings
+
+
+class BodyCapture:
+    """Accumulates the chunks of a streamed body as they pass through the proxy.
+
+    Chunks are kept in memory up to the configured spool threshold, after which the
+    capture rolls over to a temporary file so memory stays flat for large payloads.
+    """
+
+    def __init__(self) -> None:
+        self._threshold = settings.capture_spool_threshold
+        self._spool = SpooledTemporaryFile(max_size=self._threshold, dir=settings.capture_spool_dir)
+        self.size = 0
+
+    @classmethod
+    def of(cls, body: bytes) -> "BodyCapture":
+        """Create a capture already holding a complete body (e.g., served from memory)."""
+        capture = cls()
+        capture.append(body)
+        return capture
+
+    @property
+    def spilled(self) -> bool:
+        """Whether the capture has rolled over to disk."""
+        return 0 < self._threshold < self.size
+
+    def append(self, chunk: bytes) -> None:
+        """Record a chunk that was forwarded to the other side.
+
+        Args:
+            chunk: Bytes exactly as they were streamed
+        """
+        self._spool.write(chunk)
+        self.size += len(chunk)
+
+    async def tee(self, stream: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+        """Pass a stream through unchanged while recording every chunk.
+
+        Args:
+            stream: Source of body chunks
+
+        Yields:
+            The same chunks, in order
+        """
+        async for chunk in stream:
+            if chunk:
+                self.append(chunk)
+                yield chunk
+
+    async def consume(self, stream: AsyncIterable[bytes]) -> None:
+        """Record a whole stream that is not passed on anywhere.
+
+        Args:
+            stream: Source of body chunks
+        """
+        async for _ in self.tee(stream):
+            pass
+
+    def getvalue(self) -> bytes:
+        """Get the captured body.
+
+        Returns:
+            All captured bytes
+        """
+        self._spool.seek(0)
+        data = self._spool.read()
+        self._spool.seek(0, 2)
+        return data
+
+    async def iter_chunks(self, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+        """Stream the captured body back without loading it into memory at once.
+
+        Args:
+            chunk_size: Largest chunk yielded
+
+        Yields:
+            The captured bytes, in order
+        """
+        offset = 0
+        while offset < self.size:
+            self._spool.seek(offset)
+            chunk = self._spool.read(chunk_size)
+            self._spool.seek(0, 2)
+            if not chunk:
+                return
+            offset += len(chunk)
+            yield chunk
+
+    def sha256(self) -> str:
+        """Hash the captured body without loading it into memory at once.
+
+        Returns:
+            Hex digest of the captured bytes
+        """
+        self._spool.seek(0)
+        digest = hashlib.file_digest(self._spool, "sha256").hexdigest()
+        self._spool.seek(0, 2)
+        return digest
+
+    def read_prefix(self, length: int) -> bytes:
+        """Get the first bytes of the captured body.
+
+        Args:
+            length: Maximum number of bytes to return
+
+        Returns:
+            Up to length bytes from the start of the capture
+        """
+        self._spool.seek(0)
+        data = self._spool.read(length)
+        self._spool.seek(0, 2)
+        return data
+
+    def copy_to(self, path: str) -> None:
+        """Write the captured body to a file without loading it into memory.
+
+        Args:
+            path: Destination file path
+        """
+        self._spool.seek(0)
+        with open(path, "wb") as destination:
+            shutil.copyfileobj(self._spool, destination)
+        self._spool.seek(0, 2)
+
+    def close(self) -> None:
+        """Release the in-memory buffer or temporary file."""
+        self._spool.close()
@@ -0,0 +1,80 @@
+"""Fully read upstream response."""
+
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Optional, Union
+
+import httpx
+
+
+class _ResumedStream(httpx.AsyncByteStream):
+    """Body of a response partly read already: the chunks read so far, then the rest."""
+
+    def __init__(
+        self, head: list[bytes], rest: AsyncIterator[bytes], response: httpx.Response
+    ) -> None:
+        self._head = head
+        self._rest = rest
+        self._response = response
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for chunk in self._head:
+            yield chunk
+        async for chunk in self._rest:
+            yield chunk
+
+    async def aclose(self) -> None:
+        await self._response.aclose()
+
+
+@dataclass(frozen=True)
+class BufferedResponse:
+    """An upstream response read to the end, so it can be handed to several callers.
+
+    The body holds the raw bytes as sent by the upstream (still content-encoded).
+    """
+
+    status_code: int
+    headers: httpx.Headers
+    body: bytes
+
+    @classmethod
+    async def read(
+        cls, response: httpx.Response, max_bytes: Optional[int] = None
+    ) -> Union["BufferedResponse", httpx.Response]:
+        """Read a streamed upstream response to the end and release its connection.
+
+        A body larger than max_bytes is not buffered: reading stops as soon as the
+        limit is passed and a response streaming the whole body is returned instead.
+
+        Args:
+            response: Response opened with stream=True
+            max_bytes: Largest body that is buffered (no limit if None)
+
+        Returns:
+            The buffered response, or a still open response for bodies over max_bytes
+        """
+        content_length = response.headers.get("content-length", "")
+        if max_bytes is not None and content_length.isdigit() and int(content_length) > max_bytes:
+            return response
+        chunks: list[bytes] = []
+        size = 0
+        raw = response.aiter_raw()
+        try:
+            async for chunk in raw:
+                chunks.append(chunk)
+                size += len(chunk)
+                if max_bytes is not None and size > max_bytes:
+                    return httpx.Response(
+                        response.status_code,
+                        headers=response.headers,
+                        stream=_ResumedStream(chunks, raw, response),
+                        request=response.request,
+                    )
+        except BaseException:
+            await response.aclose()
+            raise
+        await response.aclose()
+        return cls(
+            status_code=response.status_code, headers=response.headers, body=b"".join(chunks)
+        )
@@ -0,0 +1,147 @@
+"""Captured body storage for recorded transactions."""
+
+import base64
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Literal, Optional
+
+from .blob_store import read_blob
+from .body_capture import BodyCapture
+from .content_decoding import decode_content
+from .proxy_route import CaptureOverflow
+
+BodyEncoding = Literal["utf-8", "base64"]
+
+# Content types that are always rendered as text, even if they contain invalid UTF-8
+TEXT_CONTENT_TYPES = (
+    "text/",
+    "application/json",
+    "application/xml",
+    "application/javascript",
+    "application/x-www-form-urlencoded",
+)
+TEXT_CONTENT_TYPE_SUFFIXES = ("+json", "+xml")
+
+
+def _is_text_content_type(content_type: Optional[str]) -> bool:
+    if not content_type:
+        return False
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type.startswith(TEXT_CONTENT_TYPES) or media_type.endswith(
+        TEXT_CONTENT_TYPE_SUFFIXES
+    )
+
+
+@dataclass(frozen=True)
+class CapturedBody:
+    """A body as stored in the transaction history.
+
+    The raw bytes are kept exactly as captured, still content-encoded (e.g. gzip) if
+    they were on the wire, and only decompressed and decoded when the transaction is
+    rendered for the API: text bodies as UTF-8, anything else that is not valid UTF-8
+    as base64. The decoded form of inline bodies is cached after first use.
+
+    Bodies within the inline limit are kept in memory. Larger bodies are either cut
+    down to the limit (truncated) or moved to a blob file that is read back through
+    a memory map only when the body is requested.
+    """
+
+    data: bytes
+    size: int
+    content_type: Optional[str] = None
+    content_encoding: Optional[str] = None
+    truncated: bool = False
+    blob_path: Optional[str] = None
+
+    @classmethod
+    def from_capture(
+        cls,
+        capture: BodyCapture,
+        max_inline_bytes: int,
+        overflow: CaptureOverflow,
+        blob_path: str,
+        content_type: Optional[str] = None,
+        content_encoding: Optional[str] = None,
+    ) -> "CapturedBody":
+        """Store a finished capture according to the capture limits.
+
+        Args:
+            capture: The streamed body capture
+            max_inline_bytes: Largest body kept inline in memory
+            overflow: What to do with larger bodies ("truncate" or "blob")
+            blob_path: Where to write the body if it overflows to a blob
+            content_type: Content type of the message the body belongs to
+            content_encoding: Content encoding of the message the body belongs to
+
+        Returns:
+            The stored body
+        """
+        if capture.size <= max_inline_bytes:
+            return cls(
+                data=capture.getvalue(),
+                size=capture.size,
+                content_type=content_type,
+                content_encoding=content_encoding,
+            )
+        if overflow == "blob":
+            capture.copy_to(blob_path)
+            return cls(
+                data=b"",
+                size=capture.size,
+                content_type=content_type,
+                content_encoding=content_encoding,
+                blob_path=blob_path,
+            )
+        return cls(
+            data=capture.read_prefix(max_inline_bytes),
+            size=capture.size,
+            content_type=content_type,
+            content_encoding=content_encoding,
+            truncated=True,
+        )
+
+    def read(self) -> bytes:
+        """Get the stored bytes, mapping the blob file in if the body overflowed."""
+        if self.blob_path is not None:
+            return read_blob(self.blob_path)
+        return self.data
+
+    def read_decoded(self) -> bytes:
+        """Get the stored bytes with any content-encoding removed."""
+        return decode_content(self.read(), self.content_encoding)
+
+    def decode(self) -> tuple[str, BodyEncoding]:
+        """Decompress and decode the stored bytes for the API.
+
+        Returns:
+            Tuple of (decoded body, encoding used)
+        """
+        data = self.read_decoded()
+        if _is_text_content_type(self.content_type):
+            return data.decode("utf-8", errors="replace"), "utf-8"
+        try:
+            return data.decode("utf-8"), "utf-8"
+        except UnicodeDecodeError:
+            return base64.b64encode(data).decode("ascii"), "base64"
+
+    @cached_property
+    def _decoded(self) -> tuple[str, BodyEncoding]:
+        return self.decode()
+
+    def to_metadata_fields(self) -> dict[str, Any]:
+        """Get the API representation of the body without reading or decoding it."""
+        return {"body_size": self.size, "body_truncated": self.truncated}
+
+    def to_fields(self) -> dict[str, Any]:
+        """Get the API representation of the body.
+
+        Blob-backed bodies are decoded on every call rather than cached, so they never
+        stay resident in memory.
+        """
+        body, encoding = self._decoded if self.blob_path is None else self.decode()
+        return {
+            "body": body,
+            "body_encoding": encoding,
+            "body_size": self.size,
+            "body_truncated": self.truncated,
+        }
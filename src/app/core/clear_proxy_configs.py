@@ -1,8 +1,12 @@
 """Clear proxy configurations function."""
 
-from .storage_data import proxy_configurations
+from .route_table_update import route_table_update
+from .route_trie import RouteTrie
+from .sessions import current_session
 
 
 def clear_proxy_configs() -> None:
     """Clear all proxy configurations."""
-    proxy_configurations.clear()
+    session = current_session()
+    with route_table_update(session):
+        session.proxy_configurations = RouteTrie()
@@ -2,16 +2,22 @@
 
 from pyla_logger import logger
 
-from .storage_data import transaction_history
+from .delete_transaction_blobs import delete_transaction_blobs
+from .sessions import current_session
+from .transaction_log import log_clear
 
 
 def clear_transactions() -> int:
-    """Clear all transactions from storage.
+    """Clear the session's transactions, including their overflow blob files.
 
     Returns:
         int: Number of transactions that were cleared.
     """
-    count = len(transaction_history)
-    transaction_history.clear()
+    session = current_session()
+    count, removed = session.transaction_history.clear()
+    if session.is_default:
+        log_clear()
+    for transaction in removed:
+        delete_transaction_blobs(transaction)
     logger.info(f"Cleared {count} transactions from storage")
     return count
@@ -0,0 +1,61 @@
+"""Lazy decompression of content-encoded captured bodies."""
+
+import zlib
+from typing import Any, Optional
+
+from pyla_logger import logger
+
+try:
+    import brotli  # type: ignore[import-not-found]
+except ImportError:  # optional, only needed to read br-encoded bodies
+    brotli = None
+
+IDENTITY_ENCODINGS = ("", "identity")
+
+
+def _decompress(data: bytes, encoding: str) -> bytes:
+    decompressor: Any
+    if encoding in ("gzip", "x-gzip"):
+        decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    elif encoding == "deflate":
+        # Servers send both zlib-wrapped and raw deflate streams
+        try:
+            return zlib.decompressobj(zlib.MAX_WBITS).decompress(data)
+        except zlib.error:
+            decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+    elif encoding == "br":
+        if brotli is None:
+            raise ValueError("brotli support is not installed")
+        decompressor = brotli.Decompressor()
+        return decompressor.process(data)
+    else:
+        raise ValueError(f"unsupported content-encoding '{encoding}'")
+    # No flush of the final block, so a truncated body yields whatever was complete
+    return decompressor.decompress(data)
+
+
+def decode_content(data: bytes, content_encoding: Optional[str]) -> bytes:
+    """Undo the content-encoding of a captured body.
+
+    Encodings are removed in the reverse order they were applied. Truncated bodies
+    decode to as much content as their bytes hold.
+
+    Args:
+        data: Body bytes as they went over the wire
+        content_encoding: Value of the message's content-encoding header
+
+    Returns:
+        The decoded bytes, or the original bytes if they cannot be decoded
+    """
+    if not content_encoding:
+        return data
+    encodings = [part.strip().lower() for part in content_encoding.split(",")]
+    decoded = data
+    try:
+        for encoding in reversed(encodings):
+            if encoding not in IDENTITY_ENCODINGS:
+                decoded = _decompress(decoded, encoding)
+    except (ValueError, zlib.error) as e:
+        logger.warning(f"Could not decode {content_encoding} body, keeping raw bytes: {e}")
+        return data
+    return decoded
@@ -0,0 +1,32 @@
+"""Create transaction backend function."""
+
+from .settings import settings
+from .sqlite_transaction_store import SqliteTransactionStore
+from .transaction_backend import TransactionBackend
+from .transaction_store import TransactionStore
+
+
+def create_transaction_backend() -> TransactionBackend:
+    """Create the configured transaction history backend.
+
+    Returns:
+        The in-memory store, the SQLite store if TRIXIE_HISTORY_BACKEND is "sqlite", or
+        a shared SQLite store if TRIXIE_WORKERS is above 1
+    """
+    if settings.workers > 1:
+        return SqliteTransactionStore(
+            settings.history_sqlite_path,
+            max_count=settings.history_max_transactions,
+            max_bytes=settings.history_max_bytes,
+            shared=True,
+        )
+    if settings.history_backend == "sqlite":
+        return SqliteTransactionStore(
+            settings.history_sqlite_path,
+            max_count=settings.history_max_transactions,
+            max_bytes=settings.history_max_bytes,
+            batch_size=settings.history_sqlite_batch_size,
+        )
+    return TransactionStore(
+        max_count=settings.history_max_transactions, max_bytes=settings.history_max_bytes
+    )
@@ -0,0 +1,15 @@
+"""Delete transaction blobs function."""
+
+from .blob_store import delete_blob
+from .transaction import Transaction
+
+
+def delete_transaction_blobs(transaction: Transaction) -> None:
+    """Delete the overflow blob files of a transaction that leaves the history.
+
+    Args:
+        transaction: Transaction data whose bodies may have overflowed to blobs
+    """
+    for body in (transaction.request_body, transaction.response_body):
+        if body is not None and body.blob_path is not None:
+            delete_blob(body.blob_path)
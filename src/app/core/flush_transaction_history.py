@@ -0,0 +1,8 @@
+"""Flush transaction history function."""
+
+from .storage_data import transaction_history
+
+
+def flush_transaction_history() -> None:
+    """Write out anything the history backend buffered."""
+    transaction_history.flush()
@@ -0,0 +1,13 @@
+"""Get transaction history statistics function."""
+
+from .sessions import current_session
+from .transaction_backend import TransactionStoreStats
+
+
+def get_history_stats() -> TransactionStoreStats:
+    """Get the transaction history size and eviction counters.
+
+    Returns:
+        Counters for stored and evicted transactions and their captured body bytes
+    """
+    return current_session().transaction_history.stats()
@@ -0,0 +1,12 @@
+"""Get latest transaction sequence number function."""
+
+from .sessions import current_session
+
+
+def get_latest_sequence() -> int:
+    """Get the sequence number of the newest transaction recorded so far.
+
+    Returns:
+        The newest sequence number, or 0 if nothing was recorded yet
+    """
+    return current_session().transaction_history.latest_seq
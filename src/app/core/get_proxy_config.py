@@ -2,28 +2,23 @@
 
 from typing import Optional
 
-from .storage_data import proxy_configurations
+from .proxy_route import ProxyRoute
+from .sessions import current_session
 
 
-def get_proxy_config(path: str) -> Optional[str]:
-    """Get the target URL for a given path using prefix matching.
+def get_proxy_config(path: str) -> Optional[ProxyRoute]:
+    """Get the route for a given path using prefix matching.
 
-    Finds the longest matching prefix for accurate routing.
+    Finds the longest matching prefix (on whole path segments) by walking the route
+    trie, so the cost depends on the path length rather than the number of mappings.
+    The published route table is read once, so a concurrent update cannot be seen
+    half applied. With several workers, tables published by other workers are picked
+    up by worker_sync every TRIXIE_WORKER_SYNC_INTERVAL seconds, not per request.
 
     Args:
         path: The request path to match (e.g., "/v1/users/123")
 
     Returns:
-        Target URL if a matching prefix is found, None otherwise
+        Route holding the target URL if a matching prefix is found, None otherwise
     """
-    if not proxy_configurations:
-        return None
-
-    # Sort prefixes by length (longest first) for accurate matching
-    sorted_prefixes = sorted(proxy_configurations.keys(), key=len, reverse=True)
-
-    for prefix in sorted_prefixes:
-        if path.startswith(prefix):
-            return proxy_configurations[prefix]
-
-    return None
+    return current_session().proxy_configurations.longest_match(path)
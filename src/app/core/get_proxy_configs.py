@@ -0,0 +1,17 @@
+"""Get proxy configurations function."""
+
+from .route_trie import RouteTrie
+from .sessions import current_session
+from .worker_sync import sync_route_table
+
+
+def get_proxy_configs() -> RouteTrie:
+    """Get the current route table snapshot.
+
+    Returns:
+        The published route table (immutable, safe to iterate while it is replaced)
+    """
+    session = current_session()
+    if session.is_default:
+        sync_route_table()
+    return session.proxy_configurations
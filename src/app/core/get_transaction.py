@@ -0,0 +1,18 @@
+"""Get transaction function."""
+
+from typing import Optional
+
+from .sessions import current_session
+from .transaction import Transaction
+
+
+def get_transaction(transaction_id: str) -> Optional[Transaction]:
+    """Get a single transaction by its ID.
+
+    Args:
+        transaction_id: Unique transaction identifier
+
+    Returns:
+        Transaction data dictionary if found, None otherwise
+    """
+    return current_session().transaction_history.get(transaction_id)
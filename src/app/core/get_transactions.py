@@ -2,22 +2,40 @@
 
 from typing import Optional
 
-from .storage_data import transaction_history
+from .sessions import current_session
+from .transaction import Transaction
+from .transaction_filter import TransactionFilter
 
 
-def get_transactions(count: Optional[int] = None) -> list[dict]:
-    """Get transaction history in reverse chronological order (newest first).
+def get_transactions(
+    count: Optional[int] = None,
+    after: Optional[int] = None,
+    before: Optional[int] = None,
+    transaction_filter: Optional[TransactionFilter] = None,
+) -> list[Transaction]:
+    """Get transaction history, optionally between two sequence number cursors.
+
+    Without an after cursor transactions are returned newest first, so count picks
+    the most recent ones (before pages further back). With an after cursor they are
+    returned oldest first, so a poller gets the next count transactions it has not
+    seen yet. Only the returned transactions are copied; filtered queries only look
+    at the transactions found through the most selective matching index.
 
     Args:
         count: Optional limit on number of transactions to return
+        after: Only transactions with a sequence number greater than this
+        before: Only transactions with a sequence number smaller than this
+        transaction_filter: Only transactions meeting these criteria
 
     Returns:
         List of transaction data dictionaries
     """
-    # Return transactions in reverse chronological order (newest first)
-    transactions = transaction_history[::-1]
-
-    if count is not None:
-        return transactions[:count] if count > 0 else []
-
-    return transactions
+    if count is not None and count <= 0:
+        return []
+    return current_session().transaction_history.select(
+        after=after,
+        before=before,
+        limit=count,
+        newest_first=after is None,
+        transaction_filter=transaction_filter,
+    )
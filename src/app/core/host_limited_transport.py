@@ -0,0 +1,122 @@
+"""Pooled upstream transport with per-host concurrency caps and usage counters."""
+
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass, field, replace
+from typing import Optional, cast
+
+import httpx
+
+
+@dataclass
+class UpstreamPoolStats:
+    """Usage counters for the shared upstream connection pool."""
+
+    requests_total: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    waiting_for_host_slot: int = 0
+    in_flight_per_host: dict[str, int] = field(default_factory=dict)
+    connections_open: int = 0
+    connections_idle: int = 0
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response stream that releases its host slot once the body is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]) -> None:
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+class HostLimitedTransport(httpx.AsyncHTTPTransport):
+    """HTTP transport enforcing an optional per-host cap on concurrent requests.
+
+    A request holds its host slot until the response body is closed, so the cap
+    also bounds the number of pooled connections any single upstream can occupy.
+    """
+
+    def __init__(
+        self, limits: httpx.Limits, max_connections_per_host: Optional[int] = None
+    ) -> None:
+        super().__init__(limits=limits)
+        self._max_connections_per_host = max_connections_per_host
+        self._host_semaphores: dict[str, asyncio.Semaphore] = {}
+        self.stats = UpstreamPoolStats()
+
+    def snapshot_stats(self) -> UpstreamPoolStats:
+        """Copy the usage counters together with the current pool occupancy."""
+        connections = self._pool.connections
+        return replace(
+            self.stats,
+            in_flight_per_host=dict(self.stats.in_flight_per_host),
+            connections_open=len(connections),
+            connections_idle=sum(1 for connection in connections if connection.is_idle()),
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.netloc.decode("ascii")
+        semaphore = self._host_semaphore(host)
+
+        if semaphore is not None:
+            self.stats.waiting_for_host_slot += 1
+            try:
+                await semaphore.acquire()
+            finally:
+                self.stats.waiting_for_host_slot -= 1
+
+        self._track_start(host)
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if released:
+                return
+            released = True
+            self._track_end(host)
+            if semaphore is not None:
+                semaphore.release()
+
+        try:
+            response = await super().handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+
+        response.stream = _ReleasingStream(cast(httpx.AsyncByteStream, response.stream), release)
+        return response
+
+    def _host_semaphore(self, host: str) -> Optional[asyncio.Semaphore]:
+        if self._max_connections_per_host is None:
+            return None
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self._max_connections_per_host)
+            self._host_semaphores[host] = semaphore
+        return semaphore
+
+    def _track_start(self, host: str) -> None:
+        stats = self.stats
+        stats.requests_total += 1
+        stats.in_flight += 1
+        stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+        stats.in_flight_per_host[host] = stats.in_flight_per_host.get(host, 0) + 1
+
+    def _track_end(self, host: str) -> None:
+        stats = self.stats
+        stats.in_flight -= 1
+        remaining = stats.in_flight_per_host.get(host, 1) - 1
+        if remaining:
+            stats.in_flight_per_host[host] = remaining
+        else:
+            stats.in_flight_per_host.pop(host, None)
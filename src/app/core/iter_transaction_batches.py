@@ -0,0 +1,40 @@
+"""Iterate transaction batches function."""
+
+from collections.abc import Iterator
+from typing import Optional
+
+from .get_latest_sequence import get_latest_sequence
+from .get_transactions import get_transactions
+from .transaction import Transaction
+from .transaction_filter import TransactionFilter
+
+
+def iter_transaction_batches(
+    transaction_filter: Optional[TransactionFilter] = None,
+    after: Optional[int] = None,
+    batch_size: int = 100,
+) -> Iterator[list[Transaction]]:
+    """Iterate over the history in small batches, oldest first.
+
+    Only one batch is copied out of the history at a time. The iteration stops at
+    the newest transaction recorded when it started, so it ends even while traffic
+    keeps coming in; transactions evicted in the meantime are skipped.
+
+    Args:
+        transaction_filter: Only transactions meeting these criteria
+        after: Only transactions with a sequence number greater than this
+        batch_size: Largest number of transactions per batch
+
+    Yields:
+        Lists of transaction data dictionaries
+    """
+    cursor = after or 0
+    end = get_latest_sequence() + 1
+    while True:
+        batch = get_transactions(
+            batch_size, after=cursor, before=end, transaction_filter=transaction_filter
+        )
+        if not batch:
+            return
+        yield batch
+        cursor = batch[-1]["seq"]
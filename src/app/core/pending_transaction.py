@@ -0,0 +1,102 @@
+"""Pending transaction captured on the proxy path, awaiting post-processing."""
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+from uuid import uuid4
+
+from .body_capture import BodyCapture
+from .proxy_route import ProxyRoute
+from .session import Session
+from .sessions import current_session
+from .store_captured_body import store_captured_body
+from .stream_capture import StreamCapture
+from .transaction import Transaction, share_headers, share_string
+
+
+def _header_items(headers: Mapping[str, str]) -> Iterable[tuple[str, str]]:
+    """Get every header of a message, repeated headers (Set-Cookie) included."""
+    # httpx joins repeated headers in items() and lists them apart in multi_items()
+    multi_items = getattr(headers, "multi_items", None)
+    return multi_items() if multi_items is not None else headers.items()
+
+
+@dataclass
+class PendingTransaction:
+    """Everything the proxy path hands over for a transaction, as cheap references.
+
+    All copying, formatting and body storage happens in build(), which runs on the
+    background writer instead of the response path.
+    """
+
+    timestamp: datetime
+    route: ProxyRoute
+    normalized_path: str
+    method: str
+    url: str
+    request_headers: Mapping[str, str]
+    query_params: Mapping[str, str]
+    request_capture: BodyCapture
+    status_code: int
+    response_headers: Mapping[str, str]
+    response_capture: BodyCapture
+    aborted: bool
+    replayed: bool = False
+    stubbed: bool = False
+    coalesced: bool = False
+    stream: Optional[StreamCapture] = None
+    record_replay: bool = False
+    # Captured where the request is handled, since the writer runs outside of it
+    session: Session = field(default_factory=current_session)
+
+    @property
+    def spilled(self) -> bool:
+        """Whether either capture was spooled to disk (building it means file I/O)."""
+        return self.request_capture.spilled or self.response_capture.spilled
+
+    def build(self) -> Transaction:
+        """Build the transaction stored in the history.
+
+        Returns:
+            Complete transaction including request/response info
+        """
+        transaction_id = str(uuid4())
+        target = "stub" if self.stubbed else self.route.target_url
+        return Transaction(
+            id=transaction_id,
+            timestamp=self.timestamp,
+            method=share_string(self.method),
+            url=self.url,
+            request_headers=share_headers(_header_items(self.request_headers)),
+            query_params=tuple(self.query_params.items()),
+            request_body=store_captured_body(
+                self.route,
+                self.request_capture,
+                transaction_id,
+                "request",
+                self.request_headers.get("content-type"),
+                self.request_headers.get("content-encoding"),
+            ),
+            status_code=self.status_code,
+            response_headers=share_headers(_header_items(self.response_headers)),
+            response_body=store_captured_body(
+                self.route,
+                self.response_capture,
+                transaction_id,
+                "response",
+                self.response_headers.get("content-type"),
+                self.response_headers.get("content-encoding"),
+            ),
+            proxy_mapping_used=share_string(f"{self.normalized_path} -> {target}"),
+            aborted=self.aborted,
+            replayed=self.replayed,
+            stubbed=self.stubbed,
+            coalesced=self.coalesced,
+            stream=self.stream,
+        )
+
+    def close(self) -> None:
+        """Release the body captures."""
+        self.request_capture.close()
+        self.response_capture.close()
@@ -0,0 +1,34 @@
+"""Proxy route definition."""
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Literal, Optional
+
+from .stub_response import StubResponse
+
+CaptureOverflow = Literal["truncate", "blob"]
+
+
+@dataclass(frozen=True)
+class ProxyRoute:
+    """A configured path prefix mapping and its per-mapping options.
+
+    Options left as None fall back to the instance-wide settings. Requests matching
+    one of the stubs are answered in-process; the others go to the target URL, which
+    is None for stub-only mappings. With coalesce set, identical concurrent GET and
+    HEAD requests share one upstream fetch.
+    """
+
+    prefix: str
+    target_url: Optional[str]
+    capture_max_inline_bytes: Optional[int] = None
+    capture_overflow: Optional[CaptureOverflow] = None
+    stubs: tuple[StubResponse, ...] = ()
+    coalesce: bool = False
+
+    def find_stub(self, method: str, query_params: Mapping[str, str]) -> Optional[StubResponse]:
+        """Get the first stub answering the request, None if it goes upstream."""
+        for stub in self.stubs:
+            if stub.matches(method, query_params):
+                return stub
+        return None
@@ -0,0 +1,15 @@
+"""Release session function."""
+
+from .delete_transaction_blobs import delete_transaction_blobs
+from .session import Session
+
+
+def release_session(session: Session) -> None:
+    """Drop the transactions of a deleted session, including their overflow blob files.
+
+    Args:
+        session: Session already removed with delete_session
+    """
+    _, removed = session.transaction_history.clear()
+    for transaction in removed:
+        delete_transaction_blobs(transaction)
@@ -0,0 +1,21 @@
+"""Remove proxy configuration function."""
+
+from .route_table_update import route_table_update
+from .sessions import current_session
+
+
+def remove_proxy_config(prefix: str) -> bool:
+    """Remove the mapping for exactly this path prefix.
+
+    Args:
+        prefix: Path prefix of the mapping to remove (e.g., "/v1/users")
+
+    Returns:
+        True if a mapping was removed, False if none was configured for the prefix
+    """
+    session = current_session()
+    with route_table_update(session):
+        if prefix not in session.proxy_configurations:
+            return False
+        session.proxy_configurations = session.proxy_configurations.without_prefixes([prefix])
+        return True
@@ -0,0 +1,33 @@
+"""Render transaction function."""
+
+from .transaction import Transaction
+
+
+def render_transaction(transaction: Transaction, include_bodies: bool = True) -> dict:
+    """Expand the captured bodies of a stored transaction into their API representation.
+
+    Args:
+        transaction: Transaction data as stored in the history
+        include_bodies: Whether to read back bodies and stream frames, or only report
+            their sizes
+
+    Returns:
+        Transaction data with each request/response body read back and decoded, and
+        the frames captured so far for streamed (WebSocket/SSE) transactions
+    """
+    rendered = dict(transaction)
+    for part, body in (
+        ("request", transaction.request_body),
+        ("response", transaction.response_body),
+    ):
+        if body is not None:
+            message = rendered[part]
+            if include_bodies:
+                rendered[part] = {**message, **body.to_fields()}
+            else:
+                rendered[part] = {**message, "body": None, **body.to_metadata_fields()}
+    stream = transaction.stream
+    if stream is not None:
+        rendered["stream"] = stream.to_fields(include_frames=include_bodies)
+        rendered["aborted"] = stream.aborted
+    return rendered
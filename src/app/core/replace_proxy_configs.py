@@ -0,0 +1,27 @@
+"""Replace proxy configurations function."""
+
+from collections.abc import Iterable
+
+from .proxy_route import ProxyRoute
+from .route_table_update import route_table_update
+from .route_trie import RouteTrie
+from .sessions import current_session
+
+
+def replace_proxy_configs(routes: Iterable[ProxyRoute]) -> int:
+    """Replace the whole route table with the given routes.
+
+    The new table is built off to the side and published with a single swap, so
+    concurrent proxy requests see either the old or the new table, never a partial one.
+
+    Args:
+        routes: Routes making up the new table
+
+    Returns:
+        Number of mappings in the new route table
+    """
+    table = RouteTrie.build(routes)
+    session = current_session()
+    with route_table_update(session):
+        session.proxy_configurations = table
+    return len(table)
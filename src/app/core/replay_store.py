@@ -0,0 +1,153 @@
+"""Recorded responses for record-and-replay mode."""
+
+import base64
+import hashlib
+import json
+import os
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from pyla_logger import logger
+
+from .body_capture import BodyCapture
+from .settings import settings
+from .transaction import Transaction
+
+ReplayKey = tuple[str, str, tuple[tuple[str, str], ...], Optional[str]]
+
+
+@dataclass(frozen=True)
+class ReplayEntry:
+    """A recorded upstream response, with the body exactly as it was sent."""
+
+    status_code: int
+    headers: tuple[tuple[str, str], ...]
+    body: bytes
+
+
+_entries: dict[ReplayKey, ReplayEntry] = {}
+_loaded = False
+_lock = threading.Lock()
+
+
+def _body_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+def _replay_key(
+    method: str, path: str, query_params: Mapping[str, str], body_sha256: Optional[str]
+) -> ReplayKey:
+    return (
+        method.upper(),
+        path,
+        tuple(sorted(query_params.items())),
+        body_sha256 if settings.replay_match_body else None,
+    )
+
+
+def _entry_from_line(line: dict[str, Any]) -> tuple[ReplayKey, ReplayEntry]:
+    key = _replay_key(line["method"], line["path"], dict(line["query"]), line["body_sha256"])
+    entry = ReplayEntry(
+        status_code=line["status_code"],
+        headers=tuple((name, value) for name, value in line["headers"]),
+        body=base64.b64decode(line["body"]),
+    )
+    return key, entry
+
+
+def load_replay_store() -> int:
+    """(Re)load the replay file into the in-memory index.
+
+    Later recordings of the same request replace earlier ones. A missing file is
+    treated as empty.
+
+    Returns:
+        Number of distinct requests that can be replayed
+    """
+    global _loaded
+
+    entries: dict[ReplayKey, ReplayEntry] = {}
+    if os.path.exists(settings.replay_file):
+        with open(settings.replay_file, encoding="utf-8") as replay_file:
+            for line_number, line in enumerate(replay_file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    key, entry = _entry_from_line(json.loads(line))
+                except (ValueError, KeyError, TypeError) as e:
+                    logger.warning(f"Skipping invalid replay entry on line {line_number}: {e}")
+                    continue
+                entries[key] = entry
+
+    with _lock:
+        _entries.clear()
+        _entries.update(entries)
+        _loaded = True
+    logger.info(f"Loaded {len(entries)} recorded responses from {settings.replay_file}")
+    return len(entries)
+
+
+def find_replay_entry(
+    method: str, path: str, query_params: Mapping[str, str], body: BodyCapture
+) -> Optional[ReplayEntry]:
+    """Find the recorded response for a request.
+
+    Requests match on method, path and query parameters, plus the body hash if
+    replay_match_body is enabled; the body is only read in that case.
+
+    Args:
+        method: HTTP method of the request
+        path: Normalized request path (e.g., "/v1/users/123")
+        query_params: Query parameters of the request
+        body: Capture of the raw request body
+
+    Returns:
+        The recorded response, None if the request was not recorded
+    """
+    if not _loaded:
+        load_replay_store()
+    body_sha256 = body.sha256() if settings.replay_match_body else None
+    return _entries.get(_replay_key(method, path, query_params, body_sha256))
+
+
+def save_replay_entry(path: str, transaction: Transaction) -> bool:
+    """Append a recorded transaction to the replay file and the in-memory index.
+
+    Args:
+        path: Normalized request path the transaction was proxied for
+        transaction: Transaction as stored in the history
+
+    Returns:
+        True if it was recorded, False if its bodies were truncated and cannot be replayed
+    """
+    request_body = transaction.request_body
+    response_body = transaction.response_body
+    if request_body is None or response_body is None:
+        return False
+    if request_body.truncated or response_body.truncated:
+        logger.warning(f"Not recording truncated transaction {transaction.id} for replay")
+        return False
+
+    body = response_body.read()
+    query_params = dict(transaction.query_params)
+    line = {
+        "method": transaction.method,
+        "path": path,
+        "query": sorted(query_params.items()),
+        "body_sha256": _body_hash(request_body.read()),
+        "status_code": transaction.status_code,
+        # Repeated headers (Set-Cookie) are recorded one pair each
+        "headers": list(transaction.response_headers),
+        "body": base64.b64encode(body).decode("ascii"),
+    }
+    key = _replay_key(transaction.method, path, query_params, line["body_sha256"])
+    entry = ReplayEntry(transaction.status_code, transaction.response_headers, body)
+
+    with _lock:
+        os.makedirs(os.path.dirname(os.path.abspath(settings.replay_file)), exist_ok=True)
+        with open(settings.replay_file, "a", encoding="utf-8") as replay_file:
+            replay_file.write(json.dumps(line) + "\n")
+        _entries[key] = entry
+    return True
@@ -0,0 +1,57 @@
+"""Serialization of the route table for storage outside of memory."""
+
+import base64
+import json
+from collections.abc import Iterable
+from typing import Any
+
+from .proxy_route import ProxyRoute
+from .stub_response import StubResponse
+
+
+def encode_routes(routes: Iterable[ProxyRoute]) -> bytes:
+    """Serialize routes, including their stubs, as JSON."""
+    return json.dumps(
+        [
+            {
+                "prefix": route.prefix,
+                "target_url": route.target_url,
+                "capture_max_inline_bytes": route.capture_max_inline_bytes,
+                "capture_overflow": route.capture_overflow,
+                "coalesce": route.coalesce,
+                "stubs": [
+                    {
+                        "status_code": stub.status_code,
+                        "headers": stub.headers,
+                        "body": base64.b64encode(stub.body).decode("ascii"),
+                        "method": stub.method,
+                        "query": stub.query,
+                        "json_body": stub.json_body,
+                        "implied_content_type": stub.implied_content_type,
+                    }
+                    for stub in route.stubs
+                ],
+            }
+            for route in routes
+        ]
+    ).encode()
+
+
+def decode_routes(data: bytes) -> list[ProxyRoute]:
+    """Deserialize routes written by encode_routes."""
+
+    def stub(fields: dict[str, Any]) -> StubResponse:
+        return StubResponse(
+            status_code=fields["status_code"],
+            headers=tuple((name, value) for name, value in fields["headers"]),
+            body=base64.b64decode(fields["body"]),
+            method=fields["method"],
+            query=tuple((name, value) for name, value in fields["query"]),
+            json_body=fields.get("json_body", False),
+            implied_content_type=fields.get("implied_content_type", False),
+        )
+
+    return [
+        ProxyRoute(**{**fields, "stubs": tuple(stub(s) for s in fields["stubs"])})
+        for fields in json.loads(data)
+    ]
@@ -0,0 +1,33 @@
+"""Route table update function."""
+
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+
+from .session import Session
+from .transaction_log import log_route_table
+from .worker_sync import get_shared_route_table, sync_route_table
+
+
+@contextmanager
+def route_table_update(session: Session) -> Iterator[None]:
+    """Hold a session's route table while it is changed, then persist the change.
+
+    Writers rebind session.proxy_configurations inside the block. A changed default
+    session table is written to the transaction log and, with several workers,
+    published to the other workers; the block then starts from the newest published
+    table and runs under the shared database's write lock, so concurrent changes
+    from different workers are applied one after the other.
+
+    Args:
+        session: Session whose route table is changed
+    """
+    shared = get_shared_route_table() if session.is_default else None
+    with session.route_table_lock, shared.writing() if shared is not None else nullcontext():
+        if shared is not None:
+            sync_route_table()
+        table = session.proxy_configurations
+        yield
+        if session.is_default and session.proxy_configurations is not table:
+            log_route_table(session.proxy_configurations)
+            if shared is not None:
+                shared.publish(session.proxy_configurations)
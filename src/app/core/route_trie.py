@@ -0,0 +1,162 @@
+"""Immutable segment trie for longest-prefix proxy route matching."""
+
+from collections.abc import Iterable, Iterator
+from typing import Optional
+
+from .proxy_route import ProxyRoute
+
+
+def split_path(path: str) -> list[str]:
+    """Split a path into its non-empty segments.
+
+    Args:
+        path: URL path or path prefix (e.g., "/v1/users/123")
+
+    Returns:
+        Path segments (e.g., ["v1", "users", "123"])
+    """
+    return [segment for segment in path.split("/") if segment]
+
+
+class _TrieNode:
+    __slots__ = ("children", "route")
+
+    def __init__(
+        self, children: Optional[dict[str, "_TrieNode"]] = None, route: Optional[ProxyRoute] = None
+    ) -> None:
+        self.children: dict[str, _TrieNode] = children if children is not None else {}
+        self.route = route
+
+
+class RouteTrie:
+    """Immutable snapshot of the routes, indexed by path segment.
+
+    Lookups walk the request path once, so their cost depends on the path length
+    rather than the number of mappings. Prefixes match whole segments: "/v1/users"
+    matches "/v1/users" and "/v1/users/123" but not "/v1/users-admin".
+
+    A snapshot is never modified once built. Updates return a new snapshot that
+    copies only the nodes along the changed paths and shares everything else, so a
+    snapshot can be published with a single reference swap while readers keep using
+    the one they already hold.
+    """
+
+    __slots__ = ("_root", "_routes")
+
+    def __init__(self) -> None:
+        self._root = _TrieNode()
+        self._routes: dict[str, ProxyRoute] = {}
+
+    def __len__(self) -> int:
+        return len(self._routes)
+
+    def __iter__(self) -> Iterator[ProxyRoute]:
+        return iter(self._routes.values())
+
+    def __contains__(self, prefix: object) -> bool:
+        return prefix in self._routes
+
+    @classmethod
+    def build(cls, routes: Iterable[ProxyRoute]) -> "RouteTrie":
+        """Build a snapshot holding exactly the given routes.
+
+        Args:
+            routes: Routes to index (later routes replace earlier ones with the same prefix)
+
+        Returns:
+            The new snapshot
+        """
+        return cls().with_routes(routes)
+
+    def with_routes(self, routes: Iterable[ProxyRoute]) -> "RouteTrie":
+        """Get a snapshot with routes added, replacing any with the same prefix.
+
+        Args:
+            routes: Routes to add or replace
+
+        Returns:
+            The new snapshot (this one is left untouched)
+        """
+        updated = self._derive()
+        fresh: set[int] = {id(updated._root)}
+        for route in routes:
+            node = updated._root
+            for segment in split_path(route.prefix):
+                node = updated._copied_child(node, segment, fresh)
+            if node.route is not None:
+                updated._routes.pop(node.route.prefix, None)
+            node.route = route
+            updated._routes[route.prefix] = route
+        return updated
+
+    def without_prefixes(self, prefixes: Iterable[str]) -> "RouteTrie":
+        """Get a snapshot with the routes for the given prefixes removed.
+
+        Args:
+            prefixes: Path prefixes to remove (unknown prefixes are ignored)
+
+        Returns:
+            The new snapshot (this one is left untouched)
+        """
+        updated = self._derive()
+        fresh: set[int] = {id(updated._root)}
+        for prefix in prefixes:
+            route = updated._routes.pop(prefix, None)
+            if route is None:
+                continue
+            path = [updated._root]
+            segments = split_path(prefix)
+            for segment in segments:
+                path.append(updated._copied_child(path[-1], segment, fresh))
+            path[-1].route = None
+            # Prune nodes left without a route or children
+            for depth in range(len(segments), 0, -1):
+                node = path[depth]
+                if node.route is not None or node.children:
+                    break
+                del path[depth - 1].children[segments[depth - 1]]
+        return updated
+
+    def get(self, prefix: str) -> Optional[ProxyRoute]:
+        """Get the route configured for exactly this prefix."""
+        return self._routes.get(prefix)
+
+    def longest_match(self, path: str) -> Optional[ProxyRoute]:
+        """Find the route with the longest prefix matching the path.
+
+        Args:
+            path: The request path to match (e.g., "/v1/users/123")
+
+        Returns:
+            The most specific matching route, None if no prefix matches
+        """
+        node = self._root
+        match = node.route
+        for segment in split_path(path):
+            child = node.children.get(segment)
+            if child is None:
+                break
+            node = child
+            if node.route is not None:
+                match = node.route
+        return match
+
+    def _derive(self) -> "RouteTrie":
+        derived = RouteTrie()
+        derived._root = _TrieNode(dict(self._root.children), self._root.route)
+        derived._routes = dict(self._routes)
+        return derived
+
+    @staticmethod
+    def _copied_child(node: _TrieNode, segment: str, fresh: set[int]) -> _TrieNode:
+        """Get a child of a node created for this update, copying a shared one first."""
+        child = node.children.get(segment)
+        if child is None:
+            child = _TrieNode()
+        elif id(child) in fresh:
+            return child
+        else:
+            child = _TrieNode(dict(child.children), child.route)
+        node.children[segment] = child
+        fresh.add(id(child))
+        return child
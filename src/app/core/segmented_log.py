@@ -0,0 +1,154 @@
+"""Append-only log of records split into segment files."""
+
+import os
+import struct
+import threading
+import zlib
+from collections.abc import Iterator
+from typing import BinaryIO, Optional
+
+from pyla_logger import logger
+
+# Every record is framed by its payload length and the CRC32 of the payload
+FRAME_HEADER = struct.Struct("<II")
+SEGMENT_SUFFIX = ".log"
+
+
+class SegmentedLog:
+    """Records appended to numbered segment files in a directory.
+
+    Records are written straight through to the operating system, so they survive
+    the process crashing. With an fsync_interval of 0, append() fsyncs every record;
+    otherwise the owner calls sync() every fsync_interval seconds, which fsyncs
+    without holding up appends, so a machine crash loses at most that interval.
+    Once a segment reaches segment_bytes, append() reports it full and the owner
+    starts the next one with rotate(); old segments are only deleted when the owner
+    asks for it.
+
+    A record torn by a crash is detected by its length or checksum when the log is
+    read back, and the segment is cut off before it.
+    """
+
+    def __init__(self, directory: str, segment_bytes: int, fsync_interval: float) -> None:
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.fsync_interval = fsync_interval
+        self._file: Optional[BinaryIO] = None
+        self._segment_size = 0
+        self._unsynced = False
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def segments(self) -> list[str]:
+        """Get the paths of the segment files, oldest first."""
+        names = sorted(
+            name
+            for name in os.listdir(self.directory)
+            if name.endswith(SEGMENT_SUFFIX) and name[: -len(SEGMENT_SUFFIX)].isdigit()
+        )
+        return [os.path.join(self.directory, name) for name in names]
+
+    def _read_segment(self, path: str, last: bool) -> Iterator[memoryview]:
+        with open(path, "rb") as segment:
+            data = memoryview(segment.read())
+        offset = 0
+        while offset < len(data):
+            end = offset + FRAME_HEADER.size
+            if end <= len(data):
+                length, checksum = FRAME_HEADER.unpack_from(data, offset)
+                payload = data[end : end + length]
+                if len(payload) == length and zlib.crc32(payload) == checksum:
+                    yield payload
+                    offset = end + length
+                    continue
+            logger.warning(f"Discarding torn log records at {path}:{offset}")
+            if last:
+                with open(path, "r+b") as segment:
+                    segment.truncate(offset)
+            return
+
+    def read(self) -> Iterator[tuple[str, memoryview]]:
+        """Read back every intact record.
+
+        Returns:
+            Iterator of (segment path, record payload), oldest first
+        """
+        segments = self.segments()
+        for index, path in enumerate(segments):
+            for payload in self._read_segment(path, last=index == len(segments) - 1):
+                yield path, payload
+
+    def rotate(self) -> str:
+        """Start a new segment file.
+
+        Returns:
+            Path of the new segment
+        """
+        with self._lock:
+            return self._rotate().name
+
+    def _rotate(self) -> BinaryIO:
+        segments = self.segments()
+        number = int(os.path.basename(segments[-1])[: -len(SEGMENT_SUFFIX)]) + 1 if segments else 1
+        path = os.path.join(self.directory, f"{number:08d}{SEGMENT_SUFFIX}")
+        if self._file is not None:
+            self._sync()
+            self._file.close()
+        self._file = open(path, "ab", buffering=0)
+        self._segment_size = 0
+        return self._file
+
+    def append(self, payload: bytes) -> bool:
+        """Append a record, syncing it at once if the fsync interval is 0.
+
+        Args:
+            payload: The record
+
+        Returns:
+            True if the segment became full and the next record goes to a new segment
+        """
+        with self._lock:
+            segment = self._file if self._file is not None else self._rotate()
+            segment.write(FRAME_HEADER.pack(len(payload), zlib.crc32(payload)) + payload)
+            self._segment_size += FRAME_HEADER.size + len(payload)
+            self._unsynced = True
+            if self.fsync_interval == 0:
+                self._sync()
+            return self._segment_size >= self.segment_bytes
+
+    def _sync(self) -> None:
+        if self._file is not None and self._unsynced:
+            os.fsync(self._file.fileno())
+        self._unsynced = False
+
+    def sync(self) -> None:
+        """Flush every record appended so far to disk (a no-op if nothing is new).
+
+        The fsync runs on a duplicate of the segment's descriptor outside the lock, so
+        appends carry on meanwhile and a rotation cannot close it underneath.
+        """
+        with self._lock:
+            if self._file is None or not self._unsynced:
+                return
+            descriptor = os.dup(self._file.fileno())
+            self._unsynced = False
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+
+    def delete(self, paths: list[str]) -> None:
+        """Delete segments that are no longer needed."""
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def close(self) -> None:
+        """Sync and close the current segment."""
+        with self._lock:
+            if self._file is not None:
+                self._sync()
+                self._file.close()
+                self._file = None
@@ -0,0 +1,34 @@
+"""Route table and transaction history of one session."""
+
+import threading
+from dataclasses import dataclass, field
+
+from .route_trie import RouteTrie
+from .transaction_backend import TransactionBackend
+
+DEFAULT_SESSION = "default"
+
+
+@dataclass(eq=False)
+class Session:
+    """State that one test run works on, isolated from every other session.
+
+    Requests that name no session work on the default session, whose history is the
+    configured backend and whose route table is written to the transaction log and
+    shared between workers. Other sessions keep both in memory only.
+    """
+
+    name: str
+    transaction_history: TransactionBackend
+    # Published route table snapshot (path prefix -> route, indexed by segment). Never
+    # modified in place: writers build a new snapshot and rebind it under
+    # route_table_lock, so readers must look it up on the session at call time.
+    proxy_configurations: RouteTrie = field(default_factory=RouteTrie)
+    route_table_lock: threading.RLock = field(default_factory=threading.RLock)
+    # Set once the session is deleted; transactions still in flight are then dropped
+    closed: bool = False
+
+    @property
+    def is_default(self) -> bool:
+        """Whether this is the session of requests that name none."""
+        return self.name == DEFAULT_SESSION
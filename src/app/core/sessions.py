@@ -0,0 +1,98 @@
+"""Named sessions and the session the current request works on."""
+
+import re
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from . import storage_data
+from .session import DEFAULT_SESSION, Session
+from .settings import settings
+from .transaction_store import TransactionStore
+
+# Header naming the session of a request (or use a /sessions/{name} path prefix)
+SESSION_HEADER = "x-trixie-session"
+SESSION_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_.-]{1,64}$")
+
+_sessions: dict[str, Session] = {}
+_sessions_lock = threading.Lock()
+_current: ContextVar[Optional[Session]] = ContextVar("trixie_session", default=None)
+
+
+def current_session() -> Session:
+    """Get the session of the request being handled (the default session outside one)."""
+    return _current.get() or storage_data.default_session
+
+
+@contextmanager
+def using_session(session: Session) -> Iterator[None]:
+    """Work on a session for the rest of the block (and the tasks started in it)."""
+    token = _current.set(session)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def get_session(name: str) -> Optional[Session]:
+    """Get a session by name ("default" is the default session)."""
+    if name == DEFAULT_SESSION:
+        return storage_data.default_session
+    return _sessions.get(name)
+
+
+def list_sessions() -> list[Session]:
+    """Get every named session, oldest first."""
+    with _sessions_lock:
+        return list(_sessions.values())
+
+
+def create_session(
+    name: str, max_count: Optional[int] = None, max_bytes: Optional[int] = None
+) -> Session:
+    """Create a session with an empty route table and an in-memory history.
+
+    Args:
+        name: Session name (letters, digits, "_", "." and "-")
+        max_count: Transactions the session keeps before the oldest are evicted
+        max_bytes: Captured body bytes the session keeps before evicting
+
+    Returns:
+        The new session
+
+    Raises:
+        ValueError: If the name is invalid or taken, or TRIXIE_MAX_SESSIONS sessions
+            already exist
+    """
+    if not SESSION_NAME_PATTERN.match(name):
+        raise ValueError(f"Invalid session name: {name}")
+    session = Session(name, TransactionStore(max_count=max_count, max_bytes=max_bytes))
+    with _sessions_lock:
+        if name == DEFAULT_SESSION or name in _sessions:
+            raise ValueError(f"Session already exists: {name}")
+        if len(_sessions) >= settings.max_sessions:
+            raise ValueError(f"Session limit of {settings.max_sessions} reached")
+        _sessions[name] = session
+    return session
+
+
+def delete_session(name: str) -> Optional[Session]:
+    """Remove a session, so requests naming it are refused.
+
+    The session is marked closed, so transactions it still has in flight, such as
+    responses that are streaming, are dropped instead of recorded.
+
+    Args:
+        name: Session name
+
+    Returns:
+        The removed session, whose history still holds its transactions, or None if
+        there was no such session
+    """
+    with _sessions_lock:
+        session = _sessions.pop(name, None)
+    if session is not None:
+        session.closed = True
+    return session
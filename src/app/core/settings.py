@@ -0,0 +1,146 @@
+"""Runtime settings for the proxy system."""
+
+import os
+from tempfile import gettempdir
+from typing import Literal, Optional
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+from .proxy_route import CaptureOverflow
+
+
+class Settings(BaseSettings):
+    """Proxy settings, overridable through TRIXIE_* environment variables."""
+
+    model_config = SettingsConfigDict(env_prefix="TRIXIE_")
+
+    upstream_max_connections: int = Field(
+        default=100, ge=1, description="Maximum number of concurrent upstream connections"
+    )
+    upstream_max_keepalive_connections: int = Field(
+        default=20, ge=0, description="Maximum number of idle upstream connections kept alive"
+    )
+    upstream_keepalive_expiry: float = Field(
+        default=5.0, ge=0, description="Seconds an idle upstream connection is kept alive"
+    )
+    upstream_max_connections_per_host: Optional[int] = Field(
+        default=None, ge=1, description="Maximum number of concurrent requests per upstream host"
+    )
+    upstream_timeout: float = Field(
+        default=5.0, gt=0, description="Upstream request timeout in seconds"
+    )
+    upstream_stream_read_timeout: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description="Longest wait in seconds for the next event of an event stream",
+    )
+    coalesce_max_body_bytes: int = Field(
+        default=1024 * 1024,
+        ge=0,
+        description="Largest response body buffered to share between coalesced requests",
+    )
+
+    capture_spool_threshold: int = Field(
+        default=1024 * 1024,
+        ge=0,
+        description="Bytes of a captured body kept in memory before spooling",
+    )
+    capture_spool_dir: Optional[str] = Field(
+        default=None, description="Directory for spooled bodies (system temp directory by default)"
+    )
+    capture_max_inline_bytes: int = Field(
+        default=1024 * 1024, ge=0, description="Largest captured body stored inline in memory"
+    )
+    capture_overflow: CaptureOverflow = Field(
+        default="blob", description="Larger bodies are truncated or written to a blob file"
+    )
+    capture_stream_max_frames: int = Field(
+        default=1000, ge=0, description="WebSocket frames or SSE events captured per stream"
+    )
+    capture_stream_max_bytes: int = Field(
+        default=1024 * 1024, ge=0, description="Bytes of WebSocket frames or SSE events per stream"
+    )
+    capture_blob_dir: str = Field(
+        default=os.path.join(gettempdir(), "trixie-blobs"),
+        description="Directory holding overflowed bodies",
+    )
+
+    writer_queue_size: int = Field(
+        default=10000, ge=1, description="Transactions buffered for the background writer"
+    )
+    writer_full_policy: Literal["block", "drop"] = Field(
+        default="block", description="Wait for room or drop records when the writer queue is full"
+    )
+
+    history_max_transactions: Optional[int] = Field(
+        default=10000, ge=1, description="Transactions kept before the oldest are evicted"
+    )
+    history_max_bytes: Optional[int] = Field(
+        default=512 * 1024 * 1024,
+        ge=0,
+        description="Captured body bytes kept before the oldest transactions are evicted",
+    )
+    history_backend: Literal["memory", "sqlite"] = Field(
+        default="memory", description="Keep the transaction history in memory or in SQLite"
+    )
+    history_sqlite_path: str = Field(
+        default=os.path.join(gettempdir(), "trixie-history.db"),
+        description="Database file of the sqlite history backend",
+    )
+    history_sqlite_batch_size: int = Field(
+        default=100, ge=1, description="Transactions inserted into the database per batch"
+    )
+    max_sessions: int = Field(
+        default=100, ge=0, description="Named sessions that can exist at the same time"
+    )
+    workers: int = Field(
+        default=1,
+        ge=1,
+        description="Worker processes, sharing routes and history through the SQLite database",
+    )
+    worker_sync_interval: float = Field(
+        default=0.05, gt=0, description="Seconds between checks for other workers' transactions"
+    )
+    transaction_log_dir: Optional[str] = Field(
+        default=None,
+        description="Directory of the transaction log replayed at startup (disabled if unset)",
+    )
+    transaction_log_segment_bytes: int = Field(
+        default=64 * 1024 * 1024, ge=1, description="Size at which a new log segment is started"
+    )
+    transaction_log_fsync_interval: float = Field(
+        default=1.0, ge=0, description="Longest time in seconds between fsyncs of the log"
+    )
+    json_cache_max_body_bytes: int = Field(
+        default=16 * 1024,
+        ge=0,
+        description="Largest body total of a transaction whose serialized JSON is cached",
+    )
+    json_cache_max_bytes: int = Field(
+        default=32 * 1024 * 1024,
+        ge=0,
+        description="Total size of the cached serialized transactions",
+    )
+    live_stream_queue_size: int = Field(
+        default=1000,
+        ge=1,
+        description="Transactions buffered per live-stream subscriber before dropping",
+    )
+
+    replay_mode: Literal["off", "record", "replay"] = Field(
+        default="off", description="Record responses to the replay file or answer from it"
+    )
+    replay_file: str = Field(
+        default=os.path.join(gettempdir(), "trixie-replay.jsonl"),
+        description="File holding recorded responses for replay",
+    )
+    replay_miss_policy: Literal["fail", "passthrough", "record"] = Field(
+        default="fail", description="What replay mode does with requests that were not recorded"
+    )
+    replay_match_body: bool = Field(
+        default=False, description="Include a hash of the request body when matching recordings"
+    )
+
+
+settings = Settings()
@@ -0,0 +1,49 @@
+"""Single-flight execution of identical concurrent calls."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """Share one in-flight call between all callers asking for the same key.
+
+    The call runs in its own task, so a caller going away (e.g., a client disconnect
+    cancelling its request) does not cancel the call for the others. Results are not
+    cached: once the call finishes, the next caller starts a new one.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Task[T]] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """Run the call, or join the identical one already in flight.
+
+        Args:
+            key: Identifies calls that are interchangeable
+            call: Starts the call if none is in flight for the key
+
+        Returns:
+            Tuple of (result, whether it was shared from a call started by another caller)
+
+        Raises:
+            Exception: Whatever the shared call raised, for every caller
+        """
+        # Tasks belong to one event loop, so calls are only shared within a loop
+        flight_key = (asyncio.get_running_loop(), key)
+        task = self._calls.get(flight_key)
+        shared = task is not None
+        if task is None:
+
+            async def run() -> T:
+                return await call()
+
+            task = asyncio.create_task(run())
+            self._calls[flight_key] = task
+            task.add_done_callback(lambda _: self._calls.pop(flight_key, None))
+        return await asyncio.shield(task), shared
@@ -0,0 +1,77 @@
+"""Route table shared by worker processes through a SQLite database."""
+
+import os
+import sqlite3
+import threading
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from typing import Optional
+
+from .proxy_route import ProxyRoute
+from .route_codec import decode_routes, encode_routes
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS routes (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+"""
+
+
+class SqliteRouteTable:
+    """The latest route table of every worker, stored as one versioned row.
+
+    Each worker keeps serving its own in-memory route table and calls changes() to
+    find out whether another worker published a newer one. That check reads only the
+    version of the published table, so other writes to the database, such as the
+    transaction history, do not make it reload the routes. Changes are made inside
+    writing(), which holds the database write lock, so two workers changing the
+    table at the same time cannot lose either change.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.version = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(SCHEMA)
+        self._lock = threading.RLock()
+
+    def changes(self) -> Optional[list[ProxyRoute]]:
+        """Get the published routes if they changed since they were last seen.
+
+        Returns:
+            The routes of the newest published table, or None if it is unchanged
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT version FROM routes").fetchone()
+            if row is None or row[0] == self.version:
+                return None
+            self.version, data = self._connection.execute(
+                "SELECT version, data FROM routes"
+            ).fetchone()
+            return decode_routes(data)
+
+    @contextmanager
+    def writing(self) -> Iterator[None]:
+        """Hold the database write lock while the route table is read and changed."""
+        with self._lock, self._connection:
+            self._connection.execute("BEGIN IMMEDIATE")
+            yield
+
+    def publish(self, routes: Iterable[ProxyRoute]) -> None:
+        """Publish a new route table (call inside writing())."""
+        with self._lock:
+            self.version += 1
+            self._connection.execute(
+                "INSERT OR REPLACE INTO routes VALUES (1, ?, ?)",
+                (self.version, encode_routes(routes)),
+            )
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,397 @@
+"""Transaction history kept in a SQLite database."""
+
+import os
+import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any, Optional
+
+from .transaction import Transaction
+from .transaction_backend import TransactionBackend, TransactionStoreStats
+from .transaction_codec import decode_transaction, encode_transaction
+from .transaction_filter import TransactionFilter, TransactionKeys
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL,
+    timestamp REAL,
+    method TEXT,
+    status_code INTEGER,
+    proxy_mapping_used TEXT,
+    path TEXT,
+    body_bytes INTEGER NOT NULL,
+    has_blobs INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transactions_id ON transactions (id);
+CREATE INDEX IF NOT EXISTS transactions_method ON transactions (method, seq);
+CREATE INDEX IF NOT EXISTS transactions_status ON transactions (status_code, seq);
+CREATE INDEX IF NOT EXISTS transactions_mapping ON transactions (proxy_mapping_used, seq);
+CREATE INDEX IF NOT EXISTS transactions_path ON transactions (path, seq);
+CREATE INDEX IF NOT EXISTS transactions_timestamp ON transactions (timestamp);
+CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+"""
+
+# seq, id, timestamp, method, status_code, proxy_mapping_used, path, body_bytes,
+# has_blobs, data
+Row = tuple[Any, ...]
+
+
+def _filter_clauses(transaction_filter: TransactionFilter) -> tuple[list[str], list[Any]]:
+    """Translate a filter into SQL conditions on the indexed columns."""
+    clauses: list[str] = []
+    params: list[Any] = []
+    if transaction_filter.method is not None:
+        clauses.append("method = ?")
+        params.append(transaction_filter.method)
+    if transaction_filter.status_min is not None:
+        clauses.append("status_code >= ?")
+        params.append(transaction_filter.status_min)
+    if transaction_filter.status_max is not None:
+        clauses.append("status_code <= ?")
+        params.append(transaction_filter.status_max)
+    if transaction_filter.proxy_mapping_used is not None:
+        clauses.append("proxy_mapping_used = ?")
+        params.append(transaction_filter.proxy_mapping_used)
+    if transaction_filter.path_prefix is not None:
+        # Whole segments only: the prefix itself or anything below "<prefix>/" ("0"
+        # sorts right after "/")
+        prefix = transaction_filter.path_prefix
+        clauses.append("(path = ? OR (path >= ? AND path < ?))")
+        params.extend([prefix, prefix + "/", prefix + "0"])
+    if transaction_filter.since is not None:
+        clauses.append("timestamp >= ?")
+        params.append(transaction_filter.since.timestamp())
+    if transaction_filter.until is not None:
+        clauses.append("timestamp <= ?")
+        params.append(transaction_filter.until.timestamp())
+    return clauses, params
+
+
+class SqliteTransactionStore(TransactionBackend):
+    """Transaction history in a SQLite database, for histories too large for memory.
+
+    The database runs in WAL mode, so readers do not block the writer. Appended
+    transactions are buffered and inserted batch_size rows at a time, in a single
+    database transaction; queries insert the buffered rows first, so they always
+    see every recorded transaction. Limits are enforced per batch, so the history
+    can exceed them by up to one batch. Filtered queries run against indexed
+    method, status, mapping, path and timestamp columns.
+
+    Transactions whose stream is still open keep changing after they are recorded,
+    so they are also held in memory and served from there until the stream closes,
+    when their final state is written to the database.
+
+    Sequence numbers and eviction counters are stored in the database, so they carry
+    on where they left off when the store is reopened.
+
+    A shared store is one of several opened on the same file by different worker
+    processes. Each append is written straight away, taking its sequence number
+    inside the write transaction, and the counters are reloaded whenever another
+    process has written to the database. Frames of an open stream are only held in
+    the memory of the worker proxying it: the other workers see the stream as it was
+    when it opened, without frames, until its final state is written after it closes.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_count: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        batch_size: int = 100,
+        shared: bool = False,
+    ) -> None:
+        self.path = path
+        self.max_count = max_count
+        self.max_bytes = max_bytes
+        self.batch_size = batch_size
+        self.shared = shared
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(SCHEMA)
+        self._lock = threading.RLock()
+        self._pending: list[Row] = []
+        self._live: dict[int, Transaction] = {}
+        self._data_version: Optional[int] = None
+        self._count, self._bytes = self._connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(body_bytes), 0) FROM transactions"
+        ).fetchone()
+        self._load_counters()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return self._count
+
+    def __getitem__(self, index: int) -> Transaction:
+        order, offset = ("ASC", index) if index >= 0 else ("DESC", -index - 1)
+        with self._lock:
+            self._flush()
+            row = self._connection.execute(
+                f"SELECT seq, data FROM transactions ORDER BY seq {order} LIMIT 1 OFFSET ?",
+                (offset,),
+            ).fetchone()
+            if row is None:
+                raise IndexError("transaction index out of range")
+            return self._load(*row)
+
+    @property
+    def latest_seq(self) -> int:
+        """Sequence number of the newest transaction ever stored (0 before the first)."""
+        with self._lock:
+            self._refresh()
+            return self._next_seq - 1
+
+    def _load(self, seq: int, data: bytes) -> Transaction:
+        live = self._live.get(seq)
+        if live is not None:
+            return live
+        transaction = decode_transaction(data)
+        transaction.seq = seq
+        return transaction
+
+    def _load_counters(self) -> None:
+        counters = dict(self._connection.execute("SELECT name, value FROM counters").fetchall())
+        self._next_seq = counters.get("latest_seq", 0) + 1
+        self._evicted = counters.get("evicted", 0)
+        self._evicted_bytes = counters.get("evicted_bytes", 0)
+        # Databases written before these counters were stored keep the counted values
+        self._count = counters.get("count", self._count)
+        self._bytes = counters.get("bytes", self._bytes)
+
+    def _save_counters(self) -> None:
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO counters VALUES (?, ?)",
+            [
+                ("latest_seq", self._next_seq - 1),
+                ("evicted", self._evicted),
+                ("evicted_bytes", self._evicted_bytes),
+                ("count", self._count),
+                ("bytes", self._bytes),
+            ],
+        )
+
+    def _refresh(self) -> None:
+        """Reload the counters if another process wrote to the database (lock held)."""
+        if not self.shared:
+            return
+        data_version = self._connection.execute("PRAGMA data_version").fetchone()[0]
+        if data_version != self._data_version:
+            self._data_version = data_version
+            self._load_counters()
+
+    @contextmanager
+    def _writing(self) -> Iterator[None]:
+        """Run a database transaction, saving the counters at the end (lock held)."""
+        with self._connection:
+            self._connection.execute("BEGIN IMMEDIATE")
+            self._refresh()
+            yield
+            self._save_counters()
+
+    def _insert_pending(self) -> None:
+        """Write the buffered rows and the final state of closed streams (lock held)."""
+        self._connection.executemany(
+            "INSERT INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", self._pending
+        )
+        self._pending = []
+        for seq in [
+            seq for seq, live in self._live.items() if live.stream and not live.stream.open
+        ]:
+            self._connection.execute(
+                "UPDATE transactions SET data = ? WHERE seq = ?",
+                (encode_transaction(self._live.pop(seq)), seq),
+            )
+
+    def _flush(self) -> None:
+        """Write out what is buffered, so reads see every transaction (lock held)."""
+        if self._pending or any(
+            live.stream and not live.stream.open for live in self._live.values()
+        ):
+            with self._writing():
+                self._insert_pending()
+
+    def _over_limits(self, count: int, size: int) -> bool:
+        if count <= 1:
+            return False
+        if self.max_count is not None and count > self.max_count:
+            return True
+        return self.max_bytes is not None and size > self.max_bytes
+
+    def _evict(self) -> list[Transaction]:
+        """Delete the oldest rows until the limits hold again (in a write transaction)."""
+        if not self._over_limits(self._count, self._bytes):
+            return []
+        count, size = self._count, self._bytes
+        cutoff = None
+        for seq, body_bytes in self._connection.execute(
+            "SELECT seq, body_bytes FROM transactions ORDER BY seq"
+        ):
+            if not self._over_limits(count, size):
+                break
+            cutoff = seq
+            count -= 1
+            size -= body_bytes
+        if cutoff is None:
+            return []
+        released: list[Transaction] = [
+            self._load(seq, data)
+            for seq, data in self._connection.execute(
+                "SELECT seq, data FROM transactions WHERE seq <= ? AND has_blobs", (cutoff,)
+            )
+        ]
+        self._connection.execute("DELETE FROM transactions WHERE seq <= ?", (cutoff,))
+        self._evicted += self._count - count
+        self._evicted_bytes += self._bytes - size
+        self._count, self._bytes = count, size
+        for seq in [seq for seq in self._live if seq <= cutoff]:
+            del self._live[seq]
+        return released
+
+    def append(self, transaction: Transaction) -> list[Transaction]:
+        """Add a transaction, writing the buffered batch once it is full (at once if shared).
+
+        Args:
+            transaction: Complete transaction data including request/response info
+
+        Returns:
+            The evicted transactions that own overflow blob files, oldest first
+        """
+        keys = TransactionKeys.of(transaction)
+        bodies = [body for body in (transaction.request_body, transaction.response_body) if body]
+        size = sum(body.size for body in bodies)
+        data = encode_transaction(transaction)
+
+        def buffer() -> None:
+            seq = self._next_seq
+            self._next_seq += 1
+            transaction.seq = seq
+            self._pending.append(
+                (
+                    seq,
+                    transaction.id,
+                    keys.timestamp.timestamp() if keys.timestamp else None,
+                    keys.method,
+                    keys.status_code,
+                    keys.proxy_mapping_used,
+                    keys.path,
+                    size,
+                    any(body.blob_path is not None for body in bodies),
+                    data,
+                )
+            )
+            if transaction.stream is not None and transaction.stream.open:
+                self._live[seq] = transaction
+            self._count += 1
+            self._bytes += size
+
+        with self._lock:
+            if not self.shared and len(self._pending) + 1 < self.batch_size:
+                buffer()
+                return []
+            # Other workers take sequence numbers too, so a shared store takes its own
+            # inside the write transaction
+            with self._writing():
+                buffer()
+                self._insert_pending()
+                return self._evict()
+
+    def get(self, transaction_id: str) -> Optional[Transaction]:
+        """Get a stored transaction by its ID."""
+        with self._lock:
+            self._flush()
+            row = self._connection.execute(
+                "SELECT seq, data FROM transactions WHERE id = ? ORDER BY seq DESC LIMIT 1",
+                (transaction_id,),
+            ).fetchone()
+            return self._load(*row) if row is not None else None
+
+    def select(
+        self,
+        after: Optional[int] = None,
+        before: Optional[int] = None,
+        limit: Optional[int] = None,
+        newest_first: bool = True,
+        transaction_filter: Optional[TransactionFilter] = None,
+    ) -> list[Transaction]:
+        """Get the stored transactions between two sequence numbers.
+
+        Args:
+            after: Only transactions with a greater sequence number
+            before: Only transactions with a smaller sequence number
+            limit: Largest number of transactions returned
+            newest_first: Start from the newest matching transaction instead of the
+                oldest one (the limit applies from that end)
+            transaction_filter: Only transactions meeting these criteria
+
+        Returns:
+            Matching transactions in the requested order
+        """
+        clauses, params = (
+            _filter_clauses(transaction_filter) if transaction_filter is not None else ([], [])
+        )
+        if after is not None:
+            clauses.append("seq > ?")
+            params.append(after)
+        if before is not None:
+            clauses.append("seq < ?")
+            params.append(before)
+        query = "SELECT seq, data FROM transactions"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += f" ORDER BY seq {'DESC' if newest_first else 'ASC'}"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            self._flush()
+            rows = self._connection.execute(query, params).fetchall()
+            return [self._load(seq, data) for seq, data in rows]
+
+    def clear(self) -> tuple[int, list[Transaction]]:
+        """Remove every transaction (sequence numbers and eviction counters are kept).
+
+        Returns:
+            Number of removed transactions, and the removed transactions that own
+            overflow blob files, oldest first
+        """
+        with self._lock, self._writing():
+            self._insert_pending()
+            released: list[Transaction] = [
+                self._load(seq, data)
+                for seq, data in self._connection.execute(
+                    "SELECT seq, data FROM transactions WHERE has_blobs ORDER BY seq"
+                )
+            ]
+            removed = self._connection.execute("DELETE FROM transactions").rowcount
+            self._live.clear()
+            self._count = 0
+            self._bytes = 0
+        return removed, released
+
+    def stats(self) -> TransactionStoreStats:
+        """Get a snapshot of the store counters."""
+        with self._lock:
+            self._refresh()
+            return TransactionStoreStats(
+                stored=self._count,
+                stored_bytes=self._bytes,
+                evicted=self._evicted,
+                evicted_bytes=self._evicted_bytes,
+            )
+
+    def flush(self) -> None:
+        """Write the buffered rows to the database."""
+        with self._lock:
+            self._flush()
+
+    def close(self) -> None:
+        """Write the buffered rows and close the database."""
+        with self._lock:
+            self._flush()
+            self._connection.close()
@@ -0,0 +1,59 @@
+"""Server-sent event splitting for streamed responses."""
+
+import re
+
+from .stream_capture import StreamCapture
+
+# Events are separated by a blank line, with any of the allowed line endings
+EVENT_SEPARATOR = re.compile(rb"\r\n\r\n|\n\n|\r\r")
+# Bytes kept while skipping an event, so a separator split across chunks is still found
+SEPARATOR_TAIL = 3
+
+
+class SseCapture:
+    """Splits a text/event-stream body into events as its chunks pass through.
+
+    Each complete event is appended to the stream capture as one server frame, so
+    events show up in the transaction while the response is still streaming.
+    """
+
+    def __init__(self, stream: StreamCapture) -> None:
+        self.stream = stream
+        self.size = 0
+        self._pending = b""
+        # Skipping the rest of an event that overflowed the limit, up to its separator
+        self._discarding = False
+
+    def append(self, chunk: bytes) -> None:
+        """Record a chunk of the event stream that was forwarded to the client.
+
+        Args:
+            chunk: Bytes exactly as they were streamed
+        """
+        self.size += len(chunk)
+        data = self._pending + chunk
+        if self._discarding:
+            match = EVENT_SEPARATOR.search(data)
+            if match is None:
+                self._pending = data[-SEPARATOR_TAIL:]
+                return
+            self._discarding = False
+            data = data[match.end() :]
+        *events, self._pending = EVENT_SEPARATOR.split(data)
+        for event in events:
+            if event:
+                self.stream.append("server", event.decode("utf-8", errors="replace"))
+        if len(self._pending) > self.stream.max_bytes:
+            # An event that can never fit the limit is dropped instead of buffered
+            self.stream.frame_count += 1
+            self.stream.dropped_frames += 1
+            self._pending = self._pending[-SEPARATOR_TAIL:]
+            self._discarding = True
+
+    def close(self, aborted: bool = False) -> None:
+        """Record any trailing event and mark the stream as finished."""
+        if self._pending.strip() and not self._discarding:
+            self.stream.append("server", self._pending.decode("utf-8", errors="replace"))
+        self._pending = b""
+        self._discarding = False
+        self.stream.close(aborted=aborted)
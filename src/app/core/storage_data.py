@@ -1,7 +1,11 @@
 """Global storage variables for proxy system."""
 
-# Global storage for proxy configurations (path prefix -> target URL)
-proxy_configurations: dict[str, str] = {}
+from .create_transaction_backend import create_transaction_backend
+from .session import DEFAULT_SESSION, Session
+from .transaction_backend import TransactionBackend
 
-# Global storage for transaction history (simple dict storage for internal use)
-transaction_history: list[dict] = []
+# Route table and transaction history of requests that name no session. The history
+# is bounded by record count and captured body bytes (oldest evicted) and kept by the
+# configured backend.
+default_session = Session(DEFAULT_SESSION, create_transaction_backend())
+transaction_history: TransactionBackend = default_session.transaction_history
@@ -0,0 +1,44 @@
+"""Store captured body function."""
+
+from typing import Optional
+
+from .blob_store import blob_path
+from .body_capture import BodyCapture
+from .captured_body import CapturedBody
+from .proxy_route import ProxyRoute
+from .settings import settings
+
+
+def store_captured_body(
+    route: ProxyRoute,
+    capture: BodyCapture,
+    transaction_id: str,
+    part: str,
+    content_type: Optional[str],
+    content_encoding: Optional[str] = None,
+) -> CapturedBody:
+    """Store a finished body capture under the route's capture limits.
+
+    Args:
+        route: Route the transaction was proxied through (its limits override the defaults)
+        capture: The streamed body capture
+        transaction_id: Transaction the body belongs to
+        part: Which body it is ("request" or "response")
+        content_type: Content type of the message, used to decode the body when queried
+        content_encoding: Content encoding of the message, undone when the body is queried
+
+    Returns:
+        The body as it will be kept in the transaction history
+    """
+    max_inline_bytes = route.capture_max_inline_bytes
+    if max_inline_bytes is None:
+        max_inline_bytes = settings.capture_max_inline_bytes
+
+    return CapturedBody.from_capture(
+        capture,
+        max_inline_bytes=max_inline_bytes,
+        overflow=route.capture_overflow or settings.capture_overflow,
+        blob_path=blob_path(transaction_id, part),
+        content_type=content_type,
+        content_encoding=content_encoding,
+    )
@@ -0,0 +1,130 @@
+"""Incremental capture of streamed messages (WebSocket frames, SSE events)."""
+
+import base64
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Literal, Optional, Union
+
+from .settings import settings
+
+StreamKind = Literal["sse", "websocket"]
+FrameDirection = Literal["client", "server"]
+
+
+@dataclass(frozen=True)
+class StreamFrame:
+    """One captured message, kept as text or bytes exactly as it was sent."""
+
+    direction: FrameDirection
+    timestamp: datetime
+    data: Union[str, bytes]
+
+    @property
+    def size(self) -> int:
+        return len(self.data.encode("utf-8") if isinstance(self.data, str) else self.data)
+
+    def to_fields(self) -> dict[str, Any]:
+        """Get the API representation of the frame."""
+        if isinstance(self.data, str):
+            data, encoding = self.data, "utf-8"
+        else:
+            data, encoding = base64.b64encode(self.data).decode("ascii"), "base64"
+        return {
+            "direction": self.direction,
+            "timestamp": self.timestamp.isoformat(),
+            "size": self.size,
+            "data": data,
+            "encoding": encoding,
+        }
+
+
+class StreamCapture:
+    """Frames of a long-lived stream, appended while the stream is still open.
+
+    The transaction holding the capture is recorded as soon as the stream opens, so
+    frames become visible through the API as they pass. Frames beyond the per-stream
+    frame or byte limit are still forwarded but only counted. Code that keeps a copy
+    of the transaction (the transaction log) registers with on_close() to write out
+    its final state.
+    """
+
+    def __init__(
+        self,
+        kind: StreamKind,
+        max_frames: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> None:
+        self.kind = kind
+        self.max_frames = settings.capture_stream_max_frames if max_frames is None else max_frames
+        self.max_bytes = settings.capture_stream_max_bytes if max_bytes is None else max_bytes
+        self.frames: list[StreamFrame] = []
+        self.frame_count = 0
+        self.captured_bytes = 0
+        self.dropped_frames = 0
+        self.open = True
+        self.aborted = False
+        self._close_callbacks: list[Callable[[], None]] = []
+        self._close_lock = threading.Lock()
+
+    def append(self, direction: FrameDirection, data: Union[str, bytes]) -> bool:
+        """Record a frame that was forwarded.
+
+        Args:
+            direction: Which side sent the frame
+            data: Frame payload (text or binary)
+
+        Returns:
+            True if the frame was captured, False if it was over the limits
+        """
+        frame = StreamFrame(direction, datetime.now(timezone.utc), data)
+        self.frame_count += 1
+        if len(self.frames) >= self.max_frames or self.captured_bytes + frame.size > self.max_bytes:
+            self.dropped_frames += 1
+            return False
+        self.frames.append(frame)
+        self.captured_bytes += frame.size
+        return True
+
+    def close(self, aborted: bool = False) -> None:
+        """Mark the stream as finished.
+
+        Args:
+            aborted: Whether it ended abnormally (e.g., a side went away mid-stream)
+        """
+        with self._close_lock:
+            self.open = False
+            self.aborted = aborted
+            callbacks, self._close_callbacks = self._close_callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def on_close(self, callback: Callable[[], None]) -> None:
+        """Call a function once the stream is closed (right away if it already is).
+
+        Args:
+            callback: Function called with no arguments, on the thread closing the stream
+        """
+        with self._close_lock:
+            if self.open:
+                self._close_callbacks.append(callback)
+                return
+        callback()
+
+    def to_fields(self, include_frames: bool = True) -> dict[str, Any]:
+        """Get the API representation of the stream.
+
+        Args:
+            include_frames: Whether to include the captured frames or only the counters
+        """
+        fields: dict[str, Any] = {
+            "kind": self.kind,
+            "open": self.open,
+            "frame_count": self.frame_count,
+            "captured_bytes": self.captured_bytes,
+            "dropped_frames": self.dropped_frames,
+        }
+        if include_frames:
+            fields["frames"] = [frame.to_fields() for frame in self.frames]
+        return fields
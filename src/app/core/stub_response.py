@@ -0,0 +1,39 @@
+"""Static stub response definition."""
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class StubResponse:
+    """A canned response answered in-process for a mapping, with its match conditions.
+
+    The body is encoded once when the mapping is configured, so serving a stub costs
+    no more than copying references. How it was configured is kept alongside, so the
+    configuration can be listed back exactly as it was given.
+    """
+
+    status_code: int = 200
+    headers: tuple[tuple[str, str], ...] = ()
+    body: bytes = b""
+    method: Optional[str] = None
+    query: tuple[tuple[str, str], ...] = ()
+    # The body was configured as a JSON object or list rather than as text
+    json_body: bool = False
+    # The content-type header was added for the body rather than configured
+    implied_content_type: bool = False
+
+    def matches(self, method: str, query_params: Mapping[str, str]) -> bool:
+        """Check whether a request satisfies the stub's match conditions.
+
+        Args:
+            method: HTTP method of the request (any method matches if the stub has none)
+            query_params: Query parameters of the request (must include every stub one)
+
+        Returns:
+            True if the stub answers the request
+        """
+        if self.method is not None and self.method != method.upper():
+            return False
+        return all(query_params.get(name) == value for name, value in self.query)
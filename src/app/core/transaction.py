@@ -0,0 +1,197 @@
+"""Compact representation of a recorded transaction."""
+
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from .captured_body import CapturedBody
+from .stream_capture import StreamCapture
+
+HeaderPairs = tuple[tuple[str, str], ...]
+
+# Shared strings are kept in bounded tables that start over when full, so unique
+# values (dates, request IDs) cannot grow them without limit
+MAX_SHARED_ENTRIES = 4096
+MAX_SHARED_VALUE_LENGTH = 256
+
+_shared_strings: dict[str, str] = {}
+_shared_headers: dict[tuple[str, str], tuple[str, str]] = {}
+
+
+def share_string(value: str) -> str:
+    """Get the shared copy of a short string that recurs across transactions.
+
+    Args:
+        value: String such as a header name, method or mapping description
+
+    Returns:
+        An equal string, shared with earlier callers where possible
+    """
+    if len(value) > MAX_SHARED_VALUE_LENGTH:
+        return value
+    shared = _shared_strings.get(value)
+    if shared is None:
+        if len(_shared_strings) >= MAX_SHARED_ENTRIES:
+            _shared_strings.clear()
+        shared = _shared_strings.setdefault(value, value)
+    return shared
+
+
+def share_headers(headers: Iterable[tuple[str, str]]) -> HeaderPairs:
+    """Convert headers into (name, value) pairs whose strings are shared between records.
+
+    Repeated headers such as Set-Cookie stay separate pairs, in their original order.
+    Common pairs ("content-type: application/json") are stored once; pairs with a
+    unique value still share the name.
+
+    Args:
+        headers: (name, value) pairs as received
+
+    Returns:
+        The pairs as a tuple, shared where possible
+    """
+    pairs = []
+    for name, value in headers:
+        pair = (name, value)
+        shared = _shared_headers.get(pair)
+        if shared is None:
+            if len(value) > MAX_SHARED_VALUE_LENGTH:
+                shared = (share_string(name), value)
+            else:
+                if len(_shared_headers) >= MAX_SHARED_ENTRIES:
+                    _shared_headers.clear()
+                shared = _shared_headers.setdefault(pair, (share_string(name), value))
+        pairs.append(shared)
+    return tuple(pairs)
+
+
+def header_dict(headers: HeaderPairs) -> dict[str, str]:
+    """Get headers as a dict, joining the values of repeated headers with ", "."""
+    joined: dict[str, str] = {}
+    for name, value in headers:
+        joined[name] = f"{joined[name]}, {value}" if name in joined else value
+    return joined
+
+
+# Keys of the mapping view, in the order of the transaction dicts
+_MAPPING_KEYS = (
+    "id",
+    "timestamp",
+    "request",
+    "response",
+    "proxy_mapping_used",
+    "aborted",
+    "replayed",
+    "stubbed",
+    "coalesced",
+    "stream",
+)
+_FIELD_KEYS = frozenset(_MAPPING_KEYS) - {"request", "response", "timestamp"}
+
+
+@dataclass(slots=True, weakref_slot=True, eq=False)
+class Transaction(Mapping[str, Any]):
+    """A transaction recorded in the history.
+
+    The fields live in slots instead of nested dicts, and headers are tuples of
+    shared (name, value) pairs (see share_headers), which keeps the per-record
+    footprint of a large history small.
+
+    For readers the transaction is also a read-only mapping shaped like the API
+    record, with "request" and "response" built on access.
+    """
+
+    id: str
+    timestamp: datetime
+    method: str
+    url: str
+    request_headers: HeaderPairs
+    query_params: tuple[tuple[str, str], ...]
+    request_body: Optional[CapturedBody]
+    status_code: int
+    response_headers: HeaderPairs
+    response_body: Optional[CapturedBody]
+    proxy_mapping_used: str
+    aborted: bool = False
+    replayed: bool = False
+    stubbed: bool = False
+    coalesced: bool = False
+    stream: Optional[StreamCapture] = None
+    # Stamped by the history when stored
+    seq: Optional[int] = None
+    # Serialized API record, cached once it can no longer change (the API cache tracks
+    # the cached records through weak references to bound their total size)
+    serialized: Optional[bytes] = None
+
+    @classmethod
+    def of(cls, transaction: Mapping[str, Any]) -> "Transaction":
+        """Build a Transaction from a dict shaped like its mapping view.
+
+        Args:
+            transaction: Transaction fields, with "request" and "response" dicts
+
+        Returns:
+            A Transaction holding the same data
+        """
+        request = transaction.get("request") or {}
+        response = transaction.get("response") or {}
+        timestamp = transaction.get("timestamp")
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp)
+        return cls(
+            id=transaction.get("id", ""),
+            timestamp=(
+                timestamp if isinstance(timestamp, datetime) else datetime.now(timezone.utc)
+            ),
+            method=request.get("method", ""),
+            url=request.get("url", ""),
+            request_headers=share_headers((request.get("headers") or {}).items()),
+            query_params=tuple((request.get("query_params") or {}).items()),
+            request_body=request.get("body"),
+            status_code=response.get("status_code", 0),
+            response_headers=share_headers((response.get("headers") or {}).items()),
+            response_body=response.get("body"),
+            proxy_mapping_used=transaction.get("proxy_mapping_used", ""),
+            aborted=transaction.get("aborted", False),
+            replayed=transaction.get("replayed", False),
+            stubbed=transaction.get("stubbed", False),
+            coalesced=transaction.get("coalesced", False),
+            stream=transaction.get("stream"),
+            seq=transaction.get("seq"),
+        )
+
+    def _request(self) -> dict[str, Any]:
+        return {
+            "method": self.method,
+            "url": self.url,
+            "headers": header_dict(self.request_headers),
+            "query_params": dict(self.query_params),
+            "body": self.request_body,
+        }
+
+    def _response(self) -> dict[str, Any]:
+        return {
+            "status_code": self.status_code,
+            "headers": header_dict(self.response_headers),
+            "body": self.response_body,
+        }
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "request":
+            return self._request()
+        if key == "response":
+            return self._response()
+        if key == "timestamp":
+            return self.timestamp.isoformat()
+        if key in _FIELD_KEYS or (key == "seq" and self.seq is not None):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from _MAPPING_KEYS
+        if self.seq is not None:
+            yield "seq"
+
+    def __len__(self) -> int:
+        return len(_MAPPING_KEYS) + (self.seq is not None)
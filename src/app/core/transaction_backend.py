@@ -0,0 +1,112 @@
+"""Storage backend interface of the transaction history."""
+
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Optional
+
+from .transaction import Transaction
+from .transaction_filter import TransactionFilter
+
+
+@dataclass
+class TransactionStoreStats:
+    """Counters for the transaction history."""
+
+    stored: int = 0
+    stored_bytes: int = 0
+    evicted: int = 0
+    evicted_bytes: int = 0
+
+
+class TransactionBackend(ABC):
+    """Where the transaction history is kept.
+
+    Every transaction is stamped with a sequence number that increases by one per
+    record and is never reused. Once the record count or captured body byte limit
+    is exceeded, the oldest transactions are evicted; the newest one is always kept.
+
+    Backends are called from the background writer thread and from the event loop,
+    so every method must be thread-safe.
+    """
+
+    max_count: Optional[int]
+    max_bytes: Optional[int]
+    # Whether the store is shared with other worker processes, so writes can wait on
+    # their database locks and must be kept off the event loop
+    shared: bool = False
+
+    @property
+    @abstractmethod
+    def latest_seq(self) -> int:
+        """Sequence number of the newest transaction ever stored (0 before the first)."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of stored transactions."""
+
+    @abstractmethod
+    def __getitem__(self, index: int) -> Transaction:
+        """Get a stored transaction by position, oldest first (negative from the newest)."""
+
+    def __iter__(self) -> Iterator[Transaction]:
+        return iter(self.snapshot())
+
+    @abstractmethod
+    def append(self, transaction: Transaction) -> list[Transaction]:
+        """Add a transaction, evicting the oldest ones if a limit is exceeded.
+
+        Args:
+            transaction: Complete transaction data including request/response info
+
+        Returns:
+            The evicted transactions whose overflow blob files must be deleted, oldest
+            first (backends may return every evicted transaction)
+        """
+
+    @abstractmethod
+    def get(self, transaction_id: str) -> Optional[Transaction]:
+        """Get a stored transaction by its ID."""
+
+    @abstractmethod
+    def select(
+        self,
+        after: Optional[int] = None,
+        before: Optional[int] = None,
+        limit: Optional[int] = None,
+        newest_first: bool = True,
+        transaction_filter: Optional[TransactionFilter] = None,
+    ) -> list[Transaction]:
+        """Get the stored transactions between two sequence numbers.
+
+        Args:
+            after: Only transactions with a greater sequence number
+            before: Only transactions with a smaller sequence number
+            limit: Largest number of transactions returned
+            newest_first: Start from the newest matching transaction instead of the
+                oldest one (the limit applies from that end)
+            transaction_filter: Only transactions meeting these criteria
+
+        Returns:
+            Matching transactions in the requested order
+        """
+
+    def snapshot(self) -> list[Transaction]:
+        """Get the stored transactions, oldest first."""
+        return self.select(newest_first=False)
+
+    @abstractmethod
+    def clear(self) -> tuple[int, list[Transaction]]:
+        """Remove every transaction (sequence numbers and eviction counters are kept).
+
+        Returns:
+            Number of removed transactions, and the removed transactions whose overflow
+            blob files must be deleted (backends may return every removed transaction)
+        """
+
+    @abstractmethod
+    def stats(self) -> TransactionStoreStats:
+        """Get a snapshot of the store counters."""
+
+    def flush(self) -> None:
+        """Write out anything buffered (nothing for backends that do not buffer)."""
@@ -0,0 +1,142 @@
+"""Serialization of stored transactions for storage outside of memory."""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional
+
+from .captured_body import CapturedBody
+from .stream_capture import StreamCapture, StreamFrame
+from .transaction import Transaction, share_headers, share_string
+
+
+def _encode_bytes(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+
+def _encode_body(body: Optional[CapturedBody]) -> Optional[dict[str, Any]]:
+    if body is None:
+        return None
+    return {
+        "data": _encode_bytes(body.data),
+        "size": body.size,
+        "content_type": body.content_type,
+        "content_encoding": body.content_encoding,
+        "truncated": body.truncated,
+        "blob_path": body.blob_path,
+    }
+
+
+def _decode_body(fields: Optional[dict[str, Any]]) -> Optional[CapturedBody]:
+    if fields is None:
+        return None
+    return CapturedBody(**{**fields, "data": base64.b64decode(fields["data"])})
+
+
+def _encode_stream(stream: Optional[StreamCapture]) -> Optional[dict[str, Any]]:
+    if stream is None:
+        return None
+    return {
+        "kind": stream.kind,
+        "max_frames": stream.max_frames,
+        "max_bytes": stream.max_bytes,
+        # Text frames are kept as strings, binary frames as [base64]
+        "frames": [
+            [
+                frame.direction,
+                frame.timestamp.isoformat(),
+                frame.data if isinstance(frame.data, str) else [_encode_bytes(frame.data)],
+            ]
+            for frame in stream.frames
+        ],
+        "frame_count": stream.frame_count,
+        "captured_bytes": stream.captured_bytes,
+        "dropped_frames": stream.dropped_frames,
+        "open": stream.open,
+        "aborted": stream.aborted,
+    }
+
+
+def _decode_stream(fields: Optional[dict[str, Any]]) -> Optional[StreamCapture]:
+    if fields is None:
+        return None
+    stream = StreamCapture(fields["kind"], fields["max_frames"], fields["max_bytes"])
+    stream.frames = [
+        StreamFrame(
+            direction,
+            datetime.fromisoformat(timestamp),
+            data if isinstance(data, str) else base64.b64decode(data[0]),
+        )
+        for direction, timestamp, data in fields["frames"]
+    ]
+    stream.frame_count = fields["frame_count"]
+    stream.captured_bytes = fields["captured_bytes"]
+    stream.dropped_frames = fields["dropped_frames"]
+    stream.open = fields["open"]
+    stream.aborted = fields["aborted"]
+    return stream
+
+
+def encode_transaction(transaction: Transaction) -> bytes:
+    """Serialize a transaction, bodies and stream frames included.
+
+    Bodies that overflowed to blob files are stored by reference to the file. The
+    sequence number and the cached API record are not part of the encoding.
+
+    Args:
+        transaction: Transaction to serialize
+
+    Returns:
+        The transaction as UTF-8 JSON
+    """
+    return json.dumps(
+        {
+            "id": transaction.id,
+            "timestamp": transaction.timestamp.isoformat(),
+            "method": transaction.method,
+            "url": transaction.url,
+            "request_headers": transaction.request_headers,
+            "query_params": transaction.query_params,
+            "request_body": _encode_body(transaction.request_body),
+            "status_code": transaction.status_code,
+            "response_headers": transaction.response_headers,
+            "response_body": _encode_body(transaction.response_body),
+            "proxy_mapping_used": transaction.proxy_mapping_used,
+            "aborted": transaction.aborted,
+            "replayed": transaction.replayed,
+            "stubbed": transaction.stubbed,
+            "coalesced": transaction.coalesced,
+            "stream": _encode_stream(transaction.stream),
+        },
+        separators=(",", ":"),
+    ).encode()
+
+
+def decode_transaction(data: bytes) -> Transaction:
+    """Rebuild a transaction serialized by encode_transaction.
+
+    Args:
+        data: The serialized transaction
+
+    Returns:
+        The transaction, with its header strings shared with the live records
+    """
+    fields = json.loads(data)
+    return Transaction(
+        id=fields["id"],
+        timestamp=datetime.fromisoformat(fields["timestamp"]),
+        method=share_string(fields["method"]),
+        url=fields["url"],
+        request_headers=share_headers(fields["request_headers"]),
+        query_params=tuple((name, value) for name, value in fields["query_params"]),
+        request_body=_decode_body(fields["request_body"]),
+        status_code=fields["status_code"],
+        response_headers=share_headers(fields["response_headers"]),
+        response_body=_decode_body(fields["response_body"]),
+        proxy_mapping_used=share_string(fields["proxy_mapping_used"]),
+        aborted=fields["aborted"],
+        replayed=fields["replayed"],
+        stubbed=fields["stubbed"],
+        coalesced=fields["coalesced"],
+        stream=_decode_stream(fields["stream"]),
+    )
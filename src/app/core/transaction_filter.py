@@ -0,0 +1,147 @@
+"""Transaction filters and the indexed fields they match on."""
+
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import NamedTuple, Optional
+
+from .transaction import Transaction
+
+STATUS_RANGE = re.compile(
+    r"^(?:(?P<code>\d{3})|(?P<class>[1-5])xx|(?P<low>\d{3})-(?P<high>\d{3}))$"
+)
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def _normalize_path_prefix(path_prefix: str) -> str:
+    return "/" + path_prefix.strip("/")
+
+
+def _path_prefixes(path: str) -> tuple[str, ...]:
+    """Get every segment-aligned prefix of a path, shortest first."""
+    prefixes = []
+    end = path.find("/", 1)
+    while end != -1:
+        if end > 1 and path[end - 1] != "/":
+            prefixes.append(path[:end])
+        end = path.find("/", end + 1)
+    if len(path) > 1:
+        prefixes.append(path.rstrip("/"))
+    return tuple(dict.fromkeys(prefixes))
+
+
+class TransactionKeys(NamedTuple):
+    """The fields of a stored transaction that queries filter and index on."""
+
+    method: Optional[str]
+    status_code: Optional[int]
+    proxy_mapping_used: Optional[str]
+    path: Optional[str]
+    path_prefixes: tuple[str, ...]
+    timestamp: Optional[datetime]
+
+    @classmethod
+    def of(cls, transaction: Transaction) -> "TransactionKeys":
+        """Extract the keys of a transaction as stored in the history."""
+        mapping = transaction.proxy_mapping_used
+        # proxy_mapping_used reads "<proxied path> -> <target>"
+        path = mapping.split(" -> ", 1)[0] if mapping else None
+        return cls(
+            method=transaction.method.upper() if transaction.method else None,
+            status_code=transaction.status_code,
+            proxy_mapping_used=mapping,
+            path=path,
+            path_prefixes=_path_prefixes(path) if path else (),
+            timestamp=_as_utc(transaction.timestamp),
+        )
+
+
+@dataclass(frozen=True)
+class TransactionFilter:
+    """Criteria a transaction must all meet to be returned by a query.
+
+    Paths match by whole segments, like mapping prefixes: "/v1/users" matches
+    "/v1/users" and "/v1/users/123" but not "/v1/usersettings".
+    """
+
+    method: Optional[str] = None
+    status_min: Optional[int] = None
+    status_max: Optional[int] = None
+    proxy_mapping_used: Optional[str] = None
+    path_prefix: Optional[str] = None
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+
+    def __post_init__(self) -> None:
+        if self.method is not None:
+            object.__setattr__(self, "method", self.method.upper())
+        if self.path_prefix is not None:
+            prefix = _normalize_path_prefix(self.path_prefix)
+            object.__setattr__(self, "path_prefix", prefix if prefix != "/" else None)
+        if self.since is not None:
+            object.__setattr__(self, "since", _as_utc(self.since))
+        if self.until is not None:
+            object.__setattr__(self, "until", _as_utc(self.until))
+
+    @staticmethod
+    def parse_status(status: str) -> tuple[int, int]:
+        """Parse a status filter: a code ("404"), a class ("4xx") or a range ("400-403").
+
+        Args:
+            status: Status filter as given in the query
+
+        Returns:
+            Inclusive (lowest, highest) status code range
+
+        Raises:
+            ValueError: If the filter is not in one of the supported forms
+        """
+        match = STATUS_RANGE.match(status.strip().lower())
+        if match is None:
+            raise ValueError(f"Invalid status filter: {status}")
+        if match["code"]:
+            return int(match["code"]), int(match["code"])
+        if match["class"]:
+            return int(match["class"]) * 100, int(match["class"]) * 100 + 99
+        low, high = int(match["low"]), int(match["high"])
+        if low > high:
+            raise ValueError(f"Invalid status filter: {status}")
+        return low, high
+
+    @property
+    def empty(self) -> bool:
+        """Whether the filter lets every transaction through."""
+        return self == TransactionFilter()
+
+    def matches(self, keys: TransactionKeys) -> bool:
+        """Check whether a transaction with the given keys meets every criterion."""
+        if self.method is not None and keys.method != self.method:
+            return False
+        if self.status_min is not None or self.status_max is not None:
+            if keys.status_code is None:
+                return False
+            if self.status_min is not None and keys.status_code < self.status_min:
+                return False
+            if self.status_max is not None and keys.status_code > self.status_max:
+                return False
+        if (
+            self.proxy_mapping_used is not None
+            and keys.proxy_mapping_used != self.proxy_mapping_used
+        ):
+            return False
+        if self.path_prefix is not None and not (
+            keys.path == self.path_prefix
+            or (keys.path is not None and keys.path.startswith(self.path_prefix + "/"))
+        ):
+            return False
+        if self.since is not None or self.until is not None:
+            if keys.timestamp is None:
+                return False
+            if self.since is not None and keys.timestamp < self.since:
+                return False
+            if self.until is not None and keys.timestamp > self.until:
+                return False
+        return True
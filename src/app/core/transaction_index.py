@@ -0,0 +1,185 @@
+"""Secondary indexes over the transaction history."""
+
+import bisect
+import heapq
+from collections.abc import Callable, Hashable
+from datetime import datetime
+from typing import Optional
+
+from .transaction_filter import TransactionFilter, TransactionKeys
+
+
+class SequenceList:
+    """Ascending sequence numbers of the transactions that share one index key.
+
+    Transactions are appended in sequence order and evicted oldest first, so new
+    numbers always go at the end and evicted ones are always at the front. Evicted
+    slots are skipped by an offset and compacted away in bulk.
+    """
+
+    def __init__(self) -> None:
+        self._seqs: list[int] = []
+        self._start = 0
+
+    def __len__(self) -> int:
+        return len(self._seqs) - self._start
+
+    def append(self, seq: int) -> None:
+        self._seqs.append(seq)
+
+    def evict(self, seq: int) -> None:
+        """Drop the given sequence number if it is the oldest one in the list."""
+        if self._start < len(self._seqs) and self._seqs[self._start] == seq:
+            self._start += 1
+            if self._start >= len(self._seqs) // 2:
+                del self._seqs[: self._start]
+                self._start = 0
+
+    def bounds(self, low_seq: int, high_seq: int) -> tuple[int, int]:
+        """Get the list positions of the numbers in [low_seq, high_seq)."""
+        return (
+            bisect.bisect_left(self._seqs, low_seq, self._start),
+            bisect.bisect_left(self._seqs, high_seq, self._start),
+        )
+
+    def between(self, low_seq: int, high_seq: int) -> list[int]:
+        """Get the numbers in [low_seq, high_seq), ascending."""
+        low, high = self.bounds(low_seq, high_seq)
+        return self._seqs[low:high]
+
+
+class TransactionIndex:
+    """Method, status, mapping, path prefix and timestamp indexes of the history.
+
+    Each key maps to the sequence numbers of the transactions carrying it. A query
+    reads candidates from whichever index narrows it down the most and the store
+    checks only those candidates against the full filter.
+    """
+
+    def __init__(self) -> None:
+        self.clear()
+
+    @staticmethod
+    def _add(index: dict[Hashable, SequenceList], key: Optional[Hashable], seq: int) -> None:
+        if key is not None:
+            sequences = index.get(key)
+            if sequences is None:
+                sequences = index[key] = SequenceList()
+            sequences.append(seq)
+
+    @staticmethod
+    def _evict(index: dict[Hashable, SequenceList], key: Optional[Hashable], seq: int) -> None:
+        sequences = index.get(key) if key is not None else None
+        if sequences is not None:
+            sequences.evict(seq)
+            if not sequences:
+                del index[key]
+
+    def add(self, seq: int, keys: TransactionKeys) -> None:
+        """Index a newly stored transaction."""
+        self._add(self._by_method, keys.method, seq)
+        self._add(self._by_status, keys.status_code, seq)
+        self._add(self._by_mapping, keys.proxy_mapping_used, seq)
+        for prefix in keys.path_prefixes:
+            self._add(self._by_path, prefix, seq)
+        if keys.timestamp is not None:
+            # Transactions are recorded roughly in timestamp order, so this lands near the end
+            bisect.insort(self._by_time, (keys.timestamp, seq))
+
+    def evict(self, seq: int, keys: TransactionKeys, first_seq: int) -> None:
+        """Remove the oldest stored transaction from the indexes.
+
+        Args:
+            seq: Sequence number of the evicted transaction
+            keys: Index keys of the evicted transaction
+            first_seq: Sequence number of the oldest transaction still stored
+        """
+        self._evict(self._by_method, keys.method, seq)
+        self._evict(self._by_status, keys.status_code, seq)
+        self._evict(self._by_mapping, keys.proxy_mapping_used, seq)
+        for prefix in keys.path_prefixes:
+            self._evict(self._by_path, prefix, seq)
+        if keys.timestamp is not None:
+            self._stale_times += 1
+            if self._stale_times > len(self._by_time) // 2:
+                self._by_time = [entry for entry in self._by_time if entry[1] >= first_seq]
+                self._stale_times = 0
+
+    def clear(self) -> None:
+        """Drop every index entry."""
+        self._by_method: dict[Hashable, SequenceList] = {}
+        self._by_status: dict[Hashable, SequenceList] = {}
+        self._by_mapping: dict[Hashable, SequenceList] = {}
+        self._by_path: dict[Hashable, SequenceList] = {}
+        # (timestamp, seq) sorted by timestamp; evicted entries are removed lazily
+        self._by_time: list[tuple[datetime, int]] = []
+        self._stale_times = 0
+
+    def candidates(
+        self, transaction_filter: TransactionFilter, low_seq: int, high_seq: int
+    ) -> Optional[list[int]]:
+        """Get the sequence numbers in [low_seq, high_seq) that may match the filter.
+
+        Args:
+            transaction_filter: Criteria of the query
+            low_seq: Smallest sequence number of interest (the oldest one stored or later)
+            high_seq: Sequence number after the largest one of interest
+
+        Returns:
+            Ascending candidates read from the most selective index, or None if no
+            index applies and every transaction in the range is a candidate
+        """
+        sources: list[tuple[int, Callable[[], list[int]]]] = []
+
+        def keyed(index: dict[Hashable, SequenceList], keys: list[Hashable]) -> None:
+            lists = [index[key] for key in keys if key in index]
+            size = 0
+            for sequences in lists:
+                low, high = sequences.bounds(low_seq, high_seq)
+                size += high - low
+            # Several keys (a status range) are merged back into sequence order
+            sources.append(
+                (size, lambda: list(heapq.merge(*(s.between(low_seq, high_seq) for s in lists))))
+            )
+
+        if transaction_filter.method is not None:
+            keyed(self._by_method, [transaction_filter.method])
+        if transaction_filter.status_min is not None or transaction_filter.status_max is not None:
+            low_status = transaction_filter.status_min or 0
+            high_status = transaction_filter.status_max or 999
+            keyed(
+                self._by_status,
+                [
+                    code
+                    for code in self._by_status
+                    if isinstance(code, int) and low_status <= code <= high_status
+                ],
+            )
+        if transaction_filter.proxy_mapping_used is not None:
+            keyed(self._by_mapping, [transaction_filter.proxy_mapping_used])
+        if transaction_filter.path_prefix is not None:
+            keyed(self._by_path, [transaction_filter.path_prefix])
+        if transaction_filter.since is not None or transaction_filter.until is not None:
+            low = (
+                bisect.bisect_left(self._by_time, (transaction_filter.since,))
+                if transaction_filter.since is not None
+                else 0
+            )
+            high = (
+                bisect.bisect_right(self._by_time, (transaction_filter.until, float("inf")))
+                if transaction_filter.until is not None
+                else len(self._by_time)
+            )
+            sources.append(
+                (
+                    max(high - low, 0),
+                    lambda: sorted(
+                        seq for _, seq in self._by_time[low:high] if low_seq <= seq < high_seq
+                    ),
+                )
+            )
+
+        if not sources:
+            return None
+        _, read = min(sources, key=lambda source: source[0])
+        return read()
@@ -0,0 +1,74 @@
+"""Listeners notified as transactions are recorded."""
+
+import asyncio
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from pyla_logger import logger
+
+from .session import Session
+from .sessions import current_session
+from .transaction import Transaction
+
+
+@dataclass(eq=False)
+class TransactionListener:
+    """A callback run on its event loop for every transaction recorded in a session."""
+
+    loop: asyncio.AbstractEventLoop
+    callback: Callable[[Transaction], None]
+    session: Session
+
+
+_listeners: set[TransactionListener] = set()
+_listeners_lock = threading.Lock()
+
+
+def add_transaction_listener(callback: Callable[[Transaction], None]) -> TransactionListener:
+    """Register a callback for the current session's transactions, run on the current loop.
+
+    Args:
+        callback: Called with each transaction as it is added to the history. It runs
+            on the registering event loop and must not block.
+
+    Returns:
+        Handle for remove_transaction_listener
+    """
+    listener = TransactionListener(asyncio.get_running_loop(), callback, current_session())
+    with _listeners_lock:
+        _listeners.add(listener)
+    return listener
+
+
+def remove_transaction_listener(listener: TransactionListener) -> None:
+    """Stop notifying a listener."""
+    with _listeners_lock:
+        _listeners.discard(listener)
+
+
+def has_transaction_listeners() -> bool:
+    """Check whether any listener is registered."""
+    with _listeners_lock:
+        return bool(_listeners)
+
+
+def notify_transaction_listeners(transaction: Transaction, session: Session) -> None:
+    """Schedule the callback of every listener of a session for a recorded transaction.
+
+    Safe to call from any thread: the writer may record transactions from a worker
+    thread, so callbacks are always handed to their loop instead of being run here.
+
+    Args:
+        transaction: Transaction data as stored in the history
+        session: Session the transaction was recorded in
+    """
+    with _listeners_lock:
+        listeners = [listener for listener in _listeners if listener.session is session]
+    for listener in listeners:
+        try:
+            listener.loop.call_soon_threadsafe(listener.callback, transaction)
+        except RuntimeError:
+            # The listener's loop is closed, so it will never unregister itself
+            logger.debug("Dropping transaction listener of a closed event loop")
+            remove_transaction_listener(listener)
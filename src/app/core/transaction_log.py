@@ -0,0 +1,203 @@
+"""Crash-safe log of the transaction history and route table, replayed at startup."""
+
+import threading
+from collections import deque
+from collections.abc import Iterable
+from typing import Optional
+
+from pyla_logger import logger
+
+from . import storage_data
+from .delete_transaction_blobs import delete_transaction_blobs
+from .proxy_route import ProxyRoute
+from .route_codec import decode_routes, encode_routes
+from .route_trie import RouteTrie
+from .segmented_log import SegmentedLog
+from .settings import settings
+from .transaction import Transaction
+from .transaction_codec import decode_transaction, encode_transaction
+
+# Record kinds, the first byte of every record
+TRANSACTION_RECORD = ord("T")
+CLEAR_RECORD = ord("C")
+ROUTES_RECORD = ord("R")
+
+_log: Optional[SegmentedLog] = None
+_segment: Optional[str] = None
+# Newest sequence number recorded in each segment; a segment can be deleted once all
+# of its transactions have left the history
+_segment_seqs: dict[str, int] = {}
+_syncer: Optional[threading.Thread] = None
+_stop_syncing = threading.Event()
+
+
+def _replay(log: SegmentedLog) -> int:
+    """Load the logged transactions and the last logged route table.
+
+    Transactions are only loaded into an empty history; a history backend that
+    persists on its own already holds them.
+    """
+    load_transactions = len(storage_data.transaction_history) == 0
+    max_count = storage_data.transaction_history.max_count
+    # Only the newest transactions after the last clear can survive the limits, so
+    # only those are decoded
+    pending: deque[tuple[str, memoryview]] = deque(maxlen=max_count)
+    routes: Optional[bytes] = None
+    for path, record in log.read():
+        kind = record[0]
+        if kind == TRANSACTION_RECORD and load_transactions:
+            pending.append((path, record))
+        elif kind == CLEAR_RECORD:
+            pending.clear()
+        elif kind == ROUTES_RECORD:
+            routes = bytes(record[1:])
+
+    # A stream is logged when it opens and again when it closes; the transaction keeps
+    # its place from the first record and its content from the last
+    logged: dict[str, tuple[str, Transaction]] = {}
+    for path, record in pending:
+        transaction = decode_transaction(bytes(record[1:]))
+        logged[transaction.id] = (path, transaction)
+
+    for path, transaction in logged.values():
+        if transaction.stream is not None and transaction.stream.open:
+            # Its connection did not survive the restart
+            transaction.stream.close(aborted=True)
+        for evicted in storage_data.transaction_history.append(transaction):
+            delete_transaction_blobs(evicted)
+        _segment_seqs[path] = max(
+            _segment_seqs.get(path, 0), storage_data.transaction_history.latest_seq
+        )
+
+    if routes is not None:
+        session = storage_data.default_session
+        with session.route_table_lock:
+            session.proxy_configurations = RouteTrie.build(decode_routes(routes))
+    return len(logged)
+
+
+def _start_segment(log: SegmentedLog) -> None:
+    """Move on to a new segment and delete the ones no longer needed."""
+    global _segment
+
+    _segment = log.rotate()
+    # Every segment starts with the route table, so older ones are never needed for it
+    session = storage_data.default_session
+    with session.route_table_lock:
+        log.append(bytes([ROUTES_RECORD]) + encode_routes(session.proxy_configurations))
+    history = storage_data.transaction_history
+    oldest_seq = history.latest_seq - len(history) + 1
+    unneeded = [
+        path
+        for path in log.segments()
+        if path != _segment and _segment_seqs.get(path, 0) < oldest_seq
+    ]
+    log.delete(unneeded)
+    for path in unneeded:
+        _segment_seqs.pop(path, None)
+
+
+def _sync_periodically(log: SegmentedLog, interval: float) -> None:
+    """Sync the log every interval, so records are synced even when traffic stops."""
+    while not _stop_syncing.wait(interval):
+        try:
+            log.sync()
+        except Exception as e:
+            logger.error(f"Failed to sync the transaction log: {e}")
+
+
+def _append(record: bytes) -> None:
+    if _log is not None and _log.append(record):
+        _start_segment(_log)
+
+
+def start_transaction_log() -> int:
+    """Replay the transaction log, if one is configured, and keep logging to it.
+
+    Returns:
+        Number of transactions loaded back into the history
+    """
+    global _log, _syncer
+
+    if settings.transaction_log_dir is None or _log is not None:
+        return 0
+    if settings.workers > 1:
+        # Workers would write over each other's segments; the shared database already
+        # survives restarts
+        logger.warning("The transaction log is not used with more than one worker")
+        return 0
+    log = SegmentedLog(
+        settings.transaction_log_dir,
+        settings.transaction_log_segment_bytes,
+        settings.transaction_log_fsync_interval,
+    )
+    replayed = _replay(log)
+    _start_segment(log)
+    _log = log
+    interval = settings.transaction_log_fsync_interval
+    if interval > 0:
+        _stop_syncing.clear()
+        _syncer = threading.Thread(
+            target=_sync_periodically,
+            args=(log, interval),
+            name="transaction-log-sync",
+            daemon=True,
+        )
+        _syncer.start()
+    logger.info(f"Replayed {replayed} transactions from {settings.transaction_log_dir}")
+    return replayed
+
+
+def stop_transaction_log() -> None:
+    """Sync and close the transaction log."""
+    global _log, _segment, _syncer
+
+    if _syncer is not None:
+        _stop_syncing.set()
+        _syncer.join()
+        _syncer = None
+    if _log is not None:
+        _log.close()
+    _log = None
+    _segment = None
+    _segment_seqs.clear()
+
+
+def _log_record(transaction: Transaction) -> None:
+    if _segment is not None:
+        _segment_seqs[_segment] = storage_data.transaction_history.latest_seq
+    _append(bytes([TRANSACTION_RECORD]) + encode_transaction(transaction))
+
+
+def _log_closed_stream(transaction: Transaction) -> None:
+    """Log the final frames and state of a stream transaction once it has closed."""
+    # A transaction cleared or evicted meanwhile must not come back on replay
+    if _log is None or storage_data.transaction_history.get(transaction.id) is None:
+        return
+    try:
+        _log_record(transaction)
+    except Exception as e:
+        logger.error(f"Failed to log the closed stream of transaction {transaction.id}: {e}")
+
+
+def log_transaction(transaction: Transaction) -> None:
+    """Log a transaction that was just added to the history.
+
+    A transaction whose stream is still open is logged again when the stream closes.
+    """
+    if _log is None:
+        return
+    if transaction.stream is not None and transaction.stream.open:
+        transaction.stream.on_close(lambda: _log_closed_stream(transaction))
+    _log_record(transaction)
+
+
+def log_clear() -> None:
+    """Log that the history was cleared."""
+    _append(bytes([CLEAR_RECORD]))
+
+
+def log_route_table(routes: Iterable[ProxyRoute]) -> None:
+    """Log the route table after a change (call with the route table lock held)."""
+    if _log is not None:
+        _append(bytes([ROUTES_RECORD]) + encode_routes(routes))
@@ -0,0 +1,218 @@
+"""Bounded in-memory transaction history."""
+
+import threading
+from typing import Optional
+
+from .transaction import Transaction
+from .transaction_backend import TransactionBackend, TransactionStoreStats
+from .transaction_filter import TransactionFilter, TransactionKeys
+from .transaction_index import TransactionIndex
+
+
+def _body_bytes(transaction: Transaction) -> int:
+    """Get the captured body size a transaction counts against the byte budget."""
+    bodies = (transaction.request_body, transaction.response_body)
+    return sum(body.size for body in bodies if body is not None)
+
+
+# A stored transaction with its captured body bytes and indexed keys
+_Record = tuple[Transaction, int, TransactionKeys]
+
+
+class TransactionStore(TransactionBackend):
+    """In-memory ring buffer of recorded transactions, oldest first (the default backend).
+
+    Every transaction is stamped with a sequence number ("seq") that increases by one
+    per record and is never reused, not even after a clear. Because sequence numbers
+    are contiguous, the position of a record is computed from its number, so cursor
+    queries only touch the records they return. Filtered queries read candidates
+    from secondary indexes maintained on append and eviction.
+
+    Once the configured record count or total captured body bytes is exceeded, the
+    oldest transactions are evicted until both limits hold again. The newest
+    transaction is always kept, even if its bodies alone exceed the byte budget.
+    Evictions are counted so clients can tell that records were dropped.
+
+    The writer appends from a worker thread while queries read on the event loop,
+    so every access goes through a lock and readers get list snapshots.
+    """
+
+    def __init__(self, max_count: Optional[int] = None, max_bytes: Optional[int] = None) -> None:
+        self.max_count = max_count
+        self.max_bytes = max_bytes
+        # Records live in _records[_start:]; evicted slots at the front are emptied
+        # and compacted away in bulk so that indexing stays O(1)
+        self._records: list[Optional[_Record]] = []
+        self._start = 0
+        self._next_seq = 1
+        self._by_id: dict[str, Transaction] = {}
+        self._index = TransactionIndex()
+        self._bytes = 0
+        self._evicted = 0
+        self._evicted_bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._records) - self._start
+
+    def __getitem__(self, index: int) -> Transaction:
+        with self._lock:
+            if index < 0:
+                index += len(self)
+            if not 0 <= index < len(self):
+                raise IndexError("transaction index out of range")
+            record = self._records[self._start + index]
+            if record is None:
+                raise IndexError("transaction index out of range")
+            return record[0]
+
+    @property
+    def latest_seq(self) -> int:
+        """Sequence number of the newest transaction ever stored (0 before the first)."""
+        return self._next_seq - 1
+
+    def _over_limits(self) -> bool:
+        if len(self) <= 1:
+            return False
+        if self.max_count is not None and len(self) > self.max_count:
+            return True
+        return self.max_bytes is not None and self._bytes > self.max_bytes
+
+    def _evict_oldest(self) -> Transaction:
+        record = self._records[self._start]
+        if record is None:
+            raise IndexError("no transaction to evict")
+        oldest, oldest_size, oldest_keys = record
+        first_seq = self._next_seq - len(self)
+        self._records[self._start] = None
+        self._start += 1
+        self._index.evict(first_seq, oldest_keys, first_seq + 1)
+        if self._start >= len(self._records) // 2:
+            del self._records[: self._start]
+            self._start = 0
+        self._bytes -= oldest_size
+        if self._by_id.get(oldest.id) is oldest:
+            del self._by_id[oldest.id]
+        self._evicted += 1
+        self._evicted_bytes += oldest_size
+        return oldest
+
+    def append(self, transaction: Transaction) -> list[Transaction]:
+        """Add a transaction, evicting the oldest ones if a limit is exceeded.
+
+        Args:
+            transaction: Complete transaction data including request/response info,
+                stamped with its sequence number in place
+
+        Returns:
+            The evicted transactions, oldest first
+        """
+        size = _body_bytes(transaction)
+        keys = TransactionKeys.of(transaction)
+        evicted = []
+        with self._lock:
+            seq = self._next_seq
+            transaction.seq = seq
+            self._next_seq += 1
+            self._records.append((transaction, size, keys))
+            self._index.add(seq, keys)
+            self._bytes += size
+            self._by_id[transaction.id] = transaction
+            while self._over_limits():
+                evicted.append(self._evict_oldest())
+        return evicted
+
+    def get(self, transaction_id: str) -> Optional[Transaction]:
+        """Get a stored transaction by its ID."""
+        with self._lock:
+            return self._by_id.get(transaction_id)
+
+    def select(
+        self,
+        after: Optional[int] = None,
+        before: Optional[int] = None,
+        limit: Optional[int] = None,
+        newest_first: bool = True,
+        transaction_filter: Optional[TransactionFilter] = None,
+    ) -> list[Transaction]:
+        """Get the stored transactions between two sequence numbers.
+
+        Args:
+            after: Only transactions with a greater sequence number
+            before: Only transactions with a smaller sequence number
+            limit: Largest number of transactions returned
+            newest_first: Start from the newest matching transaction instead of the
+                oldest one (the limit applies from that end)
+            transaction_filter: Only transactions meeting these criteria
+
+        Returns:
+            Matching transactions in the requested order
+        """
+        with self._lock:
+            stored = len(self)
+            first_seq = self._next_seq - stored
+            low = 0 if after is None else min(max(after + 1 - first_seq, 0), stored)
+            high = stored if before is None else min(max(before - first_seq, 0), stored)
+            if transaction_filter is not None and not transaction_filter.empty:
+                return self._select_filtered(
+                    transaction_filter, first_seq + low, first_seq + high, limit, newest_first
+                )
+            if limit is not None and high - low > limit:
+                if newest_first:
+                    low = high - limit
+                else:
+                    high = low + limit
+            selected = [
+                record[0]
+                for record in self._records[self._start + low : self._start + high]
+                if record is not None
+            ]
+        if newest_first:
+            selected.reverse()
+        return selected
+
+    def _select_filtered(
+        self,
+        transaction_filter: TransactionFilter,
+        low_seq: int,
+        high_seq: int,
+        limit: Optional[int],
+        newest_first: bool,
+    ) -> list[Transaction]:
+        # Called with the lock held
+        offset = self._start - (self._next_seq - len(self))
+        candidates = self._index.candidates(transaction_filter, low_seq, high_seq)
+        seqs = candidates if candidates is not None else range(low_seq, high_seq)
+        selected = []
+        for seq in reversed(seqs) if newest_first else seqs:
+            record = self._records[offset + seq]
+            if record is not None and transaction_filter.matches(record[2]):
+                selected.append(record[0])
+                if limit is not None and len(selected) >= limit:
+                    break
+        return selected
+
+    def clear(self) -> tuple[int, list[Transaction]]:
+        """Remove every transaction (sequence numbers and eviction counters are kept).
+
+        Returns:
+            Number of removed transactions, and the removed transactions, oldest first
+        """
+        with self._lock:
+            removed = [record[0] for record in self._records[self._start :] if record is not None]
+            self._records = []
+            self._start = 0
+            self._by_id.clear()
+            self._index.clear()
+            self._bytes = 0
+        return len(removed), removed
+
+    def stats(self) -> TransactionStoreStats:
+        """Get a snapshot of the store counters."""
+        with self._lock:
+            return TransactionStoreStats(
+                stored=len(self),
+                stored_bytes=self._bytes,
+                evicted=self._evicted,
+                evicted_bytes=self._evicted_bytes,
+            )
@@ -0,0 +1,60 @@
+"""Live subscription to recorded transactions."""
+
+import asyncio
+from typing import Optional
+
+from .transaction import Transaction
+from .transaction_filter import TransactionFilter, TransactionKeys
+from .transaction_listeners import (
+    TransactionListener,
+    add_transaction_listener,
+    remove_transaction_listener,
+)
+
+
+class TransactionSubscription:
+    """Bounded queue of newly recorded transactions for one live-stream subscriber.
+
+    Transactions are offered to the queue without waiting: when a slow subscriber
+    lets its queue fill up, further transactions are dropped for that subscriber
+    and counted, so it can never hold up recording or other subscribers.
+    """
+
+    def __init__(self, transaction_filter: TransactionFilter, max_queued: int) -> None:
+        self.transaction_filter = transaction_filter
+        self.dropped = 0
+        self._queue: asyncio.Queue[Transaction] = asyncio.Queue(maxsize=max_queued)
+        self._listener: Optional[TransactionListener] = None
+
+    def _offer(self, transaction: Transaction) -> None:
+        if not self.transaction_filter.matches(TransactionKeys.of(transaction)):
+            return
+        try:
+            self._queue.put_nowait(transaction)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    def start(self) -> None:
+        """Start receiving transactions (must be called on the consuming event loop)."""
+        if self._listener is None:
+            self._listener = add_transaction_listener(self._offer)
+
+    def stop(self) -> None:
+        """Stop receiving transactions."""
+        if self._listener is not None:
+            remove_transaction_listener(self._listener)
+            self._listener = None
+
+    async def next(self, timeout: float) -> Optional[Transaction]:
+        """Get the next matching transaction.
+
+        Args:
+            timeout: Seconds to wait for one
+
+        Returns:
+            The transaction, or None if none was recorded within the timeout
+        """
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
@@ -0,0 +1,164 @@
+"""Background writer that records transactions off the response path."""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Optional
+
+from pyla_logger import logger
+
+from .add_transaction import add_transaction
+from .pending_transaction import PendingTransaction
+from .replay_store import save_replay_entry
+from .settings import settings
+
+
+@dataclass
+class TransactionWriterStats:
+    """Counters for the background transaction writer."""
+
+    submitted: int = 0
+    written: int = 0
+    dropped: int = 0
+    failed: int = 0
+    pending: int = 0
+    running: bool = False
+
+
+_queue: Optional[asyncio.Queue[PendingTransaction]] = None
+_task: Optional[asyncio.Task[None]] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_stats = TransactionWriterStats()
+
+
+def _write(pending: PendingTransaction) -> None:
+    if pending.session.closed:
+        # The session was deleted while the response was in flight
+        logger.debug(f"Dropped record for {pending.url} of deleted session {pending.session.name}")
+        pending.close()
+        return
+    try:
+        transaction = pending.build()
+        add_transaction(transaction, pending.session)
+        if pending.record_replay and not pending.aborted:
+            save_replay_entry(pending.normalized_path, transaction)
+        _stats.written += 1
+    except Exception as e:
+        _stats.failed += 1
+        logger.error(f"Failed to record transaction for {pending.url}: {e}")
+    finally:
+        pending.close()
+
+
+def _blocks(pending: PendingTransaction) -> bool:
+    """Whether recording a transaction waits on file or database I/O."""
+    # Spooled bodies are read back from disk, and a shared store writes every
+    # transaction at once under the database write lock the other workers also take
+    return pending.spilled or pending.session.transaction_history.shared
+
+
+async def _consume(queue: asyncio.Queue[PendingTransaction]) -> None:
+    while True:
+        pending = await queue.get()
+        try:
+            if _blocks(pending):
+                await asyncio.to_thread(_write, pending)
+            else:
+                _write(pending)
+        finally:
+            queue.task_done()
+
+
+def _running_queue() -> Optional[asyncio.Queue[PendingTransaction]]:
+    """Get the writer queue if the writer runs on the current event loop."""
+    if _queue is None:
+        return None
+    try:
+        current_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+    return _queue if current_loop is _loop else None
+
+
+async def start_transaction_writer() -> None:
+    """Start the background writer task (called from the app lifespan)."""
+    global _queue, _task, _loop
+
+    if _task is not None:
+        return
+    _queue = asyncio.Queue(maxsize=settings.writer_queue_size)
+    _loop = asyncio.get_running_loop()
+    _task = asyncio.create_task(_consume(_queue))
+    logger.info(
+        f"Started transaction writer (queue_size={settings.writer_queue_size}, "
+        f"full_policy={settings.writer_full_policy})"
+    )
+
+
+async def stop_transaction_writer() -> None:
+    """Drain outstanding records and stop the background writer."""
+    global _queue, _task, _loop
+
+    if _task is None:
+        return
+    await flush_transaction_writer()
+    _task.cancel()
+    try:
+        await _task
+    except asyncio.CancelledError:
+        pass
+    _queue = None
+    _task = None
+    _loop = None
+    logger.info("Stopped transaction writer")
+
+
+async def submit_transaction(pending: PendingTransaction) -> None:
+    """Hand a transaction to the background writer.
+
+    When the queue is full the configured policy applies: "block" waits for room
+    (backpressure), "drop" discards the record and counts it. Without a running
+    writer on this event loop the transaction is recorded inline. Transactions of a
+    session deleted meanwhile are dropped and their captures released.
+
+    Args:
+        pending: Transaction captured on the proxy path
+    """
+    _stats.submitted += 1
+    queue = _running_queue()
+    if queue is None or pending.session.closed:
+        _write(pending)
+        return
+
+    if settings.writer_full_policy == "drop":
+        try:
+            queue.put_nowait(pending)
+        except asyncio.QueueFull:
+            _stats.dropped += 1
+            pending.close()
+            logger.warning(f"Transaction writer queue full, dropped record for {pending.url}")
+        return
+
+    await queue.put(pending)
+
+
+async def flush_transaction_writer() -> None:
+    """Wait until every submitted transaction has been recorded."""
+    queue = _running_queue()
+    if queue is not None:
+        await queue.join()
+
+
+def get_transaction_writer_stats() -> TransactionWriterStats:
+    """Get a snapshot of the writer counters.
+
+    Returns:
+        Counters including the number of records still waiting in the queue
+    """
+    return TransactionWriterStats(
+        submitted=_stats.submitted,
+        written=_stats.written,
+        dropped=_stats.dropped,
+        failed=_stats.failed,
+        pending=_queue.qsize() if _queue is not None else 0,
+        running=_task is not None and not _task.done(),
+    )
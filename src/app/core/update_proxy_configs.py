@@ -0,0 +1,24 @@
+"""Update proxy configurations function."""
+
+from collections.abc import Iterable
+
+from .proxy_route import ProxyRoute
+from .route_table_update import route_table_update
+from .sessions import current_session
+
+
+def update_proxy_configs(routes: Iterable[ProxyRoute]) -> int:
+    """Add or replace several mappings in one atomic route table swap.
+
+    Mappings not named in routes are kept as they are.
+
+    Args:
+        routes: Routes to add, replacing existing ones with the same prefix
+
+    Returns:
+        Number of mappings in the route table afterwards
+    """
+    session = current_session()
+    with route_table_update(session):
+        session.proxy_configurations = session.proxy_configurations.with_routes(routes)
+        return len(session.proxy_configurations)
@@ -0,0 +1,69 @@
+"""Shared upstream HTTP client used by the proxy handler."""
+
+from typing import Optional
+
+import httpx
+from pyla_logger import logger
+
+from .host_limited_transport import HostLimitedTransport, UpstreamPoolStats
+from .settings import settings
+
+# App-scoped client, created in the application lifespan
+_client: Optional[httpx.AsyncClient] = None
+_transport: Optional[HostLimitedTransport] = None
+
+
+def _create_client() -> httpx.AsyncClient:
+    global _client, _transport
+
+    _transport = HostLimitedTransport(
+        limits=httpx.Limits(
+            max_connections=settings.upstream_max_connections,
+            max_keepalive_connections=settings.upstream_max_keepalive_connections,
+            keepalive_expiry=settings.upstream_keepalive_expiry,
+        ),
+        max_connections_per_host=settings.upstream_max_connections_per_host,
+    )
+    _client = httpx.AsyncClient(transport=_transport, timeout=settings.upstream_timeout)
+    return _client
+
+
+async def start_upstream_client() -> None:
+    """Create the shared upstream client (called from the app lifespan)."""
+    if _client is None:
+        _create_client()
+        logger.info(
+            f"Started upstream client (max_connections={settings.upstream_max_connections}, "
+            f"per_host={settings.upstream_max_connections_per_host})"
+        )
+
+
+async def close_upstream_client() -> None:
+    """Close the shared upstream client and release all pooled connections."""
+    global _client, _transport
+
+    if _client is not None:
+        await _client.aclose()
+        logger.info("Closed upstream client")
+    _client = None
+    _transport = None
+
+
+def get_upstream_client() -> httpx.AsyncClient:
+    """Get the shared upstream client, creating it if the lifespan has not run.
+
+    Returns:
+        The app-scoped pooled httpx client
+    """
+    return _client if _client is not None else _create_client()
+
+
+def get_upstream_pool_stats() -> UpstreamPoolStats:
+    """Get pool usage counters for sizing the upstream connection pool.
+
+    Returns:
+        Snapshot of the counters (all zero if the client has not been created)
+    """
+    if _transport is None:
+        return UpstreamPoolStats()
+    return _transport.snapshot_stats()
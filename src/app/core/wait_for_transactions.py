@@ -0,0 +1,62 @@
+"""Wait for transactions function."""
+
+import asyncio
+from typing import Optional
+
+from .get_latest_sequence import get_latest_sequence
+from .get_transactions import get_transactions
+from .transaction import Transaction
+from .transaction_filter import TransactionFilter
+from .transaction_listeners import add_transaction_listener, remove_transaction_listener
+
+
+async def wait_for_transactions(
+    transaction_filter: TransactionFilter,
+    count: int = 1,
+    timeout: float = 30.0,
+    after: Optional[int] = None,
+) -> list[Transaction]:
+    """Wait until enough transactions matching a filter have been recorded.
+
+    The history is checked once up front and then again each time a transaction is
+    recorded, only looking at transactions recorded since the previous check.
+
+    Args:
+        transaction_filter: Criteria the transactions must meet
+        count: Number of matching transactions to wait for
+        timeout: Seconds to wait before giving up
+        after: Only count transactions with a greater sequence number (by default the
+            whole history counts)
+
+    Returns:
+        The first count matching transactions, oldest first, or fewer if the timeout
+        expired first
+    """
+    recorded = asyncio.Event()
+    # Registered before the first check so no transaction can slip in unnoticed
+    listener = add_transaction_listener(lambda _: recorded.set())
+    matches: list[Transaction] = []
+    cursor = after or 0
+    deadline = asyncio.get_running_loop().time() + timeout
+    try:
+        while True:
+            recorded.clear()
+            latest_seq = get_latest_sequence()
+            matches.extend(
+                get_transactions(
+                    count - len(matches),
+                    after=cursor,
+                    before=latest_seq + 1,
+                    transaction_filter=transaction_filter,
+                )
+            )
+            cursor = max(cursor, latest_seq)
+            remaining = deadline - asyncio.get_running_loop().time()
+            if len(matches) >= count or remaining <= 0:
+                return matches
+            try:
+                await asyncio.wait_for(recorded.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        remove_transaction_listener(listener)
@@ -0,0 +1,98 @@
+"""Keeps the default session of several worker processes in step."""
+
+import asyncio
+from typing import Optional
+
+from pyla_logger import logger
+
+from . import storage_data
+from .route_trie import RouteTrie
+from .settings import settings
+from .sqlite_route_table import SqliteRouteTable
+from .transaction import Transaction
+from .transaction_listeners import has_transaction_listeners, notify_transaction_listeners
+
+_routes: Optional[SqliteRouteTable] = None
+_task: Optional[asyncio.Task[None]] = None
+
+
+def worker_sync_running() -> bool:
+    """Check whether this process shares its state with other workers."""
+    return _routes is not None
+
+
+def get_shared_route_table() -> Optional[SqliteRouteTable]:
+    """Get the route table shared with other workers (None with a single worker)."""
+    return _routes
+
+
+def sync_route_table() -> None:
+    """Pick up a default session route table published by another worker."""
+    if _routes is None:
+        return
+    session = storage_data.default_session
+    with session.route_table_lock:
+        routes = _routes.changes()
+        if routes is not None:
+            session.proxy_configurations = RouteTrie.build(routes)
+
+
+def _sync_with_other_workers(cursor: int) -> tuple[int, list[Transaction]]:
+    """Pick up the other workers' route table and transactions.
+
+    Returns:
+        The newest sequence number and, if anyone listens, the transactions after cursor
+    """
+    sync_route_table()
+    history = storage_data.default_session.transaction_history
+    # Also writes the final state of this worker's closed streams for the others
+    history.flush()
+    latest_seq = history.latest_seq
+    if latest_seq <= cursor or not has_transaction_listeners():
+        return latest_seq, []
+    return latest_seq, history.select(after=cursor, before=latest_seq + 1, newest_first=False)
+
+
+async def _follow_other_workers(cursor: int) -> None:
+    """Keep the route table current and notify listeners of transactions after cursor."""
+    while True:
+        await asyncio.sleep(settings.worker_sync_interval)
+        try:
+            # The shared database can be locked by another worker, so wait for it in
+            # a thread rather than on the event loop
+            latest_seq, transactions = await asyncio.to_thread(_sync_with_other_workers, cursor)
+            for transaction in transactions:
+                notify_transaction_listeners(transaction, storage_data.default_session)
+            cursor = max(cursor, latest_seq)
+        except Exception as e:
+            logger.error(f"Failed to sync with the other workers: {e}")
+
+
+async def start_worker_sync() -> None:
+    """Start sharing state with the other workers if TRIXIE_WORKERS is above 1."""
+    global _routes, _task
+
+    if settings.workers <= 1 or _routes is not None:
+        return
+    _routes = SqliteRouteTable(settings.history_sqlite_path)
+    sync_route_table()
+    _task = asyncio.create_task(
+        _follow_other_workers(storage_data.default_session.transaction_history.latest_seq)
+    )
+    logger.info(f"Sharing routes and transactions through {settings.history_sqlite_path}")
+
+
+async def stop_worker_sync() -> None:
+    """Stop sharing state with the other workers."""
+    global _routes, _task
+
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+    if _routes is not None:
+        _routes.close()
+    _routes = None
+    _task = None
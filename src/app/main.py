@@ -1,10 +1,42 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .api.endpoints.proxy_handler import router as proxy_router
+from .api.endpoints.websocket_proxy import router as websocket_proxy_router
 from .api.router import api_router
+from .api.session_middleware import SessionMiddleware
+from .core.flush_transaction_history import flush_transaction_history
+from .core.replay_store import load_replay_store
+from .core.settings import settings
+from .core.transaction_log import start_transaction_log, stop_transaction_log
+from .core.transaction_writer import start_transaction_writer, stop_transaction_writer
+from .core.upstream_client import close_upstream_client, start_upstream_client
+from .core.worker_sync import start_worker_sync, stop_worker_sync
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Own the shared upstream client and transaction writer for the app lifetime."""
+    if settings.replay_mode == "replay":
+        load_replay_store()
+    start_transaction_log()
+    await start_worker_sync()
+    await start_upstream_client()
+    await start_transaction_writer()
+    try:
+        yield
+    finally:
+        await stop_transaction_writer()
+        flush_transaction_history()
+        stop_transaction_log()
+        await stop_worker_sync()
+        await close_upstream_client()
+
 
-app = FastAPI(title="Task Trellis Remote API", redirect_slashes=False)
+app = FastAPI(title="Task Trellis Remote API", redirect_slashes=False, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -12,7 +44,9 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(SessionMiddleware)
 
 # Mount proxy router at root level (before API router to avoid conflicts)
 app.include_router(proxy_router)
+app.include_router(websocket_proxy_router)
 app.include_router(api_router, prefix="/api")
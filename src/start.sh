@@ -7,11 +7,14 @@ python app_prestart.py
 # Run uvicorn from parent directory to handle relative imports correctly
 cd ..
 
+# TRIXIE_WORKERS worker processes share routes and transactions through SQLite
+WORKERS="${TRIXIE_WORKERS:-1}"
+
 # Check if SSL certificates exist and start with HTTPS if available
 if [ -f "/certs/trixie.crt" ] && [ -f "/certs/trixie.key" ]; then
     echo "SSL certificates found, starting with HTTPS support..."
-    exec uvicorn app.main:app --host 0.0.0.0 --port 443 --ssl-keyfile=/certs/trixie.key --ssl-certfile=/certs/trixie.crt
+    exec uvicorn app.main:app --host 0.0.0.0 --port 443 --ssl-keyfile=/certs/trixie.key --ssl-certfile=/certs/trixie.crt --workers "$WORKERS"
 else
     echo "SSL certificates not found, starting with HTTP only..."
-    exec uvicorn app.main:app --host 0.0.0.0 --port 80
+    exec uvicorn app.main:app --host 0.0.0.0 --port 80 --workers "$WORKERS"
 fi
@@ -0,0 +1,81 @@
+"""Shared fixtures and factories for the test suite."""
+
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import httpx
+import pytest
+
+from src.app.core.body_capture import BodyCapture
+from src.app.core.clear_proxy_configs import clear_proxy_configs
+from src.app.core.pending_transaction import PendingTransaction
+from src.app.core.proxy_route import ProxyRoute
+from src.app.core.storage_data import transaction_history
+from src.app.core.stream_capture import StreamCapture
+from src.app.core.transaction import Transaction
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def clean_storage():
+    """Start each test from an empty route table and transaction history."""
+    clear_proxy_configs()
+    transaction_history.clear()
+
+
+def make_transaction(
+    i: int = 0,
+    method: str = "GET",
+    path: str = "/v1/users",
+    status_code: int = 200,
+    *,
+    transaction_id: Optional[str] = None,
+    target: str = "https://api.example.com",
+    request_body: bytes = b"",
+    response_body: Optional[bytes] = None,
+    stream: Optional[StreamCapture] = None,
+) -> Transaction:
+    """Build a transaction as the proxy records it.
+
+    Args:
+        i: Index of the transaction, used for its ID ("txn-<i>"), its timestamp (i
+            minutes after START), its "page" query parameter and its default
+            response body ({"i": <i>})
+        method: HTTP method
+        path: Proxied path, which is also the mapping prefix it was recorded under
+        status_code: Response status code
+        transaction_id: ID to use instead of "txn-<i>"
+        target: Target server URL
+        request_body: Captured request body
+        response_body: Captured response body
+        stream: Capture of a WebSocket or SSE stream
+
+    Returns:
+        The transaction, not yet stored
+    """
+    transaction = PendingTransaction(
+        timestamp=START + timedelta(minutes=i),
+        route=ProxyRoute("/v1", target),
+        normalized_path=path,
+        method=method,
+        url=f"{target}{path}",
+        request_headers={"accept": "application/json"},
+        query_params={"page": str(i)},
+        request_capture=BodyCapture.of(request_body),
+        status_code=status_code,
+        response_headers=httpx.Headers(
+            [
+                ("content-type", "application/json"),
+                ("set-cookie", "a=1"),
+                ("set-cookie", "b=2"),
+            ]
+        ),
+        response_capture=BodyCapture.of(
+            b'{"i": %d}' % i if response_body is None else response_body
+        ),
+        aborted=False,
+        stream=stream,
+    ).build()
+    transaction.id = transaction_id if transaction_id is not None else f"txn-{i}"
+    return transaction
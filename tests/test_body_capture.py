@@ -0,0 +1,65 @@
+"""Tests for body capture buffering and request body streaming."""
+
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from src.app.core.body_capture import BodyCapture
+from src.app.core.storage_data import transaction_history
+from src.app.main import app
+
+
+async def chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+@pytest.mark.asyncio
+async def test_tee_passes_chunks_through_and_records_them():
+    """Test that tee yields the source chunks unchanged while capturing them."""
+    capture = BodyCapture()
+
+    forwarded = [chunk async for chunk in capture.tee(chunks(b"abc", b"", b"def"))]
+
+    assert forwarded == [b"abc", b"def"]
+    assert capture.getvalue() == b"abcdef"
+    assert capture.size == 6
+    capture.close()
+
+
+def test_capture_spills_to_disk_beyond_threshold():
+    """Test that a capture stays in memory until it crosses the spool threshold."""
+    with patch("src.app.core.body_capture.settings.capture_spool_threshold", 8):
+        capture = BodyCapture()
+
+    capture.append(b"1234")
+    assert not capture.spilled
+
+    capture.append(b"56789")
+    assert capture.spilled
+    assert capture.getvalue() == b"123456789"
+
+    capture.append(b"0")
+    assert capture.getvalue() == b"1234567890"
+    capture.close()
+
+
+def test_proxy_streams_request_body_upstream():
+    """Test that the upload is streamed to the upstream and captured for the transaction."""
+    client = TestClient(app)
+    client.post("/api/setup", json={"mappings": {"/upload": "https://files.example.com"}})
+    received: list[bytes] = []
+
+    async def fake_send(self, request: httpx.Request, **kwargs) -> httpx.Response:
+        assert isinstance(request.stream, httpx.AsyncByteStream)
+        received.append(await request.aread())
+        return httpx.Response(201, stream=httpx.ByteStream(b"stored"))
+
+    with patch("httpx.AsyncClient.send", fake_send):
+        response = client.put("/proxy/upload/big.bin", content=b"x" * 50_000)
+
+    assert response.status_code == 201
+    assert received == [b"x" * 50_000]
+    assert transaction_history[0]["request"]["body"].read() == b"x" * 50_000
@@ -0,0 +1,249 @@
+"""Tests for captured body limits and overflow blob storage."""
+
+import base64
+import gzip
+import os
+import zlib
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from src.app.core.body_capture import BodyCapture
+from src.app.core.captured_body import CapturedBody
+from src.app.core.clear_transactions import clear_transactions
+from src.app.core.content_decoding import decode_content
+from src.app.core.storage_data import transaction_history
+from src.app.core.transaction import Transaction
+from src.app.main import app
+
+
+def make_capture(data: bytes) -> BodyCapture:
+    capture = BodyCapture()
+    capture.append(data)
+    return capture
+
+
+@pytest.fixture(autouse=True)
+def blob_dir(tmp_path):
+    """Write blobs to a per-test directory."""
+    with patch("src.app.core.blob_store.settings.capture_blob_dir", str(tmp_path)):
+        yield tmp_path
+
+
+def test_body_within_limit_is_stored_inline(tmp_path):
+    """Test that small bodies are kept in memory untouched."""
+    body = CapturedBody.from_capture(
+        make_capture(b"hello"), 10, "blob", str(tmp_path / "unused.bin")
+    )
+
+    assert body.data == b"hello"
+    assert body.blob_path is None
+    assert body.to_fields() == {
+        "body": "hello",
+        "body_encoding": "utf-8",
+        "body_size": 5,
+        "body_truncated": False,
+    }
+    assert not os.path.exists(tmp_path / "unused.bin")
+
+
+def test_body_over_limit_is_truncated(tmp_path):
+    """Test that truncate mode keeps only the first bytes and flags the body."""
+    body = CapturedBody.from_capture(
+        make_capture(b"0123456789"), 4, "truncate", str(tmp_path / "unused.bin")
+    )
+
+    assert body.data == b"0123"
+    assert body.to_fields() == {
+        "body": "0123",
+        "body_encoding": "utf-8",
+        "body_size": 10,
+        "body_truncated": True,
+    }
+
+
+def test_body_over_limit_overflows_to_blob(tmp_path):
+    """Test that blob mode moves the body to disk and maps it back when read."""
+    path = str(tmp_path / "txn-request.bin")
+    body = CapturedBody.from_capture(make_capture(b"0123456789"), 4, "blob", path)
+
+    assert body.data == b""
+    assert body.blob_path == path
+    assert body.read() == b"0123456789"
+    assert body.to_fields()["body_truncated"] is False
+
+
+def test_binary_body_is_rendered_as_base64():
+    """Test that non-text bodies survive intact as base64."""
+    png_header = b"\x89PNG\r\n\x1a\n\x00\xff"
+    body = CapturedBody(data=png_header, size=len(png_header), content_type="image/png")
+
+    fields = body.to_fields()
+
+    assert fields["body_encoding"] == "base64"
+    assert base64.b64decode(fields["body"]) == png_header
+
+
+def test_text_content_type_is_decoded_as_text():
+    """Test that declared text bodies are decoded as UTF-8, replacing invalid bytes."""
+    body = CapturedBody(
+        data=b"caf\xc3\xa9 \xff", size=7, content_type="application/problem+json; charset=utf-8"
+    )
+
+    assert body.to_fields()["body"] == "caf\u00e9 \ufffd"
+    assert body.to_fields()["body_encoding"] == "utf-8"
+
+
+def test_untyped_body_falls_back_to_base64_when_not_utf8():
+    """Test that bodies without a content type are sniffed for valid UTF-8."""
+    assert CapturedBody(data=b'{"ok": true}', size=12).to_fields()["body_encoding"] == "utf-8"
+    assert CapturedBody(data=b"\x1f\x8b\x08", size=3).to_fields()["body_encoding"] == "base64"
+
+
+def test_decoded_inline_body_is_cached():
+    """Test that repeated renders of an inline body decode it only once."""
+    body = CapturedBody(data=b"hello", size=5, content_type="text/plain")
+
+    with patch.object(CapturedBody, "decode", wraps=body.decode) as decode:
+        body.to_fields()
+        body.to_fields()
+
+    assert decode.call_count == 1
+
+
+def test_clear_transactions_removes_blob_files(tmp_path):
+    """Test that clearing the history also deletes overflow blobs."""
+    path = str(tmp_path / "txn-response.bin")
+    body = CapturedBody.from_capture(make_capture(b"0123456789"), 4, "blob", path)
+    transaction_history.append(Transaction.of({"id": "txn", "response": {"body": body}}))
+
+    assert clear_transactions() == 1
+    assert not os.path.exists(path)
+
+
+def test_per_mapping_limits_and_body_endpoint():
+    """Test per-mapping capture limits end to end, including the raw body endpoint."""
+    client = TestClient(app)
+    client.post(
+        "/api/setup",
+        json={
+            "mappings": {
+                "/files": {
+                    "target_url": "https://files.example.com",
+                    "capture_max_inline_bytes": 4,
+                },
+                "/small": {
+                    "target_url": "https://small.example.com",
+                    "capture_max_inline_bytes": 4,
+                    "capture_overflow": "truncate",
+                },
+            }
+        },
+    )
+
+    def upstream(*args, **kwargs) -> httpx.Response:
+        return httpx.Response(
+            200,
+            headers={"content-type": "text/plain"},
+            stream=httpx.ByteStream(b"large body payload"),
+        )
+
+    with patch("httpx.AsyncClient.send", side_effect=upstream):
+        assert client.get("/proxy/files/report.txt").text == "large body payload"
+        assert client.get("/proxy/small/report.txt").text == "large body payload"
+
+    transactions = client.get("/api/transactions").json()["transactions"]
+    truncated, blob = transactions
+    assert truncated["response"]["body"] == "larg"
+    assert truncated["response"]["body_truncated"] is True
+    assert truncated["response"]["body_size"] == 18
+    assert blob["response"]["body"] == "large body payload"
+    assert blob["response"]["body_truncated"] is False
+
+    raw = client.get(f"/api/transactions/{blob['id']}/response/body")
+    assert raw.status_code == 200
+    assert raw.content == b"large body payload"
+    assert raw.headers["content-type"].startswith("text/plain")
+    assert raw.headers["x-trixie-body-size"] == "18"
+
+    raw = client.get(f"/api/transactions/{truncated['id']}/response/body")
+    assert raw.content == b"larg"
+    assert raw.headers["x-trixie-body-truncated"] == "true"
+
+
+def test_body_endpoint_unknown_transaction():
+    """Test that the body endpoint returns 404 for unknown transactions."""
+    response = TestClient(app).get("/api/transactions/missing/response/body")
+
+    assert response.status_code == 404
+
+
+def test_compressed_body_is_decoded_only_when_read(tmp_path):
+    """Test that gzip bodies are stored encoded and decompressed when rendered."""
+    encoded = gzip.compress(b'{"ok": true}')
+    body = CapturedBody.from_capture(
+        make_capture(encoded),
+        1024,
+        "blob",
+        str(tmp_path / "unused.bin"),
+        content_type="application/json",
+        content_encoding="gzip",
+    )
+
+    assert body.data == encoded
+    assert body.to_fields()["body"] == '{"ok": true}'
+    assert body.to_fields()["body_size"] == len(encoded)
+
+
+@pytest.mark.parametrize(
+    ("content_encoding", "encoded"),
+    [
+        ("deflate", zlib.compress(b"hello world")),
+        ("deflate", zlib.compress(b"hello world")[2:-4]),
+        ("identity, gzip", gzip.compress(b"hello world")),
+        ("x-unknown", b"hello world"),
+    ],
+)
+def test_decode_content_encodings(content_encoding, encoded):
+    """Test zlib-wrapped and raw deflate, stacked encodings and unknown encodings."""
+    assert decode_content(encoded, content_encoding) == b"hello world"
+
+
+def test_truncated_compressed_body_decodes_available_prefix():
+    """Test that a truncated gzip body still yields the content its bytes hold."""
+    payload = bytes(range(256)) * 64
+    encoded = gzip.compress(payload, compresslevel=0)
+
+    decoded = decode_content(encoded[: len(encoded) // 2], "gzip")
+
+    assert len(decoded) > 0
+    assert payload.startswith(decoded)
+
+
+def test_proxy_passes_compressed_body_through():
+    """Test that encoded upstream bytes reach the client untouched and decode in the API."""
+    client = TestClient(app)
+    client.post("/api/setup", json={"mappings": {"/v1": "https://api.example.com"}})
+    encoded = gzip.compress(b"compressed payload")
+    upstream = httpx.Response(
+        200,
+        headers={"content-type": "text/plain", "content-encoding": "gzip"},
+        stream=httpx.ByteStream(encoded),
+    )
+
+    with patch("httpx.AsyncClient.send", return_value=upstream):
+        response = client.get("/proxy/v1/data")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == "compressed payload"
+    assert response.num_bytes_downloaded == len(encoded)
+
+    transaction = client.get("/api/transactions").json()["transactions"][0]
+    assert transaction["response"]["body"] == "compressed payload"
+    assert transaction["response"]["body_size"] == len(encoded)
+
+    raw = client.get(f"/api/transactions/{transaction['id']}/response/body")
+    assert raw.headers["content-encoding"] == "gzip"
+    assert raw.text == "compressed payload"
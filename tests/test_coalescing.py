@@ -0,0 +1,135 @@
+"""Tests for coalescing identical concurrent upstream requests."""
+
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from src.app.core.settings import settings
+from src.app.core.single_flight import SingleFlight
+from src.app.core.storage_data import transaction_history
+from src.app.main import app
+
+
+@pytest.fixture(autouse=True)
+def coalescing_mappings():
+    """Start each test with coalescing enabled on /v1 only."""
+    TestClient(app).post(
+        "/api/setup",
+        json={
+            "mappings": {
+                "/v1": {"target_url": "https://api.example.com", "coalesce": True},
+                "/v2": "https://api.example.com",
+            }
+        },
+    )
+
+
+async def send_concurrently(
+    *requests: tuple[str, str, dict[str, str]], content_type: str = "text/plain"
+) -> int:
+    """Send requests through the proxy at once and count the upstream calls they made."""
+    upstream_calls = 0
+
+    async def slow_upstream(request: httpx.Request) -> httpx.Response:
+        nonlocal upstream_calls
+        upstream_calls += 1
+        await asyncio.sleep(0.05)
+        return httpx.Response(
+            200, headers={"content-type": content_type}, stream=httpx.ByteStream(b"shared body")
+        )
+
+    upstream = httpx.AsyncClient(transport=httpx.MockTransport(slow_upstream))
+    transport = httpx.ASGITransport(app=app)
+    with patch("src.app.api.endpoints.proxy_handler.get_upstream_client", return_value=upstream):
+        async with httpx.AsyncClient(transport=transport, base_url="http://trixie") as client:
+            responses = await asyncio.gather(
+                *(client.request(method, url, headers=headers) for method, url, headers in requests)
+            )
+    assert all(response.text == "shared body" for response in responses)
+    return upstream_calls
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_gets_share_one_fetch():
+    """Test that concurrent identical GETs make one upstream call and all get the body."""
+    upstream_calls = await send_concurrently(*[("GET", "/proxy/v1/items?page=1", {})] * 5)
+
+    assert upstream_calls == 1
+    assert sorted(transaction["coalesced"] for transaction in transaction_history) == [
+        False,
+        True,
+        True,
+        True,
+        True,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_requests_that_differ_are_not_coalesced():
+    """Test that query, relevant headers, method and opt-in all separate requests."""
+    upstream_calls = await send_concurrently(
+        ("GET", "/proxy/v1/items?page=1", {}),
+        ("GET", "/proxy/v1/items?page=2", {}),
+        ("GET", "/proxy/v1/items?page=1", {"authorization": "Bearer other"}),
+        ("POST", "/proxy/v1/items?page=1", {}),
+        ("GET", "/proxy/v2/items?page=1", {}),
+        ("GET", "/proxy/v2/items?page=1", {}),
+    )
+
+    assert upstream_calls == 6
+    assert not any(transaction["coalesced"] for transaction in transaction_history)
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_errors_and_forgets_finished_calls():
+    """Test that every caller sees the shared failure and later calls start afresh."""
+    flights: SingleFlight[str] = SingleFlight()
+    calls = 0
+
+    async def failing() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise httpx.ConnectError("refused")
+
+    results = await asyncio.gather(
+        flights.do("key", failing), flights.do("key", failing), return_exceptions=True
+    )
+
+    assert calls == 1
+    assert all(isinstance(result, httpx.ConnectError) for result in results)
+    assert len(flights) == 0
+
+
+@pytest.mark.asyncio
+async def test_event_streams_are_streamed_instead_of_shared():
+    """Test that event streams are neither coalesced nor buffered."""
+    accepting = await send_concurrently(
+        *[("GET", "/proxy/v1/events", {"accept": "text/event-stream"})] * 3
+    )
+    responding = await send_concurrently(
+        *[("GET", "/proxy/v1/events", {})] * 3, content_type="text/event-stream"
+    )
+
+    assert (accepting, responding) == (3, 3)
+    assert not any(transaction.coalesced for transaction in transaction_history)
+    streams = [transaction.stream for transaction in transaction_history][3:]
+    assert len(streams) == 3
+    assert all(stream is not None and not stream.open for stream in streams)
+
+
+@pytest.mark.asyncio
+async def test_bodies_over_the_limit_are_streamed_instead_of_shared():
+    """Test that a body larger than the buffer limit is streamed whole to each request."""
+    with patch.object(settings, "coalesce_max_body_bytes", 4):
+        upstream_calls = await send_concurrently(*[("GET", "/proxy/v1/items?page=1", {})] * 3)
+
+    assert upstream_calls == 3
+    assert not any(transaction.coalesced for transaction in transaction_history)
+    assert [
+        transaction.response_body and transaction.response_body.size
+        for transaction in transaction_history
+    ] == [11, 11, 11]
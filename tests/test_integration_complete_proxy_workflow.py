@@ -1,11 +1,11 @@
 """Integration tests for complete proxy workflow through main FastAPI app."""
 
 import json
-from unittest.mock import AsyncMock, patch
+from unittest.mock import patch
 
 import pytest
 from fastapi.testclient import TestClient
-from httpx import Response
+from httpx import ByteStream, Response
 
 from src.app.main import app
 
@@ -17,9 +17,10 @@ class TestCompleteProxyWorkflow:
         """Set up test client and clear storage before each test."""
         self.client = TestClient(app)
         # Clear storage before each test
-        from src.app.core.storage_data import proxy_configurations, transaction_history
+        from src.app.core.clear_proxy_configs import clear_proxy_configs
+        from src.app.core.storage_data import transaction_history
 
-        proxy_configurations.clear()
+        clear_proxy_configs()
         transaction_history.clear()
 
     def test_complete_workflow_setup_proxy_query(self):
@@ -36,14 +37,13 @@ class TestCompleteProxyWorkflow:
         # Step 2: Make proxy request (with mocked external response)
         mock_response_data = {"id": 1, "name": "John Doe", "email": "john@example.com"}
 
-        with patch("httpx.AsyncClient.request") as mock_request:
-            mock_response = AsyncMock(spec=Response)
-            mock_response.status_code = 200
-            mock_response.headers = {"content-type": "application/json"}
-            mock_response.text = json.dumps(mock_response_data)
-            mock_response.content = json.dumps(mock_response_data).encode()
-            mock_response.aread.return_value = json.dumps(mock_response_data).encode()
-            mock_request.return_value = mock_response
+        with patch("httpx.AsyncClient.send") as mock_send:
+            mock_response = Response(
+                200,
+                headers={"content-type": "application/json"},
+                stream=ByteStream(json.dumps(mock_response_data).encode()),
+            )
+            mock_send.return_value = mock_response
 
             proxy_response = self.client.get("/proxy/api/users/1")
             assert proxy_response.status_code == 200
@@ -77,24 +77,22 @@ class TestCompleteProxyWorkflow:
         assert setup_response.status_code == 200
 
         # Make requests to different proxy endpoints
-        with patch("httpx.AsyncClient.request") as mock_request:
+        with patch("httpx.AsyncClient.send") as mock_send:
             # First request
-            mock_response1 = AsyncMock(spec=Response)
-            mock_response1.status_code = 200
-            mock_response1.headers = {"content-type": "application/json"}
-            mock_response1.text = '{"user_id": 1}'
-            mock_response1.content = b'{"user_id": 1}'
-            mock_response1.aread.return_value = b'{"user_id": 1}'
+            mock_response1 = Response(
+                200,
+                headers={"content-type": "application/json"},
+                stream=ByteStream(b'{"user_id": 1}'),
+            )
 
             # Second request
-            mock_response2 = AsyncMock(spec=Response)
-            mock_response2.status_code = 201
-            mock_response2.headers = {"content-type": "application/json"}
-            mock_response2.text = '{"post_id": 123}'
-            mock_response2.content = b'{"post_id": 123}'
-            mock_response2.aread.return_value = b'{"post_id": 123}'
+            mock_response2 = Response(
+                201,
+                headers={"content-type": "application/json"},
+                stream=ByteStream(b'{"post_id": 123}'),
+            )
 
-            mock_request.side_effect = [mock_response1, mock_response2]
+            mock_send.side_effect = [mock_response1, mock_response2]
 
             # Make both requests
             response1 = self.client.get("/proxy/api/users/1")
@@ -134,14 +132,10 @@ class TestCompleteProxyWorkflow:
         setup_data = {"mappings": {"/api/test": "https://example.com"}}
         self.client.post("/api/setup", json=setup_data)
 
-        with patch("httpx.AsyncClient.request") as mock_request:
-            mock_response = AsyncMock(spec=Response)
-            mock_response.status_code = 200
-            mock_response.headers = {}
-            mock_response.text = "OK"
-            mock_response.content = b"OK"
-            mock_response.aread.return_value = b"OK"
-            mock_request.return_value = mock_response
+        with patch("httpx.AsyncClient.send") as mock_send:
+            mock_send.side_effect = lambda *args, **kwargs: Response(
+                200, headers={}, stream=ByteStream(b"OK")
+            )
 
             # Make 5 requests
             for i in range(5):
@@ -201,7 +195,7 @@ class TestCompleteProxyWorkflow:
         setup_data = {"mappings": {"/api/test": "https://example.com"}}
         self.client.post("/api/setup", json=setup_data)
 
-        with patch("httpx.AsyncClient.request") as mock_request:
-            mock_request.side_effect = Exception("Connection error")
+        with patch("httpx.AsyncClient.send") as mock_send:
+            mock_send.side_effect = Exception("Connection error")
             response = self.client.get("/proxy/api/test/1")
             assert response.status_code == 500
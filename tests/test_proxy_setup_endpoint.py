@@ -1,38 +1,40 @@
 """Tests for proxy setup endpoint."""
 
+import threading
 from unittest.mock import patch
 
 import pytest
 from fastapi import HTTPException
+from fastapi.testclient import TestClient
 
 from src.app.api.endpoints.proxy_setup import configure_proxy_mappings
 from src.app.api.models.setup_request import SetupRequest
 from src.app.api.models.setup_response import SetupResponse
+from src.app.core.get_proxy_config import get_proxy_config
+from src.app.core.proxy_route import ProxyRoute
+from src.app.main import app
 
 
 class TestConfigureProxyMappings:
     """Test the configure_proxy_mappings endpoint function."""
 
-    @patch("src.app.api.endpoints.proxy_setup.clear_proxy_configs")
-    @patch("src.app.api.endpoints.proxy_setup.add_proxy_config")
+    @patch("src.app.api.endpoints.proxy_setup.replace_proxy_configs", return_value=1)
     @pytest.mark.asyncio
-    async def test_configure_single_mapping(self, mock_add, mock_clear):
+    async def test_configure_single_mapping(self, mock_replace):
         """Test configuring a single proxy mapping."""
         request = SetupRequest(mappings={"/v1/users": "https://api.example.com"})
 
         response = await configure_proxy_mappings(request)
 
-        mock_clear.assert_called_once()
-        mock_add.assert_called_once_with("/v1/users", "https://api.example.com")
+        mock_replace.assert_called_once_with([ProxyRoute("/v1/users", "https://api.example.com")])
 
         assert response.success is True
         assert response.configured_mappings == {"/v1/users": "https://api.example.com"}
         assert response.message == "Configured 1 proxy mappings"
 
-    @patch("src.app.api.endpoints.proxy_setup.clear_proxy_configs")
-    @patch("src.app.api.endpoints.proxy_setup.add_proxy_config")
+    @patch("src.app.api.endpoints.proxy_setup.replace_proxy_configs", return_value=3)
     @pytest.mark.asyncio
-    async def test_configure_multiple_mappings(self, mock_add, mock_clear):
+    async def test_configure_multiple_mappings(self, mock_replace):
         """Test configuring multiple proxy mappings."""
         mappings = {
             "/v1/users": "https://api.example.com",
@@ -43,53 +45,52 @@ class TestConfigureProxyMappings:
 
         response = await configure_proxy_mappings(request)
 
-        mock_clear.assert_called_once()
-        assert mock_add.call_count == 3
-        mock_add.assert_any_call("/v1/users", "https://api.example.com")
-        mock_add.assert_any_call("/v2/orders", "https://orders.service.com")
-        mock_add.assert_any_call("/v1/products", "https://products.api.com")
+        mock_replace.assert_called_once_with(
+            [
+                ProxyRoute("/v1/users", "https://api.example.com"),
+                ProxyRoute("/v2/orders", "https://orders.service.com"),
+                ProxyRoute("/v1/products", "https://products.api.com"),
+            ]
+        )
 
         assert response.success is True
         assert response.configured_mappings == mappings
         assert response.message == "Configured 3 proxy mappings"
 
-    @patch("src.app.api.endpoints.proxy_setup.clear_proxy_configs")
-    @patch("src.app.api.endpoints.proxy_setup.add_proxy_config")
+    @patch("src.app.api.endpoints.proxy_setup.replace_proxy_configs", return_value=0)
     @pytest.mark.asyncio
-    async def test_configure_empty_mappings(self, mock_add, mock_clear):
+    async def test_configure_empty_mappings(self, mock_replace):
         """Test configuring with empty mappings."""
         request = SetupRequest(mappings={})
 
         response = await configure_proxy_mappings(request)
 
-        mock_clear.assert_called_once()
-        mock_add.assert_not_called()
+        mock_replace.assert_called_once_with([])
 
         assert response.success is True
         assert response.configured_mappings == {}
         assert response.message == "Configured 0 proxy mappings"
 
-    @patch("src.app.api.endpoints.proxy_setup.clear_proxy_configs")
-    @patch("src.app.api.endpoints.proxy_setup.add_proxy_config")
     @pytest.mark.asyncio
-    async def test_clear_configs_failure(self, mock_add, mock_clear):
-        """Test handling of clear_proxy_configs failure."""
-        mock_clear.side_effect = Exception("Storage error")
-        request = SetupRequest(mappings={"/v1/test": "https://test.com"})
+    async def test_mappings_are_replaced_off_the_event_loop(self):
+        """Test that the route table update, which may wait on locks, runs in a thread."""
+        threads: list[threading.Thread] = []
 
-        with pytest.raises(HTTPException) as exc_info:
-            await configure_proxy_mappings(request)
+        def replace(routes):
+            threads.append(threading.current_thread())
+            return len(routes)
 
-        assert exc_info.value.status_code == 500
-        assert "Internal server error" in exc_info.value.detail
-        mock_add.assert_not_called()
+        with patch("src.app.api.endpoints.proxy_setup.replace_proxy_configs", replace):
+            await configure_proxy_mappings(SetupRequest(mappings={}))
 
-    @patch("src.app.api.endpoints.proxy_setup.clear_proxy_configs")
-    @patch("src.app.api.endpoints.proxy_setup.add_proxy_config")
+        assert len(threads) == 1
+        assert threads[0] is not threading.current_thread()
+
+    @patch("src.app.api.endpoints.proxy_setup.replace_proxy_configs")
     @pytest.mark.asyncio
-    async def test_add_config_failure(self, mock_add, mock_clear):
-        """Test handling of add_proxy_config failure."""
-        mock_add.side_effect = Exception("Storage error")
+    async def test_replace_configs_failure(self, mock_replace):
+        """Test handling of replace_proxy_configs failure."""
+        mock_replace.side_effect = Exception("Storage error")
         request = SetupRequest(mappings={"/v1/test": "https://test.com"})
 
         with pytest.raises(HTTPException) as exc_info:
@@ -97,12 +98,10 @@ class TestConfigureProxyMappings:
 
         assert exc_info.value.status_code == 500
         assert "Internal server error" in exc_info.value.detail
-        mock_clear.assert_called_once()
 
-    @patch("src.app.api.endpoints.proxy_setup.clear_proxy_configs")
-    @patch("src.app.api.endpoints.proxy_setup.add_proxy_config")
+    @patch("src.app.api.endpoints.proxy_setup.replace_proxy_configs", return_value=1)
     @pytest.mark.asyncio
-    async def test_response_model_format(self, mock_add, mock_clear):
+    async def test_response_model_format(self, mock_replace):
         """Test that response matches SetupResponse model format."""
         request = SetupRequest(mappings={"/api/test": "https://example.com"})
 
@@ -116,3 +115,74 @@ class TestConfigureProxyMappings:
         assert isinstance(response.success, bool)
         assert isinstance(response.configured_mappings, dict)
         assert isinstance(response.message, str)
+
+
+class TestIncrementalProxyMappings:
+    """Test the GET, PATCH and DELETE /api/setup endpoints."""
+
+    def setup_method(self):
+        """Start each test from a known route table."""
+        self.client = TestClient(app)
+        self.client.post(
+            "/api/setup",
+            json={
+                "mappings": {
+                    "/v1": "https://v1.example.com",
+                    "/v2": {"target_url": "https://v2.example.com", "capture_overflow": "truncate"},
+                }
+            },
+        )
+
+    def test_get_lists_current_mappings(self):
+        """Test that GET returns the route table in effect."""
+        response = self.client.get("/api/setup")
+
+        assert response.status_code == 200
+        assert response.json()["configured_mappings"] == {
+            "/v1": "https://v1.example.com",
+            "/v2": {
+                "target_url": "https://v2.example.com",
+                "capture_max_inline_bytes": None,
+                "capture_overflow": "truncate",
+                "coalesce": False,
+                "stubs": [],
+            },
+        }
+
+    def test_patch_adds_and_replaces_mappings(self):
+        """Test that PATCH upserts the given mappings and keeps the others."""
+        response = self.client.patch(
+            "/api/setup",
+            json={"mappings": {"/v1": "https://new.example.com", "/v3": "https://v3.example.com"}},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["message"] == "Updated 2 proxy mappings"
+        assert data["configured_mappings"]["/v1"] == "https://new.example.com"
+        assert data["configured_mappings"]["/v3"] == "https://v3.example.com"
+        assert "/v2" in data["configured_mappings"]
+        assert get_proxy_config("/v1/users") == ProxyRoute("/v1", "https://new.example.com")
+
+    def test_patch_rejects_invalid_mappings(self):
+        """Test that PATCH validates mappings like POST does."""
+        response = self.client.patch("/api/setup", json={"mappings": {"v4": "https://x.com"}})
+
+        assert response.status_code == 422
+        assert get_proxy_config("/v4") is None
+
+    def test_delete_removes_single_mapping(self):
+        """Test that DELETE removes only the named prefix."""
+        response = self.client.delete("/api/setup/v1")
+
+        assert response.status_code == 200
+        assert list(response.json()["configured_mappings"]) == ["/v2"]
+        assert get_proxy_config("/v1/users") is None
+        assert get_proxy_config("/v2/users") is not None
+
+    def test_delete_unknown_prefix_returns_404(self):
+        """Test that removing a prefix that is not configured is a 404."""
+        response = self.client.delete("/api/setup/v9/missing")
+
+        assert response.status_code == 404
+        assert "/v9/missing" in response.json()["detail"]
@@ -0,0 +1,137 @@
+"""Tests for record-and-replay mode."""
+
+import json
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from src.app.core.body_capture import BodyCapture
+from src.app.core.replay_store import load_replay_store
+from src.app.core.settings import settings
+from src.app.main import app
+
+
+async def upstream(request: httpx.Request, **kwargs) -> httpx.Response:
+    await request.aread()
+    return httpx.Response(
+        200,
+        headers={"content-type": "application/json", "x-upstream": "yes"},
+        stream=httpx.ByteStream(b'{"name": "recorded"}'),
+    )
+
+
+@pytest.fixture(autouse=True)
+def replay_file(tmp_path):
+    """Point the replay file at a per-test path."""
+    path = tmp_path / "replay.jsonl"
+    with patch.object(settings, "replay_file", str(path)):
+        load_replay_store()
+        yield path
+    load_replay_store()
+
+
+@pytest.fixture
+def client() -> TestClient:
+    client = TestClient(app)
+    client.post("/api/setup", json={"mappings": {"/v1": "https://api.example.com"}})
+    return client
+
+
+def record(client: TestClient, url: str, **kwargs) -> None:
+    with (
+        patch.object(settings, "replay_mode", "record"),
+        patch("httpx.AsyncClient.send", side_effect=upstream),
+    ):
+        assert client.request("POST", url, **kwargs).status_code == 200
+
+
+def test_recorded_response_is_replayed_without_upstream(client, replay_file):
+    """Test that record mode writes the replay file and replay mode answers from it."""
+    record(client, "/proxy/v1/users?b=2&a=1")
+
+    line = json.loads(replay_file.read_text())
+    assert line["path"] == "/v1/users"
+    assert line["query"] == [["a", "1"], ["b", "2"]]
+
+    load_replay_store()
+    with (
+        patch.object(settings, "replay_mode", "replay"),
+        patch("httpx.AsyncClient.send") as mock_send,
+    ):
+        response = client.post("/proxy/v1/users?a=1&b=2")
+
+    mock_send.assert_not_called()
+    assert response.status_code == 200
+    assert response.json() == {"name": "recorded"}
+    assert response.headers["x-upstream"] == "yes"
+
+    transactions = client.get("/api/transactions").json()["transactions"]
+    assert [t["replayed"] for t in transactions] == [True, False]
+    assert transactions[0]["response"]["body"] == '{"name": "recorded"}'
+
+
+@pytest.mark.parametrize(
+    ("policy", "status_code", "upstream_calls", "recorded"),
+    [("fail", 404, 0, False), ("passthrough", 200, 1, False), ("record", 200, 1, True)],
+)
+def test_miss_policy(client, replay_file, policy, status_code, upstream_calls, recorded):
+    """Test what replay mode does with requests that were not recorded."""
+    with (
+        patch.object(settings, "replay_mode", "replay"),
+        patch.object(settings, "replay_miss_policy", policy),
+        patch("httpx.AsyncClient.send", side_effect=upstream) as mock_send,
+    ):
+        response = client.get("/proxy/v1/missing")
+        client.get("/api/transactions")
+
+    assert response.status_code == status_code
+    assert mock_send.call_count == upstream_calls
+    assert replay_file.exists() == recorded
+
+
+def test_body_hash_matching(client):
+    """Test that request bodies only distinguish recordings when body matching is on."""
+    with patch.object(settings, "replay_match_body", True):
+        record(client, "/proxy/v1/search", content=b'{"q": "one"}')
+
+        with (
+            patch.object(settings, "replay_mode", "replay"),
+            patch("httpx.AsyncClient.send") as mock_send,
+        ):
+            assert client.post("/proxy/v1/search", content=b'{"q": "one"}').status_code == 200
+            assert client.post("/proxy/v1/search", content=b'{"q": "two"}').status_code == 404
+
+        mock_send.assert_not_called()
+
+    load_replay_store()
+    with patch.object(settings, "replay_mode", "replay"):
+        assert client.post("/proxy/v1/search", content=b'{"q": "two"}').status_code == 200
+
+
+def test_request_body_is_only_hashed_for_body_matching(client):
+    """Test that lookups leave the upload alone unless the body takes part in matching."""
+    forwarded: list[bytes] = []
+
+    async def echo_upstream(request: httpx.Request, **kwargs) -> httpx.Response:
+        forwarded.append(await request.aread())
+        return await upstream(request)
+
+    with (
+        patch.object(settings, "replay_mode", "replay"),
+        patch.object(settings, "replay_miss_policy", "passthrough"),
+        patch("httpx.AsyncClient.send", side_effect=echo_upstream),
+        patch.object(
+            BodyCapture, "sha256", autospec=True, side_effect=BodyCapture.sha256
+        ) as sha256,
+    ):
+        client.post("/proxy/v1/search", content=b"upload")
+        hashed_without_matching = sha256.call_count
+        with patch.object(settings, "replay_match_body", True):
+            client.post("/proxy/v1/search", content=b"upload")
+
+    assert (hashed_without_matching, sha256.call_count) == (0, 1)
+    assert forwarded == [b"upload", b"upload"]
+    transactions = client.get("/api/transactions").json()["transactions"]
+    assert [t["request"]["body"] for t in transactions] == ["upload", "upload"]
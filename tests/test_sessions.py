@@ -0,0 +1,188 @@
+"""Tests for session namespaces."""
+
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from src.app.core.pending_transaction import PendingTransaction
+from src.app.core.sessions import (
+    create_session,
+    delete_session,
+    get_session,
+    list_sessions,
+    using_session,
+)
+from src.app.core.settings import settings
+from src.app.core.storage_data import default_session
+from src.app.core.transaction import Transaction
+from src.app.core.transaction_listeners import (
+    add_transaction_listener,
+    notify_transaction_listeners,
+    remove_transaction_listener,
+)
+from src.app.main import app
+
+STUB_MAPPINGS = {"mappings": {"/health": {"stubs": [{"body": {"status": "ok"}}]}}}
+
+
+@pytest.fixture
+def client():
+    client = TestClient(app)
+    yield client
+    for session in list_sessions():
+        client.delete(f"/api/sessions/{session.name}")
+
+
+def test_sessions_have_their_own_routes_and_history(client):
+    """Test that mappings and transactions of a session are invisible to others."""
+    assert client.post("/api/sessions", json={"name": "a"}).status_code == 201
+    assert client.post("/api/sessions", json={"name": "b"}).status_code == 201
+
+    client.post("/api/setup", json=STUB_MAPPINGS, headers={"X-Trixie-Session": "a"})
+    assert client.get("/proxy/health", headers={"X-Trixie-Session": "a"}).status_code == 200
+    assert client.get("/sessions/a/proxy/health/deep").status_code == 200
+    assert client.get("/sessions/b/proxy/health").status_code == 404
+    assert client.get("/proxy/health").status_code == 404
+
+    a = client.get("/sessions/a/api/transactions").json()
+    assert [t["request"]["url"] for t in a["transactions"]] == ["/health/deep", "/health"]
+    assert a["latest_seq"] == 2
+    b = client.get("/api/transactions", headers={"X-Trixie-Session": "b"}).json()
+    assert b["transactions"] == []
+    assert client.get("/api/setup").json()["configured_mappings"] == {}
+
+    assert client.delete("/sessions/b/api/transactions").json() == {"cleared_count": 0}
+    assert len(client.get("/sessions/a/api/transactions").json()["transactions"]) == 2
+
+
+def test_session_header_is_not_forwarded(client):
+    """Test that the session header is kept from the target server."""
+    client.post("/api/sessions", json={"name": "a"})
+    client.post("/sessions/a/api/setup", json={"mappings": {"/v1": "https://api.example.com"}})
+    upstream = httpx.Response(200, stream=httpx.ByteStream(b"ok"))
+
+    with patch("httpx.AsyncClient.send", return_value=upstream) as mock_send:
+        response = client.get("/proxy/v1/users", headers={"X-Trixie-Session": "a"})
+
+    assert response.status_code == 200
+    sent = mock_send.call_args.args[0]
+    assert sent.url == "https://api.example.com/v1/users"
+    assert "x-trixie-session" not in sent.headers
+
+
+def test_sessions_have_their_own_limits(client):
+    """Test that the limits given at creation apply to that session only."""
+    response = client.post("/api/sessions", json={"name": "small", "max_transactions": 1})
+    assert response.json()["max_transactions"] == 1
+    client.post("/sessions/small/api/setup", json=STUB_MAPPINGS)
+
+    for _ in range(3):
+        client.get("/sessions/small/proxy/health")
+
+    stats = client.get("/sessions/small/api/history/stats").json()
+    assert (stats["stored"], stats["evicted"], stats["max_transactions"]) == (1, 2, 1)
+    assert client.get("/api/history/stats").json()["max_transactions"] == (
+        settings.history_max_transactions
+    )
+
+
+def test_deleted_and_unknown_sessions_are_refused(client):
+    """Test teardown, and that naming a session that does not exist is an error."""
+    created = client.post("/api/sessions").json()
+    name = created["name"]
+    client.post(f"/sessions/{name}/api/setup", json=STUB_MAPPINGS)
+    client.get(f"/sessions/{name}/proxy/health")
+
+    assert [s["name"] for s in client.get("/api/sessions").json()["sessions"]] == [name]
+    assert client.delete(f"/api/sessions/{name}").json() == {"cleared_count": 1}
+
+    assert client.get(f"/sessions/{name}/proxy/health").status_code == 404
+    assert client.get("/api/transactions", headers={"X-Trixie-Session": name}).json() == {
+        "detail": f"Unknown session: {name}"
+    }
+    assert client.delete(f"/api/sessions/{name}").status_code == 404
+
+
+def test_session_creation_conflicts(client):
+    """Test taken names, the session limit and the multi-worker restriction."""
+    assert client.post("/api/sessions", json={"name": "a"}).status_code == 201
+    assert client.post("/api/sessions", json={"name": "a"}).status_code == 409
+    assert client.post("/api/sessions", json={"name": "default"}).status_code == 409
+    assert client.post("/api/sessions", json={"name": "a/b"}).status_code == 422
+
+    with patch.object(settings, "max_sessions", 1):
+        assert client.post("/api/sessions", json={"name": "b"}).status_code == 409
+    with patch.object(settings, "workers", 2):
+        assert client.post("/api/sessions", json={"name": "c"}).status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_listeners_only_hear_their_session():
+    """Test that waiters and live streams of a session only get its transactions."""
+    session = create_session("listening")
+    received: list[Transaction] = []
+    with using_session(session):
+        listener = add_transaction_listener(received.append)
+    try:
+        notify_transaction_listeners(Transaction.of({"id": "default"}), default_session)
+        notify_transaction_listeners(Transaction.of({"id": "own"}), session)
+        await asyncio.sleep(0)
+    finally:
+        remove_transaction_listener(listener)
+        delete_session("listening")
+
+    assert [transaction.id for transaction in received] == ["own"]
+
+
+@pytest.mark.asyncio
+async def test_responses_streaming_when_their_session_is_deleted_are_dropped():
+    """Test that a response finishing after its session is gone is not recorded."""
+    release = asyncio.Event()
+
+    class SlowBody(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            yield b"first "
+            await release.wait()
+            yield b"last"
+
+    upstream = httpx.AsyncClient(
+        transport=httpx.MockTransport(
+            lambda request: httpx.Response(
+                200, headers={"content-type": "text/plain"}, stream=SlowBody()
+            )
+        )
+    )
+    transport = httpx.ASGITransport(app=app)
+    closed = []
+
+    def close(pending: PendingTransaction) -> None:
+        closed.append(pending.url)
+
+    try:
+        with (
+            patch("src.app.api.endpoints.proxy_handler.get_upstream_client", return_value=upstream),
+            patch.object(PendingTransaction, "close", close),
+        ):
+            async with httpx.AsyncClient(transport=transport, base_url="http://trixie") as client:
+                await client.post("/api/sessions", json={"name": "gone"})
+                await client.post(
+                    "/sessions/gone/api/setup",
+                    json={"mappings": {"/v1": "https://api.example.com"}},
+                )
+                session = get_session("gone")
+                streaming = asyncio.create_task(client.get("/sessions/gone/proxy/v1/download"))
+                await asyncio.sleep(0.05)
+
+                assert (await client.delete("/api/sessions/gone")).status_code == 200
+                release.set()
+                response = await streaming
+    finally:
+        await upstream.aclose()
+
+    assert response.text == "first last"
+    assert session is not None and session.closed
+    assert len(session.transaction_history) == 0
+    assert closed == ["https://api.example.com/v1/download"]
@@ -0,0 +1,144 @@
+"""Tests for the SQLite transaction history backend."""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from src.app.core.captured_body import CapturedBody
+from src.app.core.create_transaction_backend import create_transaction_backend
+from src.app.core.settings import settings
+from src.app.core.sqlite_transaction_store import SqliteTransactionStore
+from src.app.core.stream_capture import StreamCapture
+from src.app.core.transaction import Transaction
+from src.app.core.transaction_codec import decode_transaction, encode_transaction
+from src.app.core.transaction_filter import TransactionFilter
+
+from .conftest import START, make_transaction
+
+
+def test_transactions_survive_reopening(tmp_path):
+    """Test that records, sequence numbers and repeated headers are kept on disk."""
+    path = str(tmp_path / "history.db")
+    store = SqliteTransactionStore(path, batch_size=10)
+    for i in range(3):
+        store.append(make_transaction(i))
+    first = store[0]
+    store.close()
+
+    reopened = SqliteTransactionStore(path)
+    reopened.append(make_transaction(3))
+
+    assert [t["seq"] for t in reopened.select()] == [4, 3, 2, 1]
+    assert reopened.latest_seq == 4
+    stored = reopened.get(first["id"])
+    assert isinstance(stored, Transaction)
+    assert stored.response_headers == (
+        ("content-type", "application/json"),
+        ("set-cookie", "a=1"),
+        ("set-cookie", "b=2"),
+    )
+    assert stored["response"]["body"].read() == b'{"i": 0}'
+    assert stored["timestamp"] == first["timestamp"]
+
+
+def test_cursors_and_filters_use_the_indexed_columns(tmp_path):
+    """Test cursor paging and every filter criterion against the database."""
+    store = SqliteTransactionStore(str(tmp_path / "history.db"))
+    store.append(make_transaction(0, "GET", "/v1/users", 200))
+    store.append(make_transaction(1, "POST", "/v1/users/7", 201))
+    store.append(make_transaction(2, "GET", "/v1/usersettings", 404))
+    store.append(make_transaction(3, "DELETE", "/v2/users", 500))
+
+    def seqs(**kwargs) -> list[int]:
+        return [t["seq"] for t in store.select(**kwargs)]
+
+    assert seqs(after=1, limit=2, newest_first=False) == [2, 3]
+    assert seqs(before=3) == [2, 1]
+    assert seqs(transaction_filter=TransactionFilter(method="get")) == [3, 1]
+    assert seqs(transaction_filter=TransactionFilter(status_min=400, status_max=499)) == [3]
+    assert seqs(transaction_filter=TransactionFilter(path_prefix="/v1/users")) == [2, 1]
+    assert seqs(transaction_filter=TransactionFilter(since=START + timedelta(minutes=2))) == [
+        4,
+        3,
+    ]
+    assert seqs(
+        transaction_filter=TransactionFilter(
+            proxy_mapping_used="/v2/users -> https://api.example.com"
+        )
+    ) == [4]
+
+
+def test_limits_are_enforced_per_batch(tmp_path):
+    """Test that eviction runs when a batch is written and releases blob owners."""
+    store = SqliteTransactionStore(str(tmp_path / "history.db"), max_count=2, batch_size=2)
+    blob = CapturedBody(data=b"", size=10, blob_path="/tmp/blob")
+    with_blob = make_transaction(0)
+    with_blob.request_body = blob
+
+    assert store.append(with_blob) == []
+    evicted = store.append(make_transaction(1)) + store.append(make_transaction(2))
+    assert len(store) == 3
+    evicted += store.append(make_transaction(3))
+
+    assert [t["id"] for t in evicted] == [with_blob.id]
+    assert [t["seq"] for t in store.snapshot()] == [3, 4]
+    stats = store.stats()
+    assert (stats.stored, stats.evicted) == (2, 2)
+
+
+def test_open_streams_are_served_live_until_closed(tmp_path):
+    """Test that frames appended after recording are visible and written on close."""
+    path = str(tmp_path / "history.db")
+    store = SqliteTransactionStore(path, batch_size=1)
+    stream = StreamCapture("websocket")
+    store.append(make_transaction(0, stream=stream))
+
+    stream.append("client", "hello")
+    assert store[0]["stream"] is stream
+
+    stream.append("server", b"\x01")
+    stream.close()
+    store.flush()
+    store.close()
+
+    stored = SqliteTransactionStore(path)[0]["stream"]
+    assert isinstance(stored, StreamCapture)
+    assert [(f.direction, f.data) for f in stored.frames] == [
+        ("client", "hello"),
+        ("server", b"\x01"),
+    ]
+    assert stored.open is False
+
+
+def test_clear_keeps_sequence_numbers(tmp_path):
+    """Test that clearing counts removed rows and numbering carries on."""
+    store = SqliteTransactionStore(str(tmp_path / "history.db"))
+    store.append(make_transaction(0))
+    store.append(make_transaction(1))
+
+    removed, released = store.clear()
+    store.append(make_transaction(2))
+
+    assert (removed, released) == (2, [])
+    assert [t["seq"] for t in store.snapshot()] == [3]
+
+
+def test_codec_round_trip():
+    """Test that encoding and decoding keeps every field."""
+    transaction = make_transaction(5, "POST", "/v1/orders", 201)
+
+    decoded = decode_transaction(encode_transaction(transaction))
+
+    assert dict(decoded) == dict(transaction)
+    assert decoded.response_headers == transaction.response_headers
+
+
+def test_backend_is_selected_by_settings(tmp_path):
+    """Test that TRIXIE_HISTORY_BACKEND picks the SQLite store."""
+    with (
+        patch.object(settings, "history_backend", "sqlite"),
+        patch.object(settings, "history_sqlite_path", str(tmp_path / "history.db")),
+    ):
+        backend = create_transaction_backend()
+
+    assert isinstance(backend, SqliteTransactionStore)
+    assert backend.max_count == settings.history_max_transactions
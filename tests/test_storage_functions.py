@@ -1,45 +1,43 @@
 """Tests for storage functions."""
 
-import pytest
-
 from src.app.core.add_proxy_config import add_proxy_config
 from src.app.core.add_transaction import add_transaction
 from src.app.core.clear_proxy_configs import clear_proxy_configs
 from src.app.core.get_proxy_config import get_proxy_config
+from src.app.core.get_proxy_configs import get_proxy_configs
 from src.app.core.get_transactions import get_transactions
-from src.app.core.storage_data import proxy_configurations, transaction_history
-
-
-@pytest.fixture(autouse=True)
-def clean_storage():
-    """Clean storage before each test."""
-    proxy_configurations.clear()
-    transaction_history.clear()
+from src.app.core.proxy_route import ProxyRoute
+from src.app.core.remove_proxy_config import remove_proxy_config
+from src.app.core.replace_proxy_configs import replace_proxy_configs
+from src.app.core.transaction import Transaction
+from src.app.core.update_proxy_configs import update_proxy_configs
 
 
 def test_add_and_get_proxy_config():
     """Test adding and retrieving proxy configurations."""
-    add_proxy_config("/v1/users", "https://api.example.com")
-    add_proxy_config("/v2/orders", "https://orders.example.com")
+    add_proxy_config(ProxyRoute("/v1/users", "https://api.example.com"))
+    add_proxy_config(ProxyRoute("/v2/orders", "https://orders.example.com"))
 
-    assert get_proxy_config("/v1/users/123") == "https://api.example.com"
-    assert get_proxy_config("/v2/orders/456") == "https://orders.example.com"
+    assert get_proxy_config("/v1/users/123") == ProxyRoute("/v1/users", "https://api.example.com")
+    assert get_proxy_config("/v2/orders/456") == ProxyRoute(
+        "/v2/orders", "https://orders.example.com"
+    )
 
 
 def test_prefix_matching_longest_first():
     """Test that longest matching prefix is returned."""
-    add_proxy_config("/v1", "https://api-v1.example.com")
-    add_proxy_config("/v1/users", "https://users.example.com")
+    add_proxy_config(ProxyRoute("/v1", "https://api-v1.example.com"))
+    add_proxy_config(ProxyRoute("/v1/users", "https://users.example.com"))
 
     # Should match the longer prefix
-    assert get_proxy_config("/v1/users/123") == "https://users.example.com"
+    assert get_proxy_config("/v1/users/123") == ProxyRoute("/v1/users", "https://users.example.com")
     # Should match the shorter prefix when longer doesn't match
-    assert get_proxy_config("/v1/products") == "https://api-v1.example.com"
+    assert get_proxy_config("/v1/products") == ProxyRoute("/v1", "https://api-v1.example.com")
 
 
 def test_get_proxy_config_no_match():
     """Test get_proxy_config when no prefix matches."""
-    add_proxy_config("/v1/users", "https://api.example.com")
+    add_proxy_config(ProxyRoute("/v1/users", "https://api.example.com"))
 
     assert get_proxy_config("/v2/orders") is None
     assert get_proxy_config("/api/products") is None
@@ -52,8 +50,8 @@ def test_get_proxy_config_empty_storage():
 
 def test_clear_proxy_configs():
     """Test clearing proxy configurations."""
-    add_proxy_config("/v1/users", "https://api.example.com")
-    add_proxy_config("/v2/orders", "https://orders.example.com")
+    add_proxy_config(ProxyRoute("/v1/users", "https://api.example.com"))
+    add_proxy_config(ProxyRoute("/v2/orders", "https://orders.example.com"))
 
     clear_proxy_configs()
 
@@ -76,8 +74,8 @@ def test_add_and_get_transactions():
         "response": {"status_code": 201},
     }
 
-    add_transaction(transaction1)
-    add_transaction(transaction2)
+    add_transaction(Transaction.of(transaction1))
+    add_transaction(Transaction.of(transaction2))
 
     # Should return in reverse chronological order (newest first)
     transactions = get_transactions()
@@ -89,7 +87,7 @@ def test_add_and_get_transactions():
 def test_get_transactions_with_count_limit():
     """Test get_transactions with count limit."""
     for i in range(5):
-        add_transaction({"id": f"txn-{i}", "timestamp": f"2023-01-01T0{i}:00:00"})
+        add_transaction(Transaction.of({"id": f"txn-{i}", "timestamp": f"2023-01-01T0{i}:00:00"}))
 
     # Get only the 2 most recent transactions
     transactions = get_transactions(count=2)
@@ -106,7 +104,76 @@ def test_get_transactions_empty_storage():
 
 def test_get_transactions_count_zero():
     """Test get_transactions with count=0."""
-    add_transaction({"id": "txn-1"})
+    add_transaction(Transaction.of({"id": "txn-1"}))
 
     transactions = get_transactions(count=0)
     assert transactions == []
+
+
+def test_prefix_matching_respects_segment_boundaries():
+    """Test that prefixes only match on whole path segments."""
+    add_proxy_config(ProxyRoute("/v1/users", "https://users.example.com"))
+
+    assert get_proxy_config("/v1/users") == ProxyRoute("/v1/users", "https://users.example.com")
+    assert get_proxy_config("/v1/users-admin") is None
+    assert get_proxy_config("/v1/use") is None
+
+
+def test_root_prefix_matches_every_path():
+    """Test that "/" acts as a catch-all behind more specific prefixes."""
+    add_proxy_config(ProxyRoute("/", "https://default.example.com"))
+    add_proxy_config(ProxyRoute("/v1/", "https://v1.example.com"))
+
+    assert get_proxy_config("/anything/else") == ProxyRoute("/", "https://default.example.com")
+    assert get_proxy_config("/v1/users") == ProxyRoute("/v1/", "https://v1.example.com")
+
+
+def test_add_proxy_config_replaces_existing_prefix():
+    """Test that re-adding a prefix replaces its route."""
+    add_proxy_config(ProxyRoute("/v1", "https://old.example.com"))
+    add_proxy_config(ProxyRoute("/v1", "https://new.example.com"))
+
+    assert get_proxy_config("/v1/users") == ProxyRoute("/v1", "https://new.example.com")
+    assert len(get_proxy_configs()) == 1
+
+
+def test_route_table_snapshots_are_not_modified_by_updates():
+    """Test that a snapshot held by a reader is unaffected by later updates."""
+    replace_proxy_configs(
+        [
+            ProxyRoute("/v1", "https://v1.example.com"),
+            ProxyRoute("/v1/users", "https://u.example.com"),
+        ]
+    )
+    snapshot = get_proxy_configs()
+
+    update_proxy_configs([ProxyRoute("/v1/users", "https://new.example.com")])
+    remove_proxy_config("/v1")
+    replace_proxy_configs([ProxyRoute("/v2", "https://v2.example.com")])
+
+    assert snapshot.longest_match("/v1/users/1") == ProxyRoute("/v1/users", "https://u.example.com")
+    assert snapshot.longest_match("/v1/orders") == ProxyRoute("/v1", "https://v1.example.com")
+    assert len(snapshot) == 2
+    assert get_proxy_config("/v1/users") is None
+    assert get_proxy_config("/v2/x") == ProxyRoute("/v2", "https://v2.example.com")
+
+
+def test_update_and_remove_individual_mappings():
+    """Test upserting and removing mappings while keeping the others."""
+    replace_proxy_configs([ProxyRoute("/v1", "https://v1.example.com")])
+
+    assert (
+        update_proxy_configs(
+            [
+                ProxyRoute("/v1/users", "https://u.example.com"),
+                ProxyRoute("/v2", "https://v2.example.com"),
+            ]
+        )
+        == 3
+    )
+    assert remove_proxy_config("/v1/users") is True
+    assert remove_proxy_config("/v1/users") is False
+
+    assert get_proxy_config("/v1/users/1") == ProxyRoute("/v1", "https://v1.example.com")
+    assert get_proxy_config("/v2") == ProxyRoute("/v2", "https://v2.example.com")
+    assert {route.prefix for route in get_proxy_configs()} == {"/v1", "/v2"}
@@ -0,0 +1,204 @@
+"""Tests for WebSocket proxying and incremental server-sent event capture."""
+
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi import WebSocketDisconnect
+from fastapi.testclient import TestClient
+
+from src.app.core.sse_capture import SseCapture
+from src.app.core.stream_capture import StreamCapture
+from src.app.main import app
+
+
+@pytest.fixture
+def client() -> TestClient:
+    client = TestClient(app)
+    client.post("/api/setup", json={"mappings": {"/v1": "https://api.example.com"}})
+    return client
+
+
+class EventStream(httpx.AsyncByteStream):
+    """Upstream event stream delivered in chunks that do not line up with events."""
+
+    async def __aiter__(self):
+        for chunk in [b"event: tick\ndata: 1\n\nevent: ti", b"ck\ndata: 2\n\n", b"data: 3"]:
+            yield chunk
+
+
+def test_sse_events_are_captured_individually(client):
+    """Test that each event is appended to the transaction as its own frame."""
+    upstream = httpx.Response(
+        200, headers={"content-type": "text/event-stream"}, stream=EventStream()
+    )
+
+    with patch("httpx.AsyncClient.send", return_value=upstream):
+        response = client.get("/proxy/v1/events")
+
+    assert response.text == "event: tick\ndata: 1\n\nevent: tick\ndata: 2\n\ndata: 3"
+
+    transaction = client.get("/api/transactions").json()["transactions"][0]
+    stream = transaction["stream"]
+    assert stream["kind"] == "sse"
+    assert stream["open"] is False
+    assert [frame["data"] for frame in stream["frames"]] == [
+        "event: tick\ndata: 1",
+        "event: tick\ndata: 2",
+        "data: 3",
+    ]
+    assert transaction["aborted"] is False
+
+
+@pytest.mark.asyncio
+async def test_sse_pauses_longer_than_upstream_timeout_keep_the_stream():
+    """Test that the upstream read timeout does not apply between events."""
+
+    async def serve_events(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        await reader.readuntil(b"\r\n\r\n")
+        writer.write(
+            b"HTTP/1.1 200 OK\r\ncontent-type: text/event-stream\r\n"
+            b"connection: close\r\n\r\ndata: one\n\n"
+        )
+        await writer.drain()
+        await asyncio.sleep(0.5)
+        writer.write(b"data: two\n\n")
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(serve_events, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    TestClient(app).post("/api/setup", json={"mappings": {"/v1": f"http://127.0.0.1:{port}"}})
+    upstream = httpx.AsyncClient(timeout=0.1)
+    transport = httpx.ASGITransport(app=app)
+
+    try:
+        with patch(
+            "src.app.api.endpoints.proxy_handler.get_upstream_client", return_value=upstream
+        ):
+            async with httpx.AsyncClient(transport=transport, base_url="http://trixie") as client:
+                response = await client.get("/proxy/v1/events")
+                transactions = (await client.get("/api/transactions")).json()["transactions"]
+    finally:
+        await upstream.aclose()
+        server.close()
+        await server.wait_closed()
+
+    assert response.text == "data: one\n\ndata: two\n\n"
+    assert transactions[0]["aborted"] is False
+    assert [frame["data"] for frame in transactions[0]["stream"]["frames"]] == [
+        "data: one",
+        "data: two",
+    ]
+
+
+def test_sse_capture_visible_while_stream_is_open():
+    """Test that events are in the capture before the stream ends."""
+    sse_capture = SseCapture(StreamCapture("sse"))
+
+    sse_capture.append(b"data: first\r\n\r\ndata: sec")
+
+    assert sse_capture.stream.open is True
+    assert [frame.data for frame in sse_capture.stream.frames] == ["data: first"]
+
+
+def test_sse_event_over_the_limit_is_dropped_up_to_its_separator():
+    """Test that the rest of an oversized event split across chunks is not an event."""
+    sse_capture = SseCapture(StreamCapture("sse", max_bytes=10))
+
+    for chunk in (b"data: AAAA", b"AAAAAAAA", b"BBB\n", b"\ndata: x\n\n"):
+        sse_capture.append(chunk)
+    sse_capture.close()
+
+    assert [frame.data for frame in sse_capture.stream.frames] == ["data: x"]
+    assert sse_capture.stream.dropped_frames == 1
+    assert sse_capture.stream.frame_count == 2
+
+
+def test_stream_limits_count_dropped_frames():
+    """Test that frames beyond the frame or byte limits are counted, not kept."""
+    by_count = StreamCapture("websocket", max_frames=2, max_bytes=1000)
+    by_bytes = StreamCapture("websocket", max_frames=100, max_bytes=5)
+
+    for capture in (by_count, by_bytes):
+        for data in ("abc", "de", b"fgh"):
+            capture.append("client", data)
+
+    assert [frame.data for frame in by_count.frames] == ["abc", "de"]
+    assert [frame.data for frame in by_bytes.frames] == ["abc", "de"]
+    assert by_count.frame_count == by_bytes.frame_count == 3
+    assert by_count.dropped_frames == by_bytes.dropped_frames == 1
+
+
+class FakeUpstreamWebSocket:
+    """Upstream WebSocket that echoes every message back and closes on "bye"."""
+
+    def __init__(self) -> None:
+        self.subprotocol = None
+        self.response = None
+        self.close_code = None
+        self.messages: asyncio.Queue = asyncio.Queue()
+
+    async def send(self, data) -> None:
+        if data == "bye":
+            await self.close()
+            return
+        await self.messages.put(f"echo:{data}" if isinstance(data, str) else data[::-1])
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        message = await self.messages.get()
+        if message is None:
+            raise StopAsyncIteration
+        return message
+
+    async def close(self) -> None:
+        self.close_code = 1000
+        await self.messages.put(None)
+
+
+def test_websocket_frames_are_proxied_and_captured(client):
+    """Test that frames flow both ways and are recorded with their direction."""
+    connected_urls = []
+
+    async def fake_connect(url, **kwargs):
+        connected_urls.append(url)
+        return FakeUpstreamWebSocket()
+
+    with patch("src.app.api.endpoints.websocket_proxy.connect", side_effect=fake_connect):
+        with client.websocket_connect("/proxy/v1/socket?room=1") as websocket:
+            websocket.send_text("hello")
+            assert websocket.receive_text() == "echo:hello"
+            websocket.send_bytes(b"\x01\x02")
+            assert websocket.receive_bytes() == b"\x02\x01"
+            websocket.send_text("bye")
+            with pytest.raises(WebSocketDisconnect) as closed:
+                websocket.receive_text()
+
+    assert closed.value.code == 1000
+
+    assert connected_urls == ["wss://api.example.com/v1/socket?room=1"]
+
+    transaction = client.get("/api/transactions").json()["transactions"][0]
+    assert transaction["response"]["status_code"] == 101
+    stream = transaction["stream"]
+    assert stream["kind"] == "websocket"
+    assert [(frame["direction"], frame["data"]) for frame in stream["frames"]] == [
+        ("client", "hello"),
+        ("server", "echo:hello"),
+        ("client", "AQI="),
+        ("server", "AgE="),
+        ("client", "bye"),
+    ]
+    assert stream["open"] is False
+    assert stream["frames"][2]["encoding"] == "base64"
+
+
+def test_websocket_without_mapping_is_rejected(client):
+    """Test that WebSocket connections to unmapped paths are refused."""
+    with pytest.raises(Exception):
+        with client.websocket_connect("/proxy/unknown/socket"):
+            pass
@@ -0,0 +1,111 @@
+"""Tests for stub responses defined in proxy mappings."""
+
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from src.app.api.models.setup_request import SetupRequest
+from src.app.main import app
+
+
+@pytest.fixture
+def client() -> TestClient:
+    client = TestClient(app)
+    response = client.post(
+        "/api/setup",
+        json={
+            "mappings": {
+                "/health": {"stubs": [{"body": {"status": "ok"}}]},
+                "/v1/users": {
+                    "target_url": "https://api.example.com",
+                    "stubs": [
+                        {
+                            "method": "get",
+                            "query": {"id": "42"},
+                            "headers": {"x-stub": "yes"},
+                            "body": "stubbed user",
+                        },
+                        {"method": "DELETE", "status_code": 204},
+                    ],
+                },
+            }
+        },
+    )
+    assert response.status_code == 200
+    return client
+
+
+def test_stub_only_mapping_is_answered_in_process(client):
+    """Test that a stub is served without any upstream request and still recorded."""
+    with patch("httpx.AsyncClient.send") as mock_send:
+        response = client.post("/proxy/health/check", json={"probe": True})
+
+    mock_send.assert_not_called()
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+    assert response.headers["content-type"] == "application/json"
+
+    transaction = client.get("/api/transactions").json()["transactions"][0]
+    assert transaction["stubbed"] is True
+    assert transaction["proxy_mapping_used"] == "/health/check -> stub"
+    assert transaction["request"]["body"] == '{"probe":true}'
+    assert transaction["response"]["body"] == '{"status": "ok"}'
+
+
+def test_stub_method_and_query_matching(client):
+    """Test that stubs match on method and query, and others go to the target URL."""
+    upstream = httpx.Response(200, stream=httpx.ByteStream(b"from upstream"))
+
+    with patch("httpx.AsyncClient.send", return_value=upstream) as mock_send:
+        matched = client.get("/proxy/v1/users?id=42&extra=1")
+        deleted = client.delete("/proxy/v1/users/7")
+        forwarded = client.get("/proxy/v1/users?id=7")
+
+    assert matched.text == "stubbed user"
+    assert matched.headers["x-stub"] == "yes"
+    assert deleted.status_code == 204
+    assert forwarded.text == "from upstream"
+    mock_send.assert_called_once()
+
+
+def test_stub_only_mapping_without_match_returns_404(client):
+    """Test that stub-only mappings have nowhere to forward unmatched requests."""
+    client.post(
+        "/api/setup", json={"mappings": {"/only": {"stubs": [{"method": "GET", "body": "x"}]}}}
+    )
+
+    response = client.post("/proxy/only")
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "No stub matches POST /only"
+
+
+def test_mapping_needs_target_or_stubs():
+    """Test that a detailed mapping without target URL or stubs is rejected."""
+    with pytest.raises(ValidationError):
+        SetupRequest.model_validate({"mappings": {"/v1": {"capture_overflow": "truncate"}}})
+
+
+def test_stubs_are_listed_by_get_setup(client):
+    """Test that configured stubs round-trip through GET /api/setup."""
+    mappings = client.get("/api/setup").json()["configured_mappings"]
+
+    assert mappings["/health"]["target_url"] is None
+    assert mappings["/health"]["stubs"][0]["body"] == {"status": "ok"}
+    assert mappings["/health"]["stubs"][0]["headers"] == {}
+    assert mappings["/v1/users"]["stubs"][0]["method"] == "GET"
+    assert mappings["/v1/users"]["stubs"][0]["query"] == {"id": "42"}
+
+
+def test_listed_mappings_can_be_configured_again(client):
+    """Test that posting the GET /api/setup result back leaves the mappings unchanged."""
+    listed = client.get("/api/setup").json()["configured_mappings"]
+
+    client.post("/api/setup", json={"mappings": listed})
+
+    assert client.get("/api/setup").json()["configured_mappings"] == listed
+    assert client.get("/proxy/health").json() == {"status": "ok"}
+    assert client.get("/proxy/health").headers["content-type"] == "application/json"
@@ -0,0 +1,89 @@
+"""Tests for the tee streaming response used by the proxy handler."""
+
+import httpx
+import pytest
+from starlette.types import Message
+
+from src.app.api.tee_streaming_response import TeeStreamingResponse
+from src.app.core.body_capture import BodyCapture
+
+
+class ChunkedStream(httpx.AsyncByteStream):
+    """Upstream body delivered in several chunks."""
+
+    def __init__(self, chunks: list[bytes]) -> None:
+        self.chunks = chunks
+        self.closed = False
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            yield chunk
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+def make_upstream(chunks: list[bytes]) -> httpx.Response:
+    """Build an unread upstream response for the given chunks."""
+    return httpx.Response(
+        200,
+        stream=ChunkedStream(chunks),
+        request=httpx.Request("GET", "https://api.example.com/data"),
+    )
+
+
+async def receive() -> Message:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+SCOPE = {"type": "http", "asgi": {"spec_version": "2.4"}}
+
+
+@pytest.mark.asyncio
+async def test_streams_chunks_and_captures_body():
+    """Test that each upstream chunk is forwarded as it arrives and recorded."""
+    upstream = make_upstream([b"first,", b"second,", b"third"])
+    capture = BodyCapture()
+    outcomes: list[bool] = []
+    sent: list[Message] = []
+
+    async def finalize(completed: bool) -> None:
+        outcomes.append(completed)
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+
+    response = TeeStreamingResponse(upstream, capture, finalize, headers={})
+    await response(SCOPE, receive, send)
+
+    bodies = [message["body"] for message in sent if message["type"] == "http.response.body"]
+    assert bodies == [b"first,", b"second,", b"third", b""]
+    assert capture.getvalue() == b"first,second,third"
+    assert capture.size == 18
+    assert outcomes == [True]
+
+
+@pytest.mark.asyncio
+async def test_client_disconnect_marks_stream_aborted():
+    """Test that the finalizer still runs, flagged incomplete, when the client goes away."""
+    upstream = make_upstream([b"first,", b"second,", b"third"])
+    capture = BodyCapture()
+    outcomes: list[bool] = []
+    body_messages = 0
+
+    async def finalize(completed: bool) -> None:
+        outcomes.append(completed)
+
+    async def send(message: Message) -> None:
+        nonlocal body_messages
+        if message["type"] == "http.response.body":
+            body_messages += 1
+            if body_messages == 2:
+                raise OSError("client disconnected")
+
+    response = TeeStreamingResponse(upstream, capture, finalize, headers={})
+    with pytest.raises(Exception):
+        await response(SCOPE, receive, send)
+
+    assert outcomes == [False]
+    assert capture.getvalue() == b"first,second,"
@@ -0,0 +1,98 @@
+"""Tests for the compact transaction representation."""
+
+from datetime import datetime, timezone
+
+import httpx
+
+from src.app.core import transaction as transaction_module
+from src.app.core.body_capture import BodyCapture
+from src.app.core.pending_transaction import PendingTransaction
+from src.app.core.proxy_route import ProxyRoute
+from src.app.core.transaction import header_dict, share_headers, share_string
+
+
+def make_pending(response_headers: httpx.Headers) -> PendingTransaction:
+    return PendingTransaction(
+        timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        route=ProxyRoute("/v1", "https://api.example.com"),
+        normalized_path="/v1/login",
+        method="POST",
+        url="https://api.example.com/v1/login",
+        request_headers={"content-type": "application/json"},
+        query_params={},
+        request_capture=BodyCapture.of(b"{}"),
+        status_code=200,
+        response_headers=response_headers,
+        response_capture=BodyCapture(),
+        aborted=False,
+    )
+
+
+def test_repeated_headers_are_kept_apart():
+    """Test that each Set-Cookie header is stored and the dict view joins them."""
+    headers = httpx.Headers(
+        [("content-type", "text/plain"), ("set-cookie", "a=1"), ("set-cookie", "b=2")]
+    )
+
+    transaction = make_pending(headers).build()
+
+    assert transaction.response_headers == (
+        ("content-type", "text/plain"),
+        ("set-cookie", "a=1"),
+        ("set-cookie", "b=2"),
+    )
+    assert transaction["response"]["headers"] == {
+        "content-type": "text/plain",
+        "set-cookie": "a=1, b=2",
+    }
+
+
+def test_header_strings_are_shared_between_records():
+    """Test that recurring header pairs and names are stored once."""
+    first = make_pending(httpx.Headers({"x-request-id": "1", "vary": "accept"})).build()
+    second = make_pending(httpx.Headers({"x-request-id": "2", "vary": "accept"})).build()
+
+    assert first.response_headers[1] is second.response_headers[1]
+    assert first.response_headers[0][0] is second.response_headers[0][0]
+    assert first.proxy_mapping_used is second.proxy_mapping_used
+
+
+def test_mapping_view_has_the_stored_dict_shape():
+    """Test that the transaction reads like the dicts the history stores."""
+    transaction = make_pending(httpx.Headers({"content-type": "text/plain"})).build()
+
+    assert list(transaction) == [
+        "id",
+        "timestamp",
+        "request",
+        "response",
+        "proxy_mapping_used",
+        "aborted",
+        "replayed",
+        "stubbed",
+        "coalesced",
+        "stream",
+    ]
+    assert transaction["timestamp"] == "2024-01-01T00:00:00+00:00"
+    assert transaction["request"]["body"].read() == b"{}"
+    assert transaction.get("seq") is None
+
+    transaction.seq = 7
+
+    assert transaction["seq"] == 7
+    assert dict(transaction)["proxy_mapping_used"] == "/v1/login -> https://api.example.com"
+
+
+def test_shared_tables_are_bounded(monkeypatch):
+    """Test that the shared string tables start over instead of growing past the limit."""
+    monkeypatch.setattr(transaction_module, "MAX_SHARED_ENTRIES", 3)
+    transaction_module._shared_strings.clear()
+    transaction_module._shared_headers.clear()
+
+    for i in range(10):
+        share_string(f"value-{i}")
+        share_headers([("x-request-id", str(i))])
+
+    assert len(transaction_module._shared_strings) <= 3
+    assert len(transaction_module._shared_headers) <= 3
+    assert header_dict(share_headers([("a", "1")])) == {"a": "1"}
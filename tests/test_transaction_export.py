@@ -0,0 +1,71 @@
+"""Tests for the NDJSON transaction export."""
+
+import json
+import zlib
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.app.api.endpoints.transaction_export import EXPORT_BATCH_SIZE, _export_lines
+from src.app.core.add_transaction import add_transaction
+from src.app.core.iter_transaction_batches import iter_transaction_batches
+from src.app.core.storage_data import transaction_history
+from src.app.core.transaction_filter import TransactionFilter
+from src.app.main import app
+
+from .conftest import make_transaction
+
+
+def test_export_streams_every_transaction_oldest_first():
+    """Test that the export covers histories larger than one batch, one record per line."""
+    for i in range(250):
+        add_transaction(make_transaction(i, "POST" if i % 2 else "GET"))
+
+    response = TestClient(app).get("/api/transactions/export")
+
+    assert response.headers["content-type"] == "application/x-ndjson"
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["id"] for r in records] == [f"txn-{i}" for i in range(250)]
+    assert records[0]["response"]["body"] == '{"i": 0}'
+
+
+def test_export_filters_and_gzip():
+    """Test a filtered, metadata-only, gzip-compressed export."""
+    for i in range(10):
+        add_transaction(make_transaction(i, "POST" if i % 2 else "GET"))
+
+    response = TestClient(app).get(
+        "/api/transactions/export?method=POST&include_bodies=false&gzip=true"
+    )
+
+    assert response.headers["content-encoding"] == "gzip"
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["id"] for r in records] == ["txn-1", "txn-3", "txn-5", "txn-7", "txn-9"]
+    assert records[0]["response"]["body"] is None
+
+
+@pytest.mark.asyncio
+async def test_export_sends_one_batch_per_chunk():
+    """Test that the first chunk is ready after one batch, and gzip chunks decode alone."""
+    for i in range(EXPORT_BATCH_SIZE + 1):
+        add_transaction(make_transaction(i, "POST" if i % 2 else "GET"))
+
+    chunks = _export_lines(TransactionFilter(), True, None, compress=True)
+    first = await chunks.__anext__()
+    await chunks.aclose()
+
+    decompressed = zlib.decompressobj(wbits=31).decompress(first)
+    assert len(decompressed.splitlines()) == EXPORT_BATCH_SIZE
+
+
+def test_batches_stop_at_transactions_recorded_after_the_start():
+    """Test that an export of a growing history still ends."""
+    for i in range(3):
+        add_transaction(make_transaction(i, "POST" if i % 2 else "GET"))
+
+    exported = []
+    for batch in iter_transaction_batches(batch_size=1):
+        exported.extend(t["id"] for t in batch)
+        add_transaction(make_transaction(len(transaction_history) + 10))
+
+    assert exported == ["txn-0", "txn-1", "txn-2"]
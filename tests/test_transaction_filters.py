@@ -0,0 +1,105 @@
+"""Tests for indexed transaction filtering."""
+
+import random
+from datetime import timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.app.core.add_transaction import add_transaction
+from src.app.core.transaction_filter import TransactionFilter, TransactionKeys
+from src.app.core.transaction_store import TransactionStore
+from src.app.main import app
+
+from .conftest import START, make_transaction
+
+
+@pytest.mark.parametrize(
+    ("status", "expected"),
+    [("404", (404, 404)), ("4xx", (400, 499)), ("4XX", (400, 499)), ("500-503", (500, 503))],
+)
+def test_parse_status(status, expected):
+    """Test the supported status filter forms."""
+    assert TransactionFilter.parse_status(status) == expected
+
+
+@pytest.mark.parametrize("status", ["40", "4x", "abc", "503-500"])
+def test_parse_status_rejects_malformed_filters(status):
+    """Test that malformed status filters are rejected."""
+    with pytest.raises(ValueError):
+        TransactionFilter.parse_status(status)
+
+
+def test_path_prefix_matches_whole_segments():
+    """Test that path prefixes do not match partial segments."""
+    transaction_filter = TransactionFilter(path_prefix="/v1/users/")
+
+    assert transaction_filter.matches(TransactionKeys.of(make_transaction(0, "GET", "/v1/users")))
+    assert transaction_filter.matches(TransactionKeys.of(make_transaction(0, "GET", "/v1/users/7")))
+    assert not transaction_filter.matches(
+        TransactionKeys.of(make_transaction(0, "GET", "/v1/usersettings"))
+    )
+
+
+def test_indexed_queries_match_a_full_scan():
+    """Test that index-backed queries return what filtering every record would."""
+    store = TransactionStore(max_count=300)
+    rng = random.Random(7)
+    records = [
+        make_transaction(
+            i + rng.randint(-3, 3),
+            rng.choice(["GET", "POST", "DELETE"]),
+            rng.choice(["/v1/users", "/v1/users/1", "/v1/orders", "/v2/users"]),
+            rng.choice([200, 201, 404, 500, 503]),
+            target=rng.choice(["https://a.test", "https://b.test"]),
+        )
+        for i in range(500)
+    ]
+    for record in records:
+        store.append(record)
+
+    filters = [
+        TransactionFilter(method="get"),
+        TransactionFilter(status_min=500, status_max=599),
+        TransactionFilter(method="POST", status_min=200, status_max=299),
+        TransactionFilter(proxy_mapping_used="/v1/orders -> https://b.test"),
+        TransactionFilter(path_prefix="/v1/users"),
+        TransactionFilter(
+            since=START + timedelta(minutes=350), until=START + timedelta(minutes=360)
+        ),
+        TransactionFilter(method="DELETE", since=START + timedelta(minutes=400)),
+    ]
+    stored = store.snapshot()
+    for transaction_filter in filters:
+        expected = [t for t in stored if transaction_filter.matches(TransactionKeys.of(t))]
+        assert store.select(newest_first=False, transaction_filter=transaction_filter) == expected
+        assert store.select(limit=5, transaction_filter=transaction_filter) == expected[::-1][:5]
+        middle = len(expected) // 2
+        cursor = expected[middle]["seq"]
+        assert (
+            store.select(
+                after=cursor, limit=3, newest_first=False, transaction_filter=transaction_filter
+            )
+            == expected[middle + 1 : middle + 4]
+        )
+
+
+def test_transactions_endpoint_filters():
+    """Test the filter query parameters of GET /api/transactions."""
+    client = TestClient(app)
+    add_transaction(make_transaction(0, "GET", "/v1/users/1", 200))
+    add_transaction(make_transaction(1, "POST", "/v1/users", 201))
+    add_transaction(make_transaction(2, "GET", "/v1/orders/9", 404))
+    add_transaction(make_transaction(3, "GET", "/v1/users/2", 503))
+
+    def ids(query: str) -> list[str]:
+        response = client.get(f"/api/transactions?{query}")
+        assert response.status_code == 200
+        return [t["id"] for t in response.json()["transactions"]]
+
+    assert ids("method=get&path_prefix=/v1/users") == ["txn-3", "txn-0"]
+    assert ids("status=2xx") == ["txn-1", "txn-0"]
+    assert ids("status=404-599&count=1") == ["txn-3"]
+    assert ids("proxy_mapping_used=/v1/orders/9 -> https://api.example.com") == ["txn-2"]
+    assert ids("since=2024-01-01T00:01:00Z&until=2024-01-01T00:02:00Z") == ["txn-2", "txn-1"]
+    assert client.get("/api/transactions?status=4x").status_code == 400
@@ -0,0 +1,80 @@
+"""Tests for the cached JSON serialization of transactions."""
+
+import gc
+import json
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from src.app.api.models.transaction_record import TransactionRecord
+from src.app.api.transaction_json import transaction_json
+from src.app.core.add_transaction import add_transaction
+from src.app.core.render_transaction import render_transaction
+from src.app.core.settings import settings
+from src.app.core.stream_capture import StreamCapture
+from src.app.main import app
+
+from .conftest import make_transaction
+
+
+def test_serialized_record_matches_model_and_is_cached():
+    """Test that the JSON equals the validated record and is reused afterwards."""
+    transaction = make_transaction()
+    add_transaction(transaction)
+    expected = TransactionRecord(**render_transaction(transaction)).model_dump_json().encode()
+
+    assert transaction_json(transaction) == expected
+    assert transaction.serialized == expected
+    assert transaction_json(transaction) is transaction.serialized
+
+
+def test_changing_records_are_not_cached():
+    """Test that open streams, metadata-only output and large bodies are not cached."""
+    streaming = make_transaction(stream=StreamCapture("sse"))
+    large = make_transaction(response_body=b"x" * (64 * 1024))
+    metadata_only = make_transaction()
+
+    transaction_json(streaming)
+    transaction_json(large)
+    transaction_json(metadata_only, include_bodies=False)
+
+    assert streaming.serialized is None
+    assert large.serialized is None
+    assert metadata_only.serialized is None
+
+
+def test_cached_records_are_bounded_in_total():
+    """Test that the oldest cached records are dropped beyond the total limit."""
+    first, second, third = (make_transaction(i) for i in range(3))
+    size = len(transaction_json(make_transaction(9)))
+
+    with patch.object(settings, "json_cache_max_bytes", 2 * size):
+        for transaction in (first, second, third):
+            transaction_json(transaction)
+        cached = [transaction.serialized is not None for transaction in (first, second, third)]
+
+        # A transaction that is gone no longer counts against the limit
+        del second
+        gc.collect()
+        fourth = make_transaction(4)
+        transaction_json(fourth)
+
+    assert cached == [False, True, True]
+    assert third.serialized is not None
+    assert fourth.serialized is not None
+
+
+def test_transactions_endpoint_serves_cached_records():
+    """Test that repeated queries return the same document from the cache."""
+    client = TestClient(app)
+    add_transaction(make_transaction())
+
+    first = client.get("/api/transactions")
+    second = client.get("/api/transactions")
+
+    assert first.headers["content-type"] == "application/json"
+    assert first.content == second.content
+    document = json.loads(first.content)
+    assert document["count"] == 1
+    assert document["transactions"][0]["response"]["body"] == '{"i": 0}'
+    assert "serialized" not in document["transactions"][0]
@@ -0,0 +1,186 @@
+"""Tests for the crash-safe transaction log."""
+
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.app.core.add_transaction import add_transaction
+from src.app.core.clear_proxy_configs import clear_proxy_configs
+from src.app.core.clear_transactions import clear_transactions
+from src.app.core.get_proxy_configs import get_proxy_configs
+from src.app.core.proxy_route import ProxyRoute
+from src.app.core.replace_proxy_configs import replace_proxy_configs
+from src.app.core.segmented_log import SegmentedLog
+from src.app.core.settings import settings
+from src.app.core.storage_data import transaction_history
+from src.app.core.stream_capture import StreamCapture
+from src.app.core.stub_response import StubResponse
+from src.app.core.transaction_log import start_transaction_log, stop_transaction_log
+
+from .conftest import make_transaction
+
+ROUTES = [
+    ProxyRoute("/v1", "https://api.example.com", coalesce=True),
+    ProxyRoute("/stub", None, stubs=(StubResponse(201, (("x-stub", "1"),), b"\x00ok"),)),
+]
+
+
+@pytest.fixture(autouse=True)
+def log_dir(tmp_path):
+    """Log to a temporary directory, starting from an empty history and route table."""
+    stop_transaction_log()
+    transaction_history.clear()
+    clear_proxy_configs()
+    with patch.object(settings, "transaction_log_dir", str(tmp_path)):
+        yield str(tmp_path)
+    stop_transaction_log()
+    transaction_history.clear()
+
+
+def restart() -> int:
+    """Drop everything held in memory, as a process restart does, and replay the log."""
+    stop_transaction_log()
+    transaction_history.clear()
+    clear_proxy_configs()
+    return start_transaction_log()
+
+
+def test_history_and_routes_survive_a_restart():
+    """Test that logged transactions and the latest route table are loaded back."""
+    assert start_transaction_log() == 0
+    replace_proxy_configs(ROUTES)
+    for i in range(3):
+        add_transaction(make_transaction(i))
+
+    assert restart() == 3
+
+    assert [t.id for t in transaction_history] == ["txn-0", "txn-1", "txn-2"]
+    assert transaction_history[2]["response"]["body"].read() == b'{"i": 2}'
+    assert list(get_proxy_configs()) == ROUTES
+
+
+def test_cleared_transactions_are_not_replayed():
+    """Test that a clear is logged and hides every transaction before it."""
+    start_transaction_log()
+    add_transaction(make_transaction(0))
+    clear_transactions()
+    add_transaction(make_transaction(1))
+
+    assert restart() == 1
+    assert transaction_history[0].id == "txn-1"
+
+
+def test_torn_record_is_cut_off(log_dir):
+    """Test that a record half-written by a crash is dropped and the rest is kept."""
+    start_transaction_log()
+    add_transaction(make_transaction(0))
+    add_transaction(make_transaction(1))
+    stop_transaction_log()
+    segment = SegmentedLog(log_dir, 1024, 1.0).segments()[-1]
+    intact_size = os.path.getsize(segment)
+    with open(segment, "ab") as torn:
+        torn.write(b"\x10\x00\x00\x00partial")
+
+    assert restart() == 2
+    assert os.path.getsize(segment) == intact_size
+
+
+def test_full_segments_rotate_and_evicted_ones_are_deleted(log_dir):
+    """Test that segments whose transactions were all evicted are removed."""
+    with (
+        patch.object(settings, "transaction_log_segment_bytes", 1),
+        patch.object(transaction_history, "max_count", 2),
+    ):
+        start_transaction_log()
+        replace_proxy_configs(ROUTES)
+        for i in range(6):
+            add_transaction(make_transaction(i))
+
+        segments = SegmentedLog(log_dir, 1, 1.0).segments()
+        assert restart() == 2
+
+    # One transaction per segment: the two still stored and the one being written
+    assert len(segments) == 3
+    assert [t.id for t in transaction_history] == ["txn-4", "txn-5"]
+    assert list(get_proxy_configs()) == ROUTES
+
+
+def test_open_streams_are_closed_on_replay():
+    """Test that a stream cut off by the restart is replayed as aborted."""
+    start_transaction_log()
+    add_transaction(make_transaction(0, stream=StreamCapture("websocket")))
+
+    restart()
+
+    stream = transaction_history[0]["stream"]
+    assert isinstance(stream, StreamCapture)
+    assert (stream.open, stream.aborted) == (False, True)
+
+
+def test_completed_streams_are_replayed_with_their_frames():
+    """Test that a stream that closed before the restart keeps its frames and state."""
+    start_transaction_log()
+    stream = StreamCapture("sse")
+    add_transaction(make_transaction(0, stream=stream))
+    add_transaction(make_transaction(1))
+    stream.append("server", "data: one")
+    stream.append("server", "data: two")
+    stream.close()
+
+    assert restart() == 2
+
+    assert [t.id for t in transaction_history] == ["txn-0", "txn-1"]
+    replayed = transaction_history[0].stream
+    assert replayed is not None
+    assert (replayed.open, replayed.aborted) == (False, False)
+    assert [frame.data for frame in replayed.frames] == ["data: one", "data: two"]
+
+
+def test_streams_cleared_before_closing_are_not_replayed():
+    """Test that closing a stream does not bring back a cleared transaction."""
+    start_transaction_log()
+    stream = StreamCapture("websocket")
+    add_transaction(make_transaction(0, stream=stream))
+    clear_transactions()
+    stream.close()
+
+    assert restart() == 0
+
+
+def test_records_are_synced_after_traffic_stops():
+    """Test that the last records are fsynced within the interval without new appends."""
+    with (
+        patch.object(settings, "transaction_log_fsync_interval", 0.05),
+        patch("src.app.core.segmented_log.os.fsync") as fsync,
+    ):
+        start_transaction_log()
+        fsync.reset_mock()
+        add_transaction(make_transaction(0))
+        time.sleep(0.2)
+        synced = fsync.call_count
+        time.sleep(0.1)
+        stop_transaction_log()
+
+    assert synced == 1
+
+
+def test_appends_only_fsync_inline_without_an_interval(log_dir):
+    """Test that appends leave syncing to sync() unless every record must be synced."""
+    batched = SegmentedLog(os.path.join(log_dir, "batched"), 1024, 0.01)
+    every_record = SegmentedLog(os.path.join(log_dir, "every-record"), 1024, 0)
+    with patch("src.app.core.segmented_log.os.fsync") as fsync:
+        batched.append(b"one")
+        time.sleep(0.02)
+        batched.append(b"two")
+        appended = fsync.call_count
+        batched.sync()
+        batched.sync()
+        synced = fsync.call_count
+        every_record.append(b"one")
+        every_record.append(b"two")
+
+    assert (appended, synced, fsync.call_count) == (0, 1, 3)
+    batched.close()
+    every_record.close()
@@ -0,0 +1,136 @@
+"""Tests for the bounded transaction history."""
+
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from src.app.core.add_transaction import add_transaction
+from src.app.core.captured_body import CapturedBody
+from src.app.core.get_transaction import get_transaction
+from src.app.core.get_transactions import get_transactions
+from src.app.core.storage_data import transaction_history
+from src.app.core.transaction import Transaction
+from src.app.core.transaction_store import TransactionStore
+from src.app.main import app
+
+from .conftest import make_transaction
+
+
+def sized(transaction_id: str, body_size: int) -> Transaction:
+    """Build a transaction whose request and response bodies are body_size bytes each."""
+    body = b"x" * body_size
+    return make_transaction(transaction_id=transaction_id, request_body=body, response_body=body)
+
+
+def test_oldest_transactions_evicted_beyond_max_count():
+    """Test that the store keeps only the newest max_count transactions."""
+    store = TransactionStore(max_count=3)
+
+    evicted = [store.append(make_transaction(i)) for i in range(5)]
+
+    assert [t["id"] for t in store.snapshot()] == ["txn-2", "txn-3", "txn-4"]
+    assert [[t["id"] for t in e] for e in evicted] == [[], [], [], ["txn-0"], ["txn-1"]]
+    assert store.get("txn-0") is None
+    latest = store.get("txn-4")
+    assert latest is not None and (latest.id, latest.seq) == ("txn-4", 5)
+    assert store.stats().evicted == 2
+
+
+def test_oldest_transactions_evicted_beyond_max_bytes():
+    """Test that both bodies count against the byte budget and the newest is kept."""
+    store = TransactionStore(max_bytes=100)
+
+    store.append(sized("small-1", 20))
+    store.append(sized("small-2", 20))
+    store.append(sized("medium", 30))
+    stats = store.stats()
+    assert [t["id"] for t in store.snapshot()] == ["small-2", "medium"]
+    assert (stats.stored_bytes, stats.evicted, stats.evicted_bytes) == (100, 1, 40)
+
+    store.append(sized("huge", 500))
+    assert [t["id"] for t in store.snapshot()] == ["huge"]
+    assert store.stats().evicted == 3
+
+
+def test_add_transaction_deletes_blobs_of_evicted_transactions():
+    """Test that evicted transactions release their overflow blob files."""
+    blob = CapturedBody(data=b"", size=10, blob_path="/tmp/blob")
+
+    with (
+        patch.object(transaction_history, "max_count", 1),
+        patch("src.app.core.delete_transaction_blobs.delete_blob") as delete_blob,
+    ):
+        with_blob = make_transaction(1)
+        with_blob.request_body = blob
+        add_transaction(with_blob)
+        add_transaction(make_transaction(2))
+
+    delete_blob.assert_called_once_with("/tmp/blob")
+    assert [t["id"] for t in get_transactions()] == ["txn-2"]
+    assert get_transaction("txn-1") is None
+
+
+def test_history_stats_endpoint_reports_evictions():
+    """Test that eviction counters and limits are visible through the API."""
+    client = TestClient(app)
+    with patch.object(transaction_history, "max_count", 2):
+        before = client.get("/api/history/stats").json()
+        for i in range(3):
+            add_transaction(sized(f"txn-{i}", 5))
+        stats = client.get("/api/history/stats").json()
+
+    assert stats["stored"] == 2
+    assert stats["stored_bytes"] == 20
+    assert stats["evicted"] == before["evicted"] + 1
+    assert stats["evicted_bytes"] == before["evicted_bytes"] + 10
+    assert stats["max_transactions"] == 2
+
+
+def test_select_pages_by_sequence_number():
+    """Test cursor queries after and before a sequence number, in both orders."""
+    store = TransactionStore(max_count=6)
+    for i in range(1, 11):
+        store.append(make_transaction(i))
+
+    def ids(transactions: list[Transaction]) -> list[int]:
+        return [t["seq"] for t in transactions]
+
+    # Sequence numbers 1-4 were evicted, 5-10 are stored
+    assert ids(store.select(limit=2)) == [10, 9]
+    assert ids(store.select(after=7, newest_first=False)) == [8, 9, 10]
+    assert ids(store.select(after=2, limit=2, newest_first=False)) == [5, 6]
+    assert ids(store.select(before=8, limit=2)) == [7, 6]
+    assert ids(store.select(after=5, before=8)) == [7, 6]
+    assert ids(store.select(after=10)) == []
+    assert ids(store.select(before=3)) == []
+    assert store.latest_seq == 10
+
+
+def test_sequence_numbers_continue_after_clear():
+    """Test that a cleared store never hands out a sequence number twice."""
+    store = TransactionStore()
+    store.append(make_transaction(1))
+    store.clear()
+    store.append(make_transaction(2))
+
+    assert [t["seq"] for t in store.snapshot()] == [2]
+    assert store.select(after=0, newest_first=False)[0]["id"] == "txn-2"
+
+
+def test_transactions_endpoint_polls_with_after_cursor():
+    """Test that pollers only receive transactions recorded since their cursor."""
+    client = TestClient(app)
+    for i in range(3):
+        add_transaction(make_transaction(i))
+
+    first = client.get("/api/transactions?limit=2").json()
+    cursor = first["latest_seq"]
+    assert [t["id"] for t in first["transactions"]] == ["txn-2", "txn-1"]
+
+    add_transaction(make_transaction(3))
+    polled = client.get(f"/api/transactions?after={cursor}").json()
+    assert [t["id"] for t in polled["transactions"]] == ["txn-3"]
+    assert polled["latest_seq"] == cursor + 1
+
+    older = client.get(f"/api/transactions?before={cursor - 1}&limit=5").json()
+    assert [t["id"] for t in older["transactions"]] == ["txn-0"]
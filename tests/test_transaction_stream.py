@@ -0,0 +1,112 @@
+"""Tests for the live transaction stream."""
+
+import asyncio
+import json
+from collections.abc import AsyncGenerator
+from typing import cast
+from unittest.mock import patch
+
+import pytest
+
+from src.app.api.endpoints.transaction_stream import stream_transactions_endpoint
+from src.app.core import transaction_listeners
+from src.app.core.add_transaction import add_transaction
+from src.app.core.settings import settings
+from src.app.core.storage_data import transaction_history
+from src.app.core.transaction_filter import TransactionFilter
+from src.app.core.transaction_subscription import TransactionSubscription
+
+from .conftest import make_transaction
+
+
+def parse_event(raw: bytes) -> tuple[str, dict]:
+    fields = dict(line.split(": ", 1) for line in raw.decode().strip().split("\n"))
+    return fields["event"], json.loads(fields["data"])
+
+
+async def open_stream(
+    transaction_filter: TransactionFilter, **params
+) -> AsyncGenerator[bytes, None]:
+    response = await stream_transactions_endpoint(
+        transaction_filter,
+        include_bodies=params.get("include_bodies", True),
+        after=params.get("after"),
+        last_event_id=params.get("last_event_id"),
+    )
+    assert response.media_type == "text/event-stream"
+    return cast(AsyncGenerator[bytes, None], response.body_iterator)
+
+
+@pytest.mark.asyncio
+async def test_stream_pushes_matching_transactions_without_bodies():
+    """Test that recorded transactions are pushed live, filtered and metadata-only."""
+    events = await open_stream(TransactionFilter(method="POST"), include_bodies=False)
+    next_event = asyncio.ensure_future(events.__anext__())
+    await asyncio.sleep(0.01)
+
+    add_transaction(make_transaction(transaction_id="get-1"))
+    add_transaction(
+        make_transaction(transaction_id="post-1", method="POST", request_body=b"secret")
+    )
+    event, data = parse_event(await next_event)
+
+    assert event == "transaction"
+    assert data["id"] == "post-1"
+    assert data["request"]["body"] is None
+    assert data["request"]["body_size"] == 6
+
+    await events.aclose()
+    assert not transaction_listeners._listeners
+
+
+@pytest.mark.asyncio
+async def test_stream_replays_backlog_after_last_event_id():
+    """Test that a reconnecting client gets what it missed, then live transactions."""
+    for i in range(3):
+        add_transaction(make_transaction(i))
+
+    events = await open_stream(TransactionFilter(), last_event_id=transaction_history[0]["seq"])
+    received = [parse_event(await events.__anext__())[1]["id"] for _ in range(2)]
+    next_event = asyncio.ensure_future(events.__anext__())
+    await asyncio.sleep(0.01)
+    add_transaction(make_transaction(3))
+    received.append(parse_event(await next_event)[1]["id"])
+    await events.aclose()
+
+    assert received == ["txn-1", "txn-2", "txn-3"]
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_drops_instead_of_blocking():
+    """Test that a full subscriber queue drops and counts transactions."""
+    subscription = TransactionSubscription(TransactionFilter(), max_queued=2)
+    subscription.start()
+    try:
+        for i in range(5):
+            add_transaction(make_transaction(i))
+        await asyncio.sleep(0.01)
+
+        assert subscription.dropped == 3
+        assert await subscription.next(timeout=1) == transaction_history[0]
+        assert await subscription.next(timeout=1) == transaction_history[1]
+        assert await subscription.next(timeout=0.01) is None
+    finally:
+        subscription.stop()
+
+
+@pytest.mark.asyncio
+async def test_stream_reports_dropped_transactions():
+    """Test that a subscriber that fell behind is told how many it missed."""
+    with patch.object(settings, "live_stream_queue_size", 1):
+        events = await open_stream(TransactionFilter())
+        next_event = asyncio.ensure_future(events.__anext__())
+        await asyncio.sleep(0.01)
+        for i in range(3):
+            add_transaction(make_transaction(i))
+
+        first = parse_event(await next_event)
+        second = parse_event(await events.__anext__())
+        await events.aclose()
+
+    assert first == ("dropped", {"dropped": 2})
+    assert second[1]["id"] == "txn-0"
@@ -0,0 +1,145 @@
+"""Tests for the background transaction writer."""
+
+import threading
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from src.app.core import storage_data, transaction_writer
+from src.app.core.body_capture import BodyCapture
+from src.app.core.pending_transaction import PendingTransaction
+from src.app.core.proxy_route import ProxyRoute
+from src.app.core.sqlite_transaction_store import SqliteTransactionStore
+from src.app.core.storage_data import transaction_history
+from src.app.main import app
+
+
+def make_pending(url: str = "https://api.example.com/v1/users") -> PendingTransaction:
+    return PendingTransaction(
+        timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        route=ProxyRoute("/v1", "https://api.example.com"),
+        normalized_path="/v1/users",
+        method="GET",
+        url=url,
+        request_headers={"accept": "application/json"},
+        query_params={"page": "2"},
+        request_capture=BodyCapture(),
+        status_code=200,
+        response_headers={"content-type": "application/json"},
+        response_capture=BodyCapture(),
+        aborted=False,
+    )
+
+
+def test_pending_transaction_builds_stored_record():
+    """Test that the writer-side build produces the stored transaction format."""
+    record = make_pending().build()
+
+    assert record["timestamp"] == "2024-01-01T00:00:00+00:00"
+    assert record["request"]["headers"] == {"accept": "application/json"}
+    assert record["request"]["query_params"] == {"page": "2"}
+    assert record["response"]["status_code"] == 200
+    assert record["proxy_mapping_used"] == "/v1/users -> https://api.example.com"
+    assert record["aborted"] is False
+
+
+@pytest.mark.asyncio
+async def test_submit_without_running_writer_records_inline():
+    """Test that transactions are recorded immediately when no writer is running."""
+    await transaction_writer.submit_transaction(make_pending())
+
+    assert len(transaction_history) == 1
+
+
+@pytest.mark.asyncio
+async def test_writer_records_in_background_and_flushes():
+    """Test that queued transactions are recorded by the writer task."""
+    await transaction_writer.start_transaction_writer()
+    try:
+        written_before = transaction_writer.get_transaction_writer_stats().written
+        await transaction_writer.submit_transaction(make_pending())
+
+        assert transaction_writer.get_transaction_writer_stats().pending == 1
+        await transaction_writer.flush_transaction_writer()
+
+        stats = transaction_writer.get_transaction_writer_stats()
+        assert stats.pending == 0
+        assert stats.written == written_before + 1
+        assert stats.running is True
+        assert len(transaction_history) == 1
+    finally:
+        await transaction_writer.stop_transaction_writer()
+
+    assert transaction_writer.get_transaction_writer_stats().running is False
+
+
+@pytest.mark.asyncio
+async def test_drop_policy_discards_records_when_queue_full():
+    """Test that the drop policy counts and discards records beyond the queue size."""
+    with (
+        patch.object(transaction_writer.settings, "writer_queue_size", 1),
+        patch.object(transaction_writer.settings, "writer_full_policy", "drop"),
+    ):
+        await transaction_writer.start_transaction_writer()
+        try:
+            dropped_before = transaction_writer.get_transaction_writer_stats().dropped
+            for _ in range(3):
+                await transaction_writer.submit_transaction(make_pending())
+            await transaction_writer.flush_transaction_writer()
+        finally:
+            await transaction_writer.stop_transaction_writer()
+
+    assert transaction_writer.get_transaction_writer_stats().dropped == dropped_before + 2
+    assert len(transaction_history) == 1
+
+
+@pytest.mark.asyncio
+async def test_writer_appends_to_shared_store_off_the_event_loop(tmp_path):
+    """Test that writes to a store shared with other workers run in a thread."""
+    history = SqliteTransactionStore(str(tmp_path / "history.db"), shared=True)
+    append = history.append
+    threads: list[threading.Thread] = []
+
+    def recording_append(transaction):
+        threads.append(threading.current_thread())
+        return append(transaction)
+
+    with (
+        patch.object(storage_data.default_session, "transaction_history", history),
+        patch.object(history, "append", side_effect=recording_append),
+    ):
+        await transaction_writer.start_transaction_writer()
+        try:
+            await transaction_writer.submit_transaction(make_pending())
+            await transaction_writer.flush_transaction_writer()
+        finally:
+            await transaction_writer.stop_transaction_writer()
+
+    assert len(threads) == 1
+    assert threads[0] is not threading.current_thread()
+    assert len(history) == 1
+    history.close()
+
+
+def test_lifespan_writer_records_proxied_transactions():
+    """Test the full path: proxy through the running writer, then query the result."""
+    upstream = httpx.Response(
+        200, headers={"content-type": "text/plain"}, stream=httpx.ByteStream(b"ok")
+    )
+
+    with TestClient(app) as client:
+        client.post("/api/setup", json={"mappings": {"/v1": "https://api.example.com"}})
+        with patch("httpx.AsyncClient.send", return_value=upstream):
+            assert client.get("/proxy/v1/users").text == "ok"
+
+        transactions = client.get("/api/transactions").json()["transactions"]
+        stats = client.get("/api/writer/stats").json()
+
+    assert len(transactions) == 1
+    assert transactions[0]["response"]["body"] == "ok"
+    assert stats["running"] is True
+    assert stats["pending"] == 0
+    assert stats["full_policy"] == "block"
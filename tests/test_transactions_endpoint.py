@@ -4,11 +4,27 @@ from datetime import datetime
 from unittest.mock import patch
 
 import pytest
-from fastapi import HTTPException
+from fastapi import HTTPException, Response
 
 from src.app.api.endpoints.transactions import get_transactions_endpoint
 from src.app.api.models.transaction_record import TransactionRecord
 from src.app.api.models.transactions_response import TransactionsResponse
+from src.app.core.captured_body import CapturedBody
+from src.app.core.transaction import Transaction
+
+
+def parse(response: Response) -> TransactionsResponse:
+    """Read the JSON document the endpoint responded with."""
+    return TransactionsResponse.model_validate_json(bytes(response.body))
+
+
+def stored(transaction: dict) -> Transaction:
+    """Build the stored form of a transaction dict with text bodies."""
+    parts = {}
+    for part in ("request", "response"):
+        data = (transaction[part].get("body") or "").encode()
+        parts[part] = {**transaction[part], "body": CapturedBody(data=data, size=len(data))}
+    return Transaction.of({**transaction, **parts})
 
 
 class TestGetTransactionsEndpoint:
@@ -18,7 +34,7 @@ class TestGetTransactionsEndpoint:
     @pytest.mark.asyncio
     async def test_get_all_transactions_no_count(self, mock_get_transactions):
         """Test getting all transactions without count parameter."""
-        # Mock data - transaction dicts as returned by storage
+        # Mock data - transactions as returned by storage
         mock_transactions = [
             {
                 "id": "txn-001",
@@ -55,9 +71,9 @@ class TestGetTransactionsEndpoint:
                 "proxy_mapping_used": "/v1/users",
             },
         ]
-        mock_get_transactions.return_value = mock_transactions
+        mock_get_transactions.return_value = [stored(t) for t in mock_transactions]
 
-        response = await get_transactions_endpoint()
+        response = parse(await get_transactions_endpoint())
 
         mock_get_transactions.assert_called_once()
         assert isinstance(response, TransactionsResponse)
@@ -86,11 +102,13 @@ class TestGetTransactionsEndpoint:
                 "proxy_mapping_used": "/v1/users",
             }
         ]
-        mock_get_transactions.return_value = mock_transactions
+        mock_get_transactions.return_value = [stored(t) for t in mock_transactions]
 
-        response = await get_transactions_endpoint(count=1)
+        response = parse(await get_transactions_endpoint(count=1))
 
-        mock_get_transactions.assert_called_once_with(1)
+        mock_get_transactions.assert_called_once_with(
+            1, after=None, before=None, transaction_filter=None
+        )
         assert isinstance(response, TransactionsResponse)
         assert len(response.transactions) == 1
         assert response.count == 1
@@ -102,7 +120,7 @@ class TestGetTransactionsEndpoint:
         """Test getting transactions when history is empty."""
         mock_get_transactions.return_value = []
 
-        response = await get_transactions_endpoint()
+        response = parse(await get_transactions_endpoint())
 
         mock_get_transactions.assert_called_once()
         assert isinstance(response, TransactionsResponse)
@@ -129,11 +147,13 @@ class TestGetTransactionsEndpoint:
             }
             for i in range(5)
         ]
-        mock_get_transactions.return_value = mock_transactions
+        mock_get_transactions.return_value = [stored(t) for t in mock_transactions]
 
-        response = await get_transactions_endpoint(count=5)
+        response = parse(await get_transactions_endpoint(count=5))
 
-        mock_get_transactions.assert_called_once_with(5)
+        mock_get_transactions.assert_called_once_with(
+            5, after=None, before=None, transaction_filter=None
+        )
         assert isinstance(response, TransactionsResponse)
         assert len(response.transactions) == 5
         assert response.count == 5
@@ -171,9 +191,9 @@ class TestGetTransactionsEndpoint:
             },
             "proxy_mapping_used": "/v1/users",
         }
-        mock_get_transactions.return_value = [mock_transaction]
+        mock_get_transactions.return_value = [stored(mock_transaction)]
 
-        response = await get_transactions_endpoint()
+        response = parse(await get_transactions_endpoint())
 
         assert len(response.transactions) == 1
         txn = response.transactions[0]
@@ -191,7 +211,7 @@ class TestGetTransactionsEndpoint:
         """Test that response matches TransactionsResponse model format."""
         mock_get_transactions.return_value = []
 
-        response = await get_transactions_endpoint()
+        response = parse(await get_transactions_endpoint())
 
         assert isinstance(response, TransactionsResponse)
         assert hasattr(response, "transactions")
@@ -211,9 +231,11 @@ class TestGetTransactionsEndpoint:
         mock_get_transactions.return_value = []
 
         # Test with minimum valid count
-        response = await get_transactions_endpoint(count=1)
+        response = parse(await get_transactions_endpoint(count=1))
 
-        mock_get_transactions.assert_called_once_with(1)
+        mock_get_transactions.assert_called_once_with(
+            1, after=None, before=None, transaction_filter=None
+        )
         assert isinstance(response, TransactionsResponse)
         assert response.count == 0
 
@@ -238,11 +260,13 @@ class TestGetTransactionsEndpoint:
             }
             for i in range(100)
         ]
-        mock_get_transactions.return_value = mock_transactions
+        mock_get_transactions.return_value = [stored(t) for t in mock_transactions]
 
-        response = await get_transactions_endpoint(count=100)
+        response = parse(await get_transactions_endpoint(count=100))
 
-        mock_get_transactions.assert_called_once_with(100)
+        mock_get_transactions.assert_called_once_with(
+            100, after=None, before=None, transaction_filter=None
+        )
         assert len(response.transactions) == 100
         assert response.count == 100
         assert all(isinstance(txn, TransactionRecord) for txn in response.transactions)
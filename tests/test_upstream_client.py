@@ -0,0 +1,108 @@
+"""Tests for the shared upstream client and its host-limited transport."""
+
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from src.app.core import upstream_client
+from src.app.core.host_limited_transport import HostLimitedTransport
+from src.app.main import app
+
+
+async def fake_upstream(self, request: httpx.Request) -> httpx.Response:
+    """Stand-in for the network round trip of the base transport."""
+    return httpx.Response(200, stream=httpx.ByteStream(b"ok"))
+
+
+@patch("httpx.AsyncHTTPTransport.handle_async_request", fake_upstream)
+@pytest.mark.asyncio
+async def test_transport_counts_requests_until_body_closed():
+    """Test that a request stays in flight until its response body is closed."""
+    transport = HostLimitedTransport(limits=httpx.Limits())
+    request = httpx.Request("GET", "https://api.example.com/v1/users")
+
+    response = await transport.handle_async_request(request)
+
+    stats = transport.snapshot_stats()
+    assert stats.requests_total == 1
+    assert stats.in_flight == 1
+    assert stats.in_flight_per_host == {"api.example.com": 1}
+
+    await response.aclose()
+
+    stats = transport.snapshot_stats()
+    assert stats.in_flight == 0
+    assert stats.peak_in_flight == 1
+    assert stats.in_flight_per_host == {}
+
+
+@patch("httpx.AsyncHTTPTransport.handle_async_request", fake_upstream)
+@pytest.mark.asyncio
+async def test_transport_enforces_per_host_cap():
+    """Test that requests beyond the per-host cap wait for a free slot."""
+    transport = HostLimitedTransport(limits=httpx.Limits(), max_connections_per_host=1)
+    first = await transport.handle_async_request(httpx.Request("GET", "https://a.example.com/"))
+
+    second_task = asyncio.create_task(
+        transport.handle_async_request(httpx.Request("GET", "https://a.example.com/"))
+    )
+    other_host = await transport.handle_async_request(httpx.Request("GET", "https://b.example/"))
+    await asyncio.sleep(0)
+
+    assert not second_task.done()
+    assert transport.stats.waiting_for_host_slot == 1
+
+    await first.aclose()
+    second = await asyncio.wait_for(second_task, timeout=1)
+
+    assert transport.stats.waiting_for_host_slot == 0
+    assert transport.stats.in_flight_per_host == {"a.example.com": 1, "b.example": 1}
+    await second.aclose()
+    await other_host.aclose()
+
+
+@patch("httpx.AsyncHTTPTransport.handle_async_request", fake_upstream)
+@pytest.mark.asyncio
+async def test_transport_releases_slot_when_upstream_fails():
+    """Test that a failed upstream call does not leak its host slot."""
+    transport = HostLimitedTransport(limits=httpx.Limits(), max_connections_per_host=1)
+
+    with patch(
+        "httpx.AsyncHTTPTransport.handle_async_request", side_effect=httpx.ConnectError("down")
+    ):
+        with pytest.raises(httpx.ConnectError):
+            await transport.handle_async_request(httpx.Request("GET", "https://a.example.com/"))
+
+    response = await asyncio.wait_for(
+        transport.handle_async_request(httpx.Request("GET", "https://a.example.com/")), timeout=1
+    )
+    assert transport.stats.in_flight == 1
+    await response.aclose()
+
+
+def test_lifespan_owns_shared_client():
+    """Test that the app lifespan creates one shared client and closes it on shutdown."""
+    with TestClient(app):
+        client = upstream_client.get_upstream_client()
+        assert upstream_client.get_upstream_client() is client
+        assert not client.is_closed
+
+    assert client.is_closed
+    assert upstream_client.get_upstream_pool_stats().requests_total == 0
+
+
+def test_upstream_stats_endpoint():
+    """Test GET /api/upstream/stats exposes counters and configured limits."""
+    with TestClient(app) as client:
+        response = client.get("/api/upstream/stats")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["requests_total"] == 0
+    assert data["in_flight"] == 0
+    assert data["connections_open"] == 0
+    assert data["max_connections"] == 100
+    assert data["max_connections_per_host"] is None
@@ -0,0 +1,98 @@
+"""Tests for long-polling until transactions are recorded."""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from src.app.core.add_transaction import add_transaction
+from src.app.core.storage_data import transaction_history
+from src.app.core.transaction_filter import TransactionFilter
+from src.app.core.wait_for_transactions import wait_for_transactions
+from src.app.main import app
+
+from .conftest import make_transaction
+
+
+@pytest.mark.asyncio
+async def test_wait_is_woken_by_transactions_recorded_on_another_thread():
+    """Test that waiters wake on a matching record, ignoring ones that do not match."""
+    waiter = asyncio.create_task(
+        wait_for_transactions(TransactionFilter(method="POST"), count=2, timeout=5)
+    )
+    await asyncio.sleep(0.01)
+
+    await asyncio.to_thread(add_transaction, make_transaction(transaction_id="get-1"))
+    await asyncio.to_thread(
+        add_transaction, make_transaction(transaction_id="post-1", method="POST")
+    )
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+
+    started = time.monotonic()
+    await asyncio.to_thread(
+        add_transaction, make_transaction(transaction_id="post-2", method="POST")
+    )
+    matches = await waiter
+
+    assert time.monotonic() - started < 1
+    assert [t["id"] for t in matches] == ["post-1", "post-2"]
+
+
+@pytest.mark.asyncio
+async def test_wait_counts_history_unless_given_a_cursor():
+    """Test that earlier matches satisfy a wait, except those before the after cursor."""
+    add_transaction(make_transaction(transaction_id="old", status_code=500))
+
+    assert len(await wait_for_transactions(TransactionFilter(status_min=500), timeout=1)) == 1
+    assert (
+        await wait_for_transactions(
+            TransactionFilter(status_min=500), timeout=0.05, after=transaction_history.latest_seq
+        )
+        == []
+    )
+
+
+def test_wait_endpoint_returns_matches_or_times_out():
+    """Test the long-poll endpoint's success and timeout responses."""
+    client = TestClient(app)
+    add_transaction(make_transaction(transaction_id="post-1", method="POST", status_code=201))
+
+    response = client.get("/api/transactions/wait?method=POST&status=2xx&timeout=1")
+    assert response.status_code == 200
+    assert [t["id"] for t in response.json()["transactions"]] == ["post-1"]
+    assert response.json()["timed_out"] is False
+
+    response = client.get("/api/transactions/wait?method=POST&count=2&timeout=0.05")
+    assert response.status_code == 200
+    assert response.json()["timed_out"] is True
+    assert response.json()["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_wait_endpoint_sees_proxied_request():
+    """Test that a pending long poll returns once a proxied request completes."""
+    TestClient(app).post("/api/setup", json={"mappings": {"/v1": "https://api.example.com"}})
+    upstream = httpx.AsyncClient(
+        transport=httpx.MockTransport(
+            lambda request: httpx.Response(201, stream=httpx.ByteStream(b"created"))
+        )
+    )
+    transport = httpx.ASGITransport(app=app)
+
+    with patch("src.app.api.endpoints.proxy_handler.get_upstream_client", return_value=upstream):
+        async with httpx.AsyncClient(transport=transport, base_url="http://trixie") as client:
+            wait = asyncio.create_task(
+                client.get("/api/transactions/wait?path_prefix=/v1/orders&timeout=5")
+            )
+            await asyncio.sleep(0.05)
+            assert not wait.done()
+
+            await client.post("/proxy/v1/orders", content=b"{}")
+            response = await wait
+
+    assert response.status_code == 200
+    assert response.json()["transactions"][0]["response"]["status_code"] == 201
@@ -0,0 +1,112 @@
+"""Tests for sharing routes and transactions between worker processes."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from src.app.core import storage_data
+from src.app.core.add_proxy_config import add_proxy_config
+from src.app.core.clear_proxy_configs import clear_proxy_configs
+from src.app.core.get_proxy_config import get_proxy_config
+from src.app.core.proxy_route import ProxyRoute
+from src.app.core.settings import settings
+from src.app.core.sqlite_route_table import SqliteRouteTable
+from src.app.core.sqlite_transaction_store import SqliteTransactionStore
+from src.app.core.transaction import Transaction
+from src.app.core.transaction_listeners import (
+    add_transaction_listener,
+    remove_transaction_listener,
+)
+from src.app.core.worker_sync import start_worker_sync, stop_worker_sync
+
+from .conftest import make_transaction
+
+ROUTE = ProxyRoute("/v1", "https://api.example.com")
+
+
+def test_shared_stores_number_and_count_across_workers(tmp_path):
+    """Test that stores on one file share sequence numbers, counts and limits."""
+    path = str(tmp_path / "history.db")
+    first = SqliteTransactionStore(path, max_count=3, shared=True)
+    second = SqliteTransactionStore(path, max_count=3, shared=True)
+
+    for i in range(4):
+        (first if i % 2 == 0 else second).append(make_transaction(i))
+
+    assert [t["seq"] for t in first.snapshot()] == [2, 3, 4]
+    assert (len(second), second.latest_seq) == (3, 4)
+    assert second.stats().evicted == 1
+
+    second.clear()
+    first.append(make_transaction(4))
+
+    assert [t["seq"] for t in second.snapshot()] == [5]
+    assert len(first) == len(second) == 1
+
+
+def test_route_table_changes_are_seen_by_other_workers(tmp_path):
+    """Test that a published route table is picked up once by every other table."""
+    path = str(tmp_path / "history.db")
+    first, second = SqliteRouteTable(path), SqliteRouteTable(path)
+
+    assert second.changes() is None
+    with first.writing():
+        first.publish([ROUTE])
+
+    assert second.changes() == [ROUTE]
+    assert second.changes() is None
+    assert first.changes() is None
+
+    other = ProxyRoute("/v2", "https://other.example.com")
+    with second.writing():
+        second.publish([ROUTE, other])
+
+    assert first.changes() == [ROUTE, other]
+    assert first.version == second.version == 2
+
+
+@pytest.mark.asyncio
+async def test_workers_share_routes_and_live_transactions(tmp_path):
+    """Test the worker sync against a simulated second worker."""
+    path = str(tmp_path / "history.db")
+    history = SqliteTransactionStore(path, shared=True)
+    other_worker_history = SqliteTransactionStore(path, shared=True)
+    other_worker_routes = SqliteRouteTable(path)
+    received: list[Transaction] = []
+    clear_proxy_configs()
+    with (
+        patch.object(settings, "workers", 2),
+        patch.object(settings, "history_sqlite_path", path),
+        patch.object(settings, "worker_sync_interval", 0.01),
+        patch.object(storage_data.default_session, "transaction_history", history),
+    ):
+        await start_worker_sync()
+        listener = add_transaction_listener(received.append)
+        try:
+            add_proxy_config(ROUTE)
+            assert other_worker_routes.changes() == [ROUTE]
+
+            other = ProxyRoute("/v2", "https://other.example.com")
+            with other_worker_routes.writing():
+                other_worker_routes.publish([ROUTE, other])
+            for _ in range(100):
+                if get_proxy_config("/v2/items") == other:
+                    break
+                await asyncio.sleep(0.01)
+            assert get_proxy_config("/v2/items") == other
+            with patch.object(SqliteRouteTable, "changes") as changes:
+                get_proxy_config("/v2/items")
+            changes.assert_not_called()
+
+            other_worker_history.append(make_transaction(0))
+            for _ in range(100):
+                if received:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            remove_transaction_listener(listener)
+            await stop_worker_sync()
+            clear_proxy_configs()
+
+    assert [t["seq"] for t in received] == [1]